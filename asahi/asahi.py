@@ -1,5 +1,3 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import os
@@ -8,20 +6,41 @@ import csv
 import logging
 from urllib.parse import urljoin, quote
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import random
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.http_client import HttpClient, THROTTLE_STATUS_CODES
+from common.http_cache import HttpCache
+from common.url_store import UrlStore
+from common.dedup import make_url_filter, load_url_filter
+from common.checkpoint import CrawlCheckpoint
+from common.sinks import open_sinks
+from common.parquet_export import ParquetSink, parse_publish_time, JST
+from common.article_store import ArticleStore
+from common.html_parser import make_soup, make_link_soup
+from common.url_classifier import UrlClassifier, any_of
+from common.image_downloader import ImageDownloader, image_extension
+from common.image_store import ImageStore
+from common.async_fetch import AsyncFetchEngine
+from common.driver_pool import WebDriverPool
+from common.metrics import RunMetrics
+from common.profiling import StageProfiler
 try:
     from trafilatura import fetch_url, extract
 except ImportError:
     extract = None  # Fallback to original extraction if trafilatura is not installed
 
 class AsahiCrawler:
-    def __init__(self):
+    CSV_FIELDNAMES = ["序号", "标题", "发布时间", "正文", "主题", "图片数量", "图片链接", "原文链接", "下载的图片路径"]
+    
+    def __init__(self, driver_pool=None, **config):
+        """Keyword arguments override entries of self.config before the HTTP client, cache, URL store and
+        image downloader are built from it (later changes to those entries do not affect them)"""
         self.headers_list = [
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
@@ -43,14 +62,103 @@ class AsahiCrawler:
         self.news_count = 0
         self.config = {
             "nav_selectors": ["div#GlobalNav", "ul.NavInner"],
+            "news_url_patterns": ["https://www.asahi.com/articles/"],  # A link is a news page if it contains one of these
+            "excluded_url_patterns": [  # ...and none of these (case-insensitive)
+                "/profile/", "/about/", "/contact/", "/privacy/",
+                "/terms/", "/sitemap/", "/faq/", "/search/",
+                "/subscribe/", "/login/", "/register/", "/logout/"
+            ],
             "content_selectors": ["div.w8Bsl", "div.Isto1", "article-content", "main-content"],
             "paid_selectors": ['img[src*="icon_key_gold.png"]', 'span.hideFromApp:contains("有料会員")'],
             "valid_image_extensions": [".jpg", ".jpeg", ".png", ".webp"],
+            "html_parser": "auto",  # BeautifulSoup backend: "auto" (lxml if installed), "lxml" or "html.parser"
             "request_timeout": 10,
             "max_retries": 3,
             "min_image_size": 20,  # Minimum image size in bytes (if detectable)
-            "image_save_path": "./saves/pic"  # Default image save path
+            "image_workers": 4,  # Concurrent image downloads
+            "image_store": True,  # Keep each image once by content hash under <image dir>/store (False: <article>/<idx>.jpg files)
+            "image_save_path": "./saves/pic",  # Default image save path
+            "pool_size": 10,  # Keep-alive connections kept per host
+            "fetch_mode": "sequential",  # "sequential" or "async" (concurrent detail fetching)
+            "per_host_concurrency": 4,  # Max in-flight detail requests per host in async mode
+            "driver_max_pages": 50,  # Restart a pooled WebDriver after this many rendered pages
+            "search_mode": "static_first",  # "static_first" (HTTP, Selenium fallback) or "rendered" (always Selenium)
+            "http_cache_dir": None,  # On-disk response cache, e.g. "./saves/http_cache" (None disables caching)
+            "http_cache_ttl": 600,  # Seconds a cached page is served without revalidation
+            "http_cache_max_mb": 500,  # Cache size limit before LRU eviction
+            "url_store_path": "./saves/url_store.db",  # Cross-run record of fetched article URLs (None disables)
+            "incremental": False,  # Only fetch articles not seen in earlier runs
+            "refresh_age_hours": None,  # In incremental mode, refetch articles older than this (None = never)
+            "dedup_backend": "exact",  # Seen-link filter: "exact" (set) or "bloom" (fixed memory, rare false positives)
+            "dedup_capacity": 1000000,  # Expected number of links for the Bloom filter
+            "dedup_error_rate": 0.001,  # Bloom filter false-positive rate at capacity
+            "dedup_path": None,  # Save the seen-link filter here; loaded only when resuming (None keeps it in memory)
+            "checkpoint_path": "./saves/checkpoints/asahi_checkpoint.json",  # Crawl snapshot for resume (None disables)
+            "checkpoint_interval": 30,  # Seconds between checkpoint writes while crawling
+            "stream_formats": [],  # Append each valid article as it is parsed: "jsonl", "csv", "parquet" and/or "sqlite" (empty disables)
+            "stream_dir": "saves/stream",  # Directory of the streamed output files
+            "stream_fsync_every": 20,  # fsync streamed files after this many articles
+            "parquet_batch_size": 500,  # Articles per Parquet row group / part file
+            "sqlite_path": "./saves/articles.db",  # SQLite article store with full-text index ("sqlite" format)
+            "sqlite_batch_size": 100,  # Articles per SQLite transaction
+            "keep_results": True,  # Also keep articles in memory for crawl()'s return value (False keeps memory flat when streaming)
+            "metrics_dir": "./logs",  # Directory of the JSON run summary written by export_metrics (None disables)
+            "prometheus_path": None,  # Also write the run summary here in Prometheus text format (e.g. a node_exporter textfile)
+            "profile_stages": None,  # cProfile these metrics stages (e.g. ["parse", "extract"], or ["all"]); None disables profiling
+            "profile_every": 1,  # Profile every Nth call of each stage (a sample of the URLs)
+            "profile_top": 25  # Functions per stage in the profile summary
         }
+        unknown = set(config) - set(self.config)
+        if unknown:
+            raise TypeError(f"Unknown config option(s): {', '.join(sorted(unknown))}")
+        self.config.update(config)
+        self.search_page_sources = []  # Which path (static/rendered) served each search page
+        self.checkpoint = None  # CrawlCheckpoint of the running crawl (see crawl(resume=...))
+        self.sinks = []  # Streaming sinks of the running crawl (see config["stream_formats"])
+        self.url_store = UrlStore(self.config["url_store_path"], logger=self.logger) if self.config["url_store_path"] else None
+        # Links are canonicalized (query string dropped) and classified in one pass with precompiled patterns
+        self.url_classifier = UrlClassifier(
+            canonical=r"[^?]*",
+            accept=any_of(self.config["news_url_patterns"]),
+            exclude=any_of(self.config["excluded_url_patterns"]),
+            skip=r"^(?:#|javascript:)|(?i:/video/)"
+        )
+        self.http = HttpClient(
+            user_agents=[headers["User-Agent"] for headers in self.headers_list],
+            pool_size=self.config["pool_size"],
+            timeout=self.config["request_timeout"],
+            cache=HttpCache(
+                self.config["http_cache_dir"],
+                ttl=self.config["http_cache_ttl"],
+                max_size_bytes=self.config["http_cache_max_mb"] * 1024 * 1024,
+                logger=self.logger
+            ) if self.config["http_cache_dir"] else None,
+            logger=self.logger
+        )
+        # Images are validated before download and streamed to disk, several at a time
+        self.image_downloader = ImageDownloader(
+            self.http,
+            max_workers=self.config["image_workers"],
+            valid_extensions=self.config["valid_image_extensions"],
+            min_size=self.config["min_image_size"],
+            logger=self.logger
+        )
+        self.image_stores = {}  # Content-addressed image stores by root directory (see get_image_store)
+        self._image_store_lock = threading.Lock()
+        # Per-stage timings and counters of the current run (see export_metrics)
+        self.metrics = RunMetrics("asahi", logger=self.logger)
+        self.metrics.add_source("http", self.http.get_stats)
+        self.metrics.add_source("images", self.image_downloader.get_stats)
+        # Selenium drivers are reused across search pages (can be shared with other crawlers; a pool passed in
+        # belongs to the caller and is not closed by crawl())
+        self._owns_driver_pool = driver_pool is None
+        self.driver_pool = driver_pool or WebDriverPool(
+            max_pages_per_driver=self.config["driver_max_pages"],
+            headless=True,
+            stealth=True,
+            user_agents=[headers["User-Agent"] for headers in self.headers_list],
+            logger=self.logger
+        )
 
     def setup_logger(self):
         """Configure logging"""
@@ -81,14 +189,26 @@ class AsahiCrawler:
     
     def download_images(self, news_item, save_dir=None):
         """Download images from news item's image links to the specified directory"""
+        with self.metrics.stage("images"):
+            return self._download_images(news_item, save_dir)
+    
+    def _download_images(self, news_item, save_dir=None):
         if save_dir is None:
             save_dir = self.config["image_save_path"]
         
         os.makedirs(save_dir, exist_ok=True)
-        downloaded_files = []
+        url = news_item.get("原文链接", "")
+        
+        if self.config["image_store"]:
+            # Stored images are reused without a request; new ones are saved by content hash
+            store = self.get_image_store(save_dir)
+            image_urls = news_item.get("图片链接", [])
+            paths = self.image_downloader.download_many([(img_url, None) for img_url in image_urls], store)
+            if url:
+                store.link_article(url, image_urls)
+            return [path for path in paths if path]
         
         # Extract URL suffix from 原文链接
-        url = news_item.get("原文链接", "")
         if url:
             # Get the last part of the URL path (e.g., 'ASN123456789' from 'https://www.asahi.com/articles/ASN123456789.html')
             url_suffix = os.path.basename(url.rstrip('/')).split('?')[0]
@@ -102,49 +222,33 @@ class AsahiCrawler:
         article_dir = os.path.join(save_dir, folder_name)
         os.makedirs(article_dir, exist_ok=True)
         
-        for idx, img_url in enumerate(news_item.get("图片链接", []), start=1):
-            try:
-                headers = random.choice(self.headers_list)
-                response = requests.get(img_url, headers=headers, timeout=self.config["request_timeout"])
-                if response.status_code != 200:
-                    self.logger.error(f"下载图片失败: {img_url}, 状态码: {response.status_code}")
-                    continue
-                
-                # Extract file extension
-                ext = os.path.splitext(img_url)[1].lower()
-                if ext not in self.config["valid_image_extensions"]:
-                    self.logger.warning(f"跳过无效图片扩展名: {img_url}")
-                    continue
-                
-                # Check image size if possible
-                content_length = response.headers.get("Content-Length")
-                if content_length and int(content_length) < self.config["min_image_size"]:
-                    self.logger.warning(f"图片过小，跳过: {img_url}, 大小: {content_length} bytes")
-                    continue
-                
-                # Generate filename
-                filename = f"{idx}{ext}"
-                filepath = os.path.join(article_dir, filename)
-                
-                # Save image
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-                downloaded_files.append(filepath)
-                self.logger.info(f"成功下载图片: {img_url} 到 {filepath}")
-            
-            except Exception as e:
-                self.logger.error(f"下载图片失败: {img_url}, 错误: {str(e)}")
-                continue
-        
+        # Extension and size are checked before each body is read; files are named by position
+        jobs = [
+            (img_url, os.path.join(article_dir, f"{idx}{image_extension(img_url)}"))
+            for idx, img_url in enumerate(news_item.get("图片链接", []), start=1)
+        ]
+        downloaded_files = [path for path in self.image_downloader.download_many(jobs) if path]
         return downloaded_files
     
+    def get_image_store(self, save_dir):
+        """Content-addressed image store under save_dir/store (opened on first use)"""
+        # Keyed by absolute path: "./saves/pic" and "saves/pic" must share one store (and SQLite connection)
+        root = os.path.join(os.path.abspath(save_dir), "store")
+        with self._image_store_lock:
+            if root not in self.image_stores:
+                self.image_stores[root] = ImageStore(root, logger=self.logger)
+            return self.image_stores[root]
+    
     def fetch_url(self, url, retries=0):
-            """Fetch URL with retries and random User-Agent"""
-            headers = random.choice(self.headers_list)
-            self.logger.debug(f"使用 User-Agent: {headers['User-Agent']}")
+            """Fetch URL with retries through the pooled HTTP client"""
             for attempt in range(retries + 1):
                 try:
-                    response = requests.get(url, headers=headers, timeout=self.config["request_timeout"])
+                    response = self.http.get(url)
+                    if response.status_code in THROTTLE_STATUS_CODES and attempt < retries:
+                        # The rate limiter has already slowed down (and honors Retry-After) before the next attempt
+                        self.metrics.incr("retries", reason="throttled")
+                        self.logger.warning(f"请求被限流: {url}, 状态码: {response.status_code}，重试 {attempt + 1}/{retries}")
+                        continue
                     if response.status_code != 200:
                         self.logger.error(f"请求失败: {url}, 状态码: {response.status_code}")
                         return None
@@ -153,6 +257,7 @@ class AsahiCrawler:
                 except Exception as e:
                     if attempt < retries:
                         delay = 2 ** attempt
+                        self.metrics.incr("retries", reason="error")
                         self.logger.warning(f"请求 {url} 失败，重试 {attempt + 1}/{retries}，等待 {delay}s: {str(e)}")
                         time.sleep(delay)
                     else:
@@ -161,49 +266,38 @@ class AsahiCrawler:
             return None
 
     def fetch_rendered_page(self, url, render_timeout=15):
-            """Fetch fully rendered page using Selenium with random User-Agent"""
-            headers = random.choice(self.headers_list)
-            self.logger.debug(f"使用 User-Agent: {headers['User-Agent']}")
-            driver = None
+            """Fetch fully rendered page using a pooled Selenium driver"""
             try:
-                options = Options()
-                options.headless = True
-                options.add_argument(f"user-agent={headers['User-Agent']}")
-                # Reduce bot detection
-                options.add_argument("--disable-blink-features=AutomationControlled")
-                options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                options.add_experimental_option("useAutomationExtension", False)
-                
-                # Use webdriver_manager to ensure compatible ChromeDriver
-                driver = webdriver.Chrome(options=options)
-                driver.get(url)
-                
-                # Wait for search results or fallback selectors
-                selectors = [
-                    "div#Contents ul.ListBlock#SiteSearchResult li a",
-                ]
-                response_text = None
-                for selector in selectors:
-                    try:
-                        self.logger.debug(f"等待元素: {selector}")
-                        WebDriverWait(driver, render_timeout).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        time.sleep(random.uniform(0.5, 1.5))  # Random delay to mimic human behavior
+                with self.driver_pool.driver() as driver:
+                    self.http.rate_limiter.acquire(url)
+                    driver.get(url)
+                    
+                    # Wait for search results or fallback selectors
+                    selectors = [
+                        "div#Contents ul.ListBlock#SiteSearchResult li a",
+                    ]
+                    response_text = None
+                    for selector in selectors:
+                        try:
+                            self.logger.debug(f"等待元素: {selector}")
+                            WebDriverWait(driver, render_timeout).until(
+                                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                            )
+                            time.sleep(random.uniform(0.5, 1.5))  # Random delay to mimic human behavior
+                            response_text = driver.page_source
+                            self.logger.debug(f"成功找到元素 {selector} 并渲染页面: {url}")
+                            break
+                        except TimeoutException:
+                            self.logger.warning(f"未找到元素 {selector} 在 {render_timeout} 秒内")
+                            continue
+                    
+                    # If no selectors matched, return page source for debugging
+                    if not response_text:
+                        self.logger.warning(f"所有选择器均未找到，获取当前页面源码: {url}")
                         response_text = driver.page_source
-                        self.logger.debug(f"成功找到元素 {selector} 并渲染页面: {url}")
-                        break
-                    except TimeoutException:
-                        self.logger.warning(f"未找到元素 {selector} 在 {render_timeout} 秒内")
-                        continue
-                
-                # If no selectors matched, return page source for debugging
-                if not response_text:
-                    self.logger.warning(f"所有选择器均未找到，获取当前页面源码: {url}")
-                    response_text = driver.page_source
-                    self.logger.debug(f"页面内容片段: {response_text[:500]}")
-                
-                return response_text
+                        self.logger.debug(f"页面内容片段: {response_text[:500]}")
+                    
+                    return response_text
             
             except WebDriverException as e:
                 self.logger.error(f"Selenium 驱动错误: {url}, 错误: {str(e)}")
@@ -211,164 +305,408 @@ class AsahiCrawler:
             except Exception as e:
                 self.logger.error(f"渲染页面 {url} 失败: {str(e)}")
                 return None
-            finally:
-                if driver:
-                    try:
-                        driver.quit()
-                    except Exception as e:
-                        self.logger.debug(f"关闭驱动时出错: {str(e)}")
 
-    def crawl(self, url, max_news_count=float('inf'), max_nav_news=float('inf'), max_search_news=float('inf'), search_keyword=None, request_delay=0.5, render_timeout=10):
-        """Crawl Asahi website, including navigation and search results"""
+    def crawl(self, url, max_news_count=float('inf'), max_nav_news=float('inf'), max_search_news=float('inf'), search_keyword=None, request_delay=0.5, render_timeout=10, resume=False):
+        """Crawl Asahi website, including navigation and search results
+        
+        Progress is checkpointed to config["checkpoint_path"]; with resume=True the crawl continues from the
+        last checkpoint, keeping its results and skipping detail pages, categories and search pages already done.
+        """
         self.logger.info(f"开始爬取: {url}, 最大新闻数: {max_news_count}, 导航新闻数: {max_nav_news}, 搜索新闻数: {max_search_news}, 请求延迟: {request_delay}s, 渲染超时: {render_timeout}s")
         self.news_count = 0
-        visited_urls = set()
+        self.search_page_sources = []
+        self.metrics.reset()
+        self.metrics.profiler = None
+        if self.config["profile_stages"]:
+            self.metrics.profiler = StageProfiler(
+                "asahi", self.config["profile_stages"], every=self.config["profile_every"],
+                top=self.config["profile_top"], logger=self.logger
+            )
+        if request_delay and request_delay > 0:
+            # request_delay now seeds the adaptive per-host rate limiter instead of fixed sleeps
+            self.http.rate_limiter.set_initial_rate(1 / request_delay)
+        visited_urls = self.load_visited_urls(resume)
         news_list = []
         
-        # 1. Crawl navigation data (using static fetch for simplicity)
-        response_text = self.fetch_url(url, self.config["max_retries"])
-        if not response_text:
-            return {"navigation": [], "news": []}
-        
-        soup = BeautifulSoup(response_text, "html.parser")
-        navigation = self.extract_navigation(soup, url)
-        self.logger.info(f"成功提取导航数据，包含 {len(navigation)} 个分类")
-        
-        main_page_links = soup.find_all("a", href=True)
-        self.logger.info(f"主页面共找到 {len(main_page_links)} 个链接")
-        
-        main_news, visited_urls = self.process_links(main_page_links, url, navigation, visited_urls, min(max_nav_news, max_news_count), request_delay)
-        news_list.extend(main_news)
-        
-        for category in navigation:
-            if self.news_count >= max_nav_news or self.news_count >= max_news_count:
-                break
-            category_name = category.get("name", "未知分类")
-            category_url = category.get("url")
-            
-            if not category_url or not category_url.startswith("http"):
-                self.logger.warning(f"跳过无效分类链接: {category_url}")
-                continue
-                
-            self.logger.info(f"开始处理分类: {category_name} - {category_url}")
-            category_response = self.fetch_url(category_url, self.config["max_retries"])
-            if not category_response:
-                continue
-                
-            category_soup = BeautifulSoup(category_response, "html.parser")
-            category_links = category_soup.find_all("a", href=True)
-            self.logger.info(f"{category_name} 页面共找到 {len(category_links)} 个链接")
-            
-            category_news, visited_urls = self.process_links(category_links, category_url, navigation, visited_urls, min(max_nav_news - self.news_count, max_news_count - self.news_count), request_delay)
-            news_list.extend(category_news)
-            self.logger.info(f"完成处理分类: {category_name}，找到 {len(category_news)} 条新闻")
-            time.sleep(request_delay)
+        resumed = False
+        self.checkpoint = None
+        if self.config["checkpoint_path"]:
+            self.checkpoint = CrawlCheckpoint(self.config["checkpoint_path"], interval=self.config["checkpoint_interval"], logger=self.logger)
+            resumed = resume and self.checkpoint.load()
+        if resumed:
+            news_list = self.checkpoint.results
+            # Counted by the checkpoint: without keep_results the earlier items only exist in the streamed files
+            self.news_count = self.checkpoint.accepted
+            visited_urls.update(self.checkpoint.completed)
+        self.open_stream_sinks(resumed)
+        try:
+            # 1. Crawl navigation data (using static fetch for simplicity)
+            with self.metrics.stage("discover", source="home"):
+                response_text = self.fetch_url(url, self.config["max_retries"])
+                if response_text:
+                    # Listing page: only the anchors and the navigation block are built
+                    soup = make_link_soup(response_text, self.config["html_parser"], self.config["nav_selectors"])
+                    navigation = self.extract_navigation(soup, url)
+            if not response_text:
+                return {"navigation": [], "news": news_list}
+            self.logger.info(f"成功提取导航数据，包含 {len(navigation)} 个分类")
         
-        # 2. Crawl search results
-        if search_keyword and max_search_news > 0:
             if isinstance(search_keyword, str):
                 search_keywords = [search_keyword]
             else:
-                search_keywords = search_keyword
+                search_keywords = list(search_keyword or [])
+            if resumed and self.checkpoint.frontier:
+                pending_categories = set(self.checkpoint.frontier.get("categories", []))
+                pending_keywords = set(self.checkpoint.frontier.get("keywords", []))
+            else:
+                pending_categories = {category.get("url") for category in navigation}
+                pending_keywords = set(search_keywords)
+            self.save_checkpoint(frontier={"categories": sorted(c for c in pending_categories if c), "keywords": sorted(pending_keywords)})
+            progress = self.checkpoint.progress if self.checkpoint else {}
+        
+            if progress.get("main_page_done"):
+                self.logger.info("断点恢复：主页面链接已处理，跳过")
+            else:
+                main_page_links = soup.find_all("a", href=True)
+                self.logger.info(f"主页面共找到 {len(main_page_links)} 个链接")
             
-            for keyword in search_keywords:
-                if self.news_count >= max_news_count:
-                    self.logger.info(f"达到最大新闻数限制（总: {max_news_count}），停止搜索")
+                main_news, visited_urls = self.process_links(main_page_links, url, navigation, visited_urls, min(max_nav_news, max_news_count) - self.news_count, request_delay)
+                self.collect_news(news_list, main_news)
+                self.save_checkpoint(main_page_done=True)
+        
+            for category in navigation:
+                if self.news_count >= max_nav_news or self.news_count >= max_news_count:
                     break
-                try:
-                    keyword_news_count = 0
-                    search_news, visited_urls = self.crawl_search_results(keyword, min(max_search_news, max_news_count - self.news_count), visited_urls, max_news_count, request_delay, render_timeout)
-                    news_list.extend(search_news)
-                    keyword_news_count += len(search_news)
-                    self.logger.info(f"关键词 {keyword} 爬取完成，共找到 {keyword_news_count} 条新闻")
-                except Exception as e:
-                    self.logger.error(f"搜索关键词 {keyword} 失败，跳到下一个关键词: {str(e)}")
+                category_name = category.get("name", "未知分类")
+                category_url = category.get("url")
+            
+                if not category_url or not category_url.startswith("http"):
+                    self.logger.warning(f"跳过无效分类链接: {category_url}")
+                    continue
+                if category_url not in pending_categories:
+                    self.logger.info(f"断点恢复：分类已完成，跳过: {category_name}")
                     continue
+                
+                self.logger.info(f"开始处理分类: {category_name} - {category_url}")
+                with self.metrics.stage("discover", source="category"):
+                    category_response = self.fetch_url(category_url, self.config["max_retries"])
+                    if category_response:
+                        category_soup = make_link_soup(category_response, self.config["html_parser"])
+                        category_links = category_soup.find_all("a", href=True)
+                if not category_response:
+                    continue
+                self.logger.info(f"{category_name} 页面共找到 {len(category_links)} 个链接")
+            
+                category_news, visited_urls = self.process_links(category_links, category_url, navigation, visited_urls, min(max_nav_news - self.news_count, max_news_count - self.news_count), request_delay)
+                self.collect_news(news_list, category_news)
+                self.logger.info(f"完成处理分类: {category_name}，找到 {len(category_news)} 条新闻")
+                pending_categories.discard(category_url)
+                self.save_checkpoint(frontier={"categories": sorted(c for c in pending_categories if c), "keywords": sorted(pending_keywords)})
         
-        self.logger.info(f"完成爬取，共解析 {self.news_count} 条有效新闻，跳过 {len(visited_urls) - self.news_count} 个重复链接")
-        return {"navigation": navigation, "news": news_list}
+            # 2. Crawl search results
+            if search_keywords and max_search_news > 0:
+                for keyword in search_keywords:
+                    if self.news_count >= max_news_count:
+                        self.logger.info(f"达到最大新闻数限制（总: {max_news_count}），停止搜索")
+                        break
+                    if keyword not in pending_keywords:
+                        self.logger.info(f"断点恢复：关键词已完成，跳过: {keyword}")
+                        continue
+                    try:
+                        keyword_news_count = 0
+                        start_page = progress.get("search_pages", {}).get(keyword, 0) + 1
+                        search_news, visited_urls = self.crawl_search_results(keyword, min(max_search_news, max_news_count - self.news_count), visited_urls, max_news_count, request_delay, render_timeout, start_page)
+                        self.collect_news(news_list, search_news)
+                        keyword_news_count += len(search_news)
+                        self.logger.info(f"关键词 {keyword} 爬取完成，共找到 {keyword_news_count} 条新闻")
+                        pending_keywords.discard(keyword)
+                        self.save_checkpoint(frontier={"categories": sorted(c for c in pending_categories if c), "keywords": sorted(pending_keywords)})
+                    except Exception as e:
+                        self.logger.error(f"搜索关键词 {keyword} 失败，跳到下一个关键词: {str(e)}")
+                        continue
+        
+            if self.search_page_sources:
+                static_pages = sum(1 for entry in self.search_page_sources if entry["source"] == "static")
+                self.logger.info(f"搜索页面来源: 静态 {static_pages} 页, 渲染 {len(self.search_page_sources) - static_pages} 页")
+            self.logger.info(f"完成爬取，共解析 {self.news_count} 条有效新闻，跳过 {len(visited_urls) - self.news_count} 个重复链接")
+            self.save_visited_urls(visited_urls)
+            self.close_stream_sinks()
+            self.save_checkpoint(finished=True)
+            return {"navigation": navigation, "news": news_list}
+        finally:
+            # Always flush/close the streamed outputs (Parquet buffer, SQLite batch) and the browsers, also on early
+            # return or an exception
+            self.close_stream_sinks()
+            if self._owns_driver_pool:
+                self.driver_pool.close()
+
+    def save_checkpoint(self, frontier=None, **progress):
+        """Update the running crawl's checkpoint and write it to disk now"""
+        if self.checkpoint is None:
+            return
+        if frontier is not None:
+            self.checkpoint.set_frontier(frontier)
+        if progress:
+            self.checkpoint.set_progress(**progress)
+        self.checkpoint.save()
+    
+    def checkpoint_item(self, detail_url, news_item):
+        """Record a finished detail page in the checkpoint (written every checkpoint_interval seconds)"""
+        if self.checkpoint is not None:
+            # Without keep_results the items live only in the streamed files
+            self.checkpoint.mark_completed(detail_url, news_item if self.config["keep_results"] else None,
+                                           accepted=news_item is not None)
+    
+    def collect_news(self, news_list, news_items):
+        """Add a batch of parsed items to the crawl result unless keep_results is off"""
+        if self.config["keep_results"]:
+            news_list.extend(news_items)
+    
+    def open_stream_sinks(self, resumed=False):
+        """Open the streaming sinks for this crawl, appending to the checkpointed files when resuming"""
+        self.sinks = []
+        formats = self.config["stream_formats"]
+        if not formats:
+            return
+        paths = dict(self.checkpoint.progress.get("stream_files", {})) if resumed and self.checkpoint else {}
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        for fmt in formats:
+            # The SQLite store accumulates every run in one database; file formats get one file per run
+            paths.setdefault(fmt, self.config["sqlite_path"] if fmt == "sqlite" else f"{self.config['stream_dir']}/{stamp}.{fmt}")
+        self.sinks = open_sinks(formats, paths, self.CSV_FIELDNAMES, self.csv_row, self.config["stream_fsync_every"], self.logger,
+                                article_record_builder=self.article_record, parquet_batch_size=self.config["parquet_batch_size"],
+                                sqlite_batch_size=self.config["sqlite_batch_size"])
+        self.logger.info(f"流式输出已开启: {', '.join(sink.path for sink in self.sinks)}")
+        if self.checkpoint is not None:
+            self.checkpoint.set_progress(stream_files=paths)
+    
+    def stream_news_item(self, news_item):
+        """Download a valid item's images and append it to every streaming sink"""
+        if not self.sinks:
+            return
+        news_item["下载的图片路径"] = self.download_images(news_item)
+        with self.metrics.stage("save", output="stream"):
+            for sink in self.sinks:
+                try:
+                    sink.write(news_item)
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"写入流式输出失败: {sink.path}, {str(e)}")
+    
+    def close_stream_sinks(self):
+        for sink in self.sinks:
+            sink.close()
+            self.logger.info(f"流式输出完成: {sink.path}，共 {sink.count} 条")
+        self.sinks = []
+    
+    def load_visited_urls(self, resume=False):
+        """Seen-link filter for a crawl, restored from dedup_path only when resuming
 
+        Skipping articles fetched in earlier runs is left to the URL store (incremental mode), which
+        also honours refresh_age_hours; a saved filter would skip every link it has ever seen.
+        """
+        path = self.config["dedup_path"]
+        if resume and path and os.path.exists(path):
+            try:
+                visited_urls = load_url_filter(path)
+                self.logger.info(f"已加载链接去重记录: {path}，共 {len(visited_urls)} 条")
+                return visited_urls
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"加载链接去重记录失败，将重新开始: {path}, {str(e)}")
+        return make_url_filter(self.config["dedup_backend"], self.config["dedup_capacity"], self.config["dedup_error_rate"])
+    
+    def save_visited_urls(self, visited_urls):
+        """Persist the seen-link filter to dedup_path (if configured)"""
+        path = self.config["dedup_path"]
+        if not path:
+            return
+        try:
+            visited_urls.save(path)
+            self.logger.info(f"链接去重记录已保存: {path}")
+        except OSError as e:
+            self.logger.error(f"保存链接去重记录失败: {path}, {str(e)}")
+    
     def process_links(self, links, base_url, navigation, visited_urls, max_news, request_delay):
-        """Process a list of links, extract news data with URL deduplication"""
+        """Process a list of links, extract news data with URL deduplication
+        
+        visited_urls is updated in place and returned.
+        """
+        if self.config["fetch_mode"] == "async":
+            return self.process_links_async(links, base_url, visited_urls, max_news)
+        
         news_items = []
-        new_visited = set()
         count = 0
         for idx, link_elem in enumerate(links):
             if count >= max_news:
                 break
             try:
-                detail_url = link_elem["href"]
-                if not detail_url.startswith("http"):
-                    detail_url = urljoin(base_url, detail_url)
-                detail_url = detail_url.split('?')[0] if '?' in detail_url else detail_url
-                
-                if not detail_url or detail_url.startswith(("#", "javascript:")) or "/video/" in detail_url.lower():
+                detail_url, is_news = self.url_classifier.classify(link_elem["href"], base_url)
+                if not detail_url:
                     continue
-                if detail_url in visited_urls or detail_url in new_visited:
+                if detail_url in visited_urls:
+                    self.metrics.incr("skipped", reason="duplicate")
                     self.logger.debug(f"跳过重复链接: {detail_url}")
                     continue
-                new_visited.add(detail_url)
+                visited_urls.add(detail_url)
                 
-                if not self.is_news_link(detail_url):
+                if not is_news:
+                    self.metrics.incr("skipped", reason="not_news")
                     self.logger.debug(f"跳过非新闻链接: {detail_url}")
                     continue
-                
-                is_paid = self.is_paid_content(detail_url)
-                if is_paid:
-                    self.logger.info(f"跳过付费内容: {detail_url}")
+                if not self.should_fetch(detail_url):
+                    self.metrics.incr("skipped", reason="incremental")
+                    self.logger.debug(f"增量模式跳过已爬取链接: {detail_url}")
                     continue
                 
-                page_data = self.crawl_detail_page(detail_url)
-                image_links = self.extract_images(detail_url)
-                
-                try:
-                    title = page_data.get("title", "").encode('utf-8', 'replace').decode('utf-8')
-                except UnicodeEncodeError:
-                    self.logger.warning(f"标题包含无法编码的字符: {page_data.get('title', '')[:10]}...")
-                    title = page_data.get("title", "")
-                
-                news_item = {
-                    "标题": title,
-                    "发布时间": page_data.get("publish_time", ""),
-                    "正文": "\n".join(page_data.get("content", [])),
-                    "主题": page_data.get("topic", ""),
-                    "图片数量": len(image_links),
-                    "图片链接": image_links,
-                    "原文链接": detail_url
-                }
-                
-                if title and page_data.get("content") and page_data.get("publish_time"):
+                news_item = self.parse_news_item(detail_url, f"{idx+1}/{len(links)}")
+                if news_item:
+                    self.stream_news_item(news_item)
+                self.checkpoint_item(detail_url, news_item)
+                if news_item:
                     news_items.append(news_item)
                     self.news_count += 1
                     count += 1
-                    self.logger.info(f"成功解析新闻 {idx+1}/{len(links)}: {title[:30]}... , 链接: {detail_url}")
-                else:
-                    self.logger.warning(f"跳过无效新闻 {idx+1}/{len(links)}: 标题或正文为空，链接: {detail_url}")
-                
-                time.sleep(request_delay)
             
             except Exception as e:
                 self.logger.error(f"处理链接 {idx+1}/{len(links)} 时出错: {str(e)}")
                 continue
         
-        return news_items, visited_urls.union(new_visited)
+        return news_items, visited_urls
+    
+    def process_links_async(self, links, base_url, visited_urls, max_news):
+        """Concurrent variant of process_links: fetch candidate articles with a per-host limit, keeping link order"""
+        new_visited = set()
+        if max_news <= 0:
+            return [], visited_urls
+        
+        candidates = []
+        scheduled = set()
+        for link_elem in links:
+            try:
+                detail_url, is_news = self.url_classifier.classify(link_elem["href"], base_url)
+            except Exception as e:
+                self.logger.error(f"处理链接时出错: {str(e)}")
+                continue
+            if not detail_url:
+                continue
+            if detail_url in visited_urls or detail_url in scheduled:
+                self.metrics.incr("skipped", reason="duplicate")
+                continue
+            scheduled.add(detail_url)
+            if not is_news:
+                new_visited.add(detail_url)
+                self.metrics.incr("skipped", reason="not_news")
+                self.logger.debug(f"跳过非新闻链接: {detail_url}")
+                continue
+            if not self.should_fetch(detail_url):
+                new_visited.add(detail_url)
+                self.metrics.incr("skipped", reason="incremental")
+                self.logger.debug(f"增量模式跳过已爬取链接: {detail_url}")
+                continue
+            candidates.append(detail_url)
+        
+        positions = {detail_url: idx for idx, detail_url in enumerate(candidates, start=1)}
+        
+        def worker(detail_url):
+            return self.fetch_news_item(detail_url, f"{positions[detail_url]}/{len(candidates)}")
+        
+        def consume(detail_url, outcome):
+            # Runs in link order and only up to the cut-off, so everything recorded is also returned
+            news_item, status = outcome
+            new_visited.add(detail_url)
+            self.record_outcome(detail_url, status, news_item)
+            if news_item:
+                self.stream_news_item(news_item)
+            self.checkpoint_item(detail_url, news_item)
+            return news_item
+        
+        engine = AsyncFetchEngine(per_host_limit=self.config["per_host_concurrency"], logger=self.logger)
+        results = engine.run(candidates, worker, max_results=max_news, consume=consume)
+        news_items = [news_item for _, news_item in results]
+        self.news_count += len(news_items)
+        visited_urls.update(new_visited)
+        return news_items, visited_urls
+    
+    def should_fetch(self, detail_url):
+        """In incremental mode, skip articles fetched in earlier runs unless older than refresh_age_hours"""
+        if not self.config["incremental"] or self.url_store is None:
+            return True
+        refresh_hours = self.config["refresh_age_hours"]
+        return self.url_store.should_fetch(detail_url, refresh_hours * 3600 if refresh_hours is not None else None)
+    
+    def record_fetch(self, detail_url, status, content=None):
+        """Record a detail fetch outcome in the cross-run URL store"""
+        if self.url_store is None:
+            return
+        try:
+            content_hash = self.url_store.content_hash(content) if content is not None else None
+            self.url_store.mark_fetched(detail_url, source="asahi", status=status, content_hash=content_hash)
+        except Exception as e:
+            self.logger.warning(f"记录URL失败: {detail_url}, {str(e)}")
+    
+    def parse_news_item(self, detail_url, progress=""):
+        """Fetch one article and build its news item; returns None for paid, unreachable or invalid pages"""
+        news_item, status = self.fetch_news_item(detail_url, progress)
+        self.record_outcome(detail_url, status, news_item)
+        return news_item
+    
+    def record_outcome(self, detail_url, status, news_item=None):
+        """Count a detail page's outcome and record it in the URL store (failed fetches are not recorded, so they are retried)"""
+        if status == "ok":
+            self.metrics.incr("articles")
+            self.record_fetch(detail_url, "ok", news_item["正文"])
+            return
+        self.metrics.incr("skipped", reason=status)
+        if status != "fetch_failed":
+            self.record_fetch(detail_url, status)
+    
+    def fetch_news_item(self, detail_url, progress=""):
+        """Fetch and extract one article without recording anything; returns (news_item or None, status)
+
+        status is "ok", "fetch_failed", "paid" or "invalid" (see record_outcome).
+        """
+        # Fetch and parse the detail page once, then share it across all extraction steps
+        with self.metrics.stage("fetch"):
+            response_text = self.fetch_url(detail_url, self.config["max_retries"])
+        if not response_text:
+            self.logger.warning(f"跳过无法获取的新闻 {progress}: {detail_url}")
+            return None, "fetch_failed"
+        with self.metrics.stage("parse"):
+            soup = make_soup(response_text, self.config["html_parser"])
+        
+        with self.metrics.stage("extract"):
+            is_paid = self.is_paid_content(detail_url, soup=soup)
+            if not is_paid:
+                page_data = self.crawl_detail_page(detail_url, response_text=response_text, soup=soup)
+                image_links = self.extract_images(detail_url, soup=soup)
+        if is_paid:
+            self.logger.info(f"跳过付费内容: {detail_url}")
+            return None, "paid"
+        
+        try:
+            title = page_data.get("title", "").encode('utf-8', 'replace').decode('utf-8')
+        except UnicodeEncodeError:
+            self.logger.warning(f"标题包含无法编码的字符: {page_data.get('title', '')[:10]}...")
+            title = page_data.get("title", "")
+        
+        news_item = {
+            "标题": title,
+            "发布时间": page_data.get("publish_time", ""),
+            "正文": "\n".join(page_data.get("content", [])),
+            "主题": page_data.get("topic", ""),
+            "图片数量": len(image_links),
+            "图片链接": image_links,
+            "原文链接": detail_url
+        }
+        
+        if title and page_data.get("content") and page_data.get("publish_time"):
+            self.logger.info(f"成功解析新闻 {progress}: {title[:30]}... , 链接: {detail_url}")
+            return news_item, "ok"
+        self.logger.warning(f"跳过无效新闻 {progress}: 标题或正文为空，链接: {detail_url}")
+        return None, "invalid"
     
     def is_news_link(self, url):
         """Check if URL points to a news page"""
-        exclude_patterns = [
-            r"/profile/", r"/about/", r"/contact/", r"/privacy/", 
-            r"/terms/", r"/sitemap/", r"/faq/", r"/search/",
-            r"/subscribe/", r"/login/", r"/register/", r"/logout/"
-        ]
-        for pattern in exclude_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return False
-        
-        news_patterns = [r"https://www.asahi.com/articles/"]
-        for pattern in news_patterns:
-            if pattern in url.lower():
-                return True
-        return False
+        return self.url_classifier.is_news(url)
     
     def extract_navigation(self, soup, base_url):
         """Extract website navigation data"""
@@ -414,15 +752,16 @@ class AsahiCrawler:
         self.logger.info(f"成功提取 {len(navigation)} 个导航项")
         return navigation
     
-    def is_paid_content(self, url):
-        """Check if URL points to paid content"""
+    def is_paid_content(self, url, soup=None):
+        """Check if URL points to paid content (reuses an already parsed page if given)"""
         try:
             if not url:
                 return False
-            response_text = self.fetch_url(url, self.config["max_retries"])
-            if not response_text:
-                return False
-            soup = BeautifulSoup(response_text, "html.parser")
+            if soup is None:
+                response_text = self.fetch_url(url, self.config["max_retries"])
+                if not response_text:
+                    return False
+                soup = make_soup(response_text, self.config["html_parser"])
             for selector in self.config["paid_selectors"]:
                 if soup.select(selector):
                     self.logger.info(f"发现付费内容: {url}")
@@ -432,18 +771,20 @@ class AsahiCrawler:
             self.logger.error(f"判断付费内容时出错: {url}, {str(e)}")
             return False
     
-    def crawl_detail_page(self, url):
-        """Crawl detail page content"""
+    def crawl_detail_page(self, url, response_text=None, soup=None):
+        """Crawl detail page content (reuses already fetched/parsed page if given)"""
         try:
-            response_text = self.fetch_url(url, self.config["max_retries"])
+            if response_text is None:
+                response_text = self.fetch_url(url, self.config["max_retries"])
             if not response_text:
                 return {"content": [], "title": "", "publish_time": "", "topic": ""}
+            if soup is None:
+                soup = make_soup(response_text, self.config["html_parser"])
             
             if extract:  # Use trafilatura if available
                 extracted = extract(response_text, url=url, include_images=False, include_formatting=False)
                 if extracted:
                     content = [line.strip() for line in extracted.split('\n') if line.strip()]
-                    soup = BeautifulSoup(response_text, 'html.parser')
                     title = soup.find('div', class_='y_Qv3') or soup.find('h1')
                     title = title.get_text(strip=True) if title else ""
                     time_element = soup.find('time')
@@ -453,7 +794,6 @@ class AsahiCrawler:
                     return {"content": content, "title": title, "publish_time": publish_time, "topic": topic}
             
             # Fallback to original extraction
-            soup = BeautifulSoup(response_text, 'html.parser')
             topic = soup.find('meta', {'name': 'cXenseParse:ash-category'})
             topic = topic['content'] if topic and 'content' in topic.attrs else ""
             
@@ -491,14 +831,15 @@ class AsahiCrawler:
             self.logger.error(f"爬取详情页内容出错: {url}, {str(e)}")
             return {"content": [], "title": "", "publish_time": "", "topic": ""}
     
-    def extract_images(self, url):
-        """Extract all image links from a detail page"""
+    def extract_images(self, url, soup=None):
+        """Extract all image links from a detail page (reuses an already parsed page if given)"""
         try:
-            response_text = self.fetch_url(url, self.config["max_retries"])
-            if not response_text:
-                return []
-                
-            soup = BeautifulSoup(response_text, "html.parser")
+            if soup is None:
+                response_text = self.fetch_url(url, self.config["max_retries"])
+                if not response_text:
+                    return []
+                soup = make_soup(response_text, self.config["html_parser"])
+            
             image_links = set()
             
             for selector in self.config["content_selectors"]:
@@ -547,22 +888,66 @@ class AsahiCrawler:
             os.makedirs(output_dir, exist_ok=True)
             filename = f"{output_dir}/{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             with open(filename, "w", encoding="utf-8-sig", newline="") as csvfile:
-                fieldnames = ["序号", "标题", "发布时间", "正文", "主题", "图片数量", "图片链接", "原文链接", "下载的图片路径"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=self.CSV_FIELDNAMES)
                 writer.writeheader()
                 for idx, news in enumerate(data["news"], start=1):
-                    row = {
-                        "序号": idx,
-                        **news,
-                        "下载的图片路径": ";".join(news.get("下载的图片路径", []))  # Join paths with semicolon for CSV
-                    }
-                    writer.writerow(row)
+                    writer.writerow(self.csv_row(news, idx))
             self.logger.info(f"新闻数据已保存到CSV: {filename}")
             return filename
         except Exception as e:
             self.logger.error(f"保存CSV失败: {str(e)}")
             return None
 
+    def csv_row(self, news, idx):
+        """CSV row for one news item (shared by save_to_csv and the streaming CSV sink)"""
+        return {
+            "序号": idx,
+            **news,
+            "下载的图片路径": ";".join(news.get("下载的图片路径", []))  # Join paths with semicolon for CSV
+        }
+
+    def article_record(self, news):
+        """Typed record for one news item, used by the Parquet and SQLite outputs (see common.parquet_export.article_schema)"""
+        return {
+            "source": "asahi",
+            "url": news["原文链接"],
+            "title": news["标题"],
+            "publish_time": parse_publish_time(news["发布时间"]),
+            "publish_time_raw": news["发布时间"],
+            "content": news["正文"],
+            "category": None,
+            "topic": news.get("主题") or None,
+            "image_urls": list(news.get("图片链接", [])),
+            "local_image_paths": list(news.get("下载的图片路径", [])),
+            "scraped_at": datetime.now(JST),
+        }
+
+    def save_to_parquet(self, data, output_dir="saves/parquet"):
+        """Save news items as a Parquet dataset (one part file per parquet_batch_size items)"""
+        try:
+            dataset_dir = f"{output_dir}/{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
+            with ParquetSink(dataset_dir, batch_size=self.config["parquet_batch_size"], logger=self.logger) as sink:
+                for news in data["news"]:
+                    sink.write(self.article_record(news))
+            self.logger.info(f"新闻数据已保存到Parquet: {dataset_dir}")
+            return dataset_dir
+        except Exception as e:
+            self.logger.error(f"保存Parquet失败: {str(e)}")
+            return None
+
+    def save_to_sqlite(self, data, db_path=None):
+        """Upsert news items into the SQLite article store (keyed on URL, full-text indexed)"""
+        db_path = db_path or self.config["sqlite_path"]
+        try:
+            with ArticleStore(db_path, batch_size=self.config["sqlite_batch_size"], logger=self.logger) as store:
+                store.write_many(self.article_record(news) for news in data["news"])
+                total = store.total()
+            self.logger.info(f"新闻数据已写入SQLite: {db_path}（库中共 {total} 条）")
+            return db_path
+        except Exception as e:
+            self.logger.error(f"写入SQLite失败: {str(e)}")
+            return None
+
     def save_to_json(self, data, output_dir="saves/json"):
         """Save data to JSON file"""
         try:
@@ -582,18 +967,44 @@ class AsahiCrawler:
         
         # Update news items with downloaded image paths
         for news_item in data["news"]:
+            if "下载的图片路径" in news_item:
+                continue  # Already downloaded while streaming
             downloaded_files = self.download_images(news_item, os.path.join(output_dir, "pic"))
             news_item["下载的图片路径"] = downloaded_files  # Add downloaded file paths to news item
         
         if "csv" in output_formats:
-            results.append(self.save_to_csv(data, f"{output_dir}/csv"))
+            with self.metrics.stage("save", output="csv"):
+                results.append(self.save_to_csv(data, f"{output_dir}/csv"))
         if "json" in output_formats:
-            results.append(self.save_to_json(data, f"{output_dir}/json"))
+            with self.metrics.stage("save", output="json"):
+                results.append(self.save_to_json(data, f"{output_dir}/json"))
+        if "parquet" in output_formats:
+            with self.metrics.stage("save", output="parquet"):
+                results.append(self.save_to_parquet(data, f"{output_dir}/parquet"))
+        if "sqlite" in output_formats:
+            with self.metrics.stage("save", output="sqlite"):
+                results.append(self.save_to_sqlite(data))
         
         return results
+    
+    def export_metrics(self):
+        """Log the run summary and write it as JSON to metrics_dir (and Prometheus text to prometheus_path); with
+        profiling on, also write the per-stage profiles and the hotspot summary there"""
+        summary = self.metrics.log_summary()
+        if self.config["metrics_dir"]:
+            path = os.path.join(self.config["metrics_dir"], f"asahi_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            self.metrics.write_json(path, summary)
+        if self.config["prometheus_path"]:
+            self.metrics.write_prometheus(self.config["prometheus_path"], summary)
+        if self.metrics.profiler is not None:
+            self.metrics.profiler.write(self.config["metrics_dir"] or "./logs")
+        return summary
 
-    def crawl_search_results(self, keyword, max_search_news, visited_urls, max_news_count, request_delay, render_timeout=15):
-        """Crawl search result pages with rendering"""
+    def crawl_search_results(self, keyword, max_search_news, visited_urls, max_news_count, request_delay, render_timeout=15, start_page=1):
+        """Crawl search result pages, trying a static fetch before Selenium rendering
+        
+        start_page lets a resumed crawl continue after the last checkpointed page.
+        """
         self.logger.info(f"开始爬取搜索结果，关键词: {keyword}, 最大新闻数: {max_search_news}, 渲染超时: {render_timeout}s")
         news_list = []
         new_visited = set()
@@ -601,7 +1012,8 @@ class AsahiCrawler:
         encoded_keyword = quote(keyword)
         base_search_url = "https://sitesearch.asahi.com/sitesearch/?Keywords={}&Searchsubmit2=検索&Searchsubmit=検索"
         
-        page = 1
+        page = start_page
+        try_static = self.config["search_mode"] == "static_first"
         while True:
             if self.news_count >= max_news_count or len(news_list) >= max_search_news:
                 self.logger.info(f"达到最大新闻数限制（总: {max_news_count}, 搜索: {max_search_news}），停止搜索")
@@ -609,22 +1021,17 @@ class AsahiCrawler:
             search_url = base_search_url.format(encoded_keyword) + f"&start={20 * (page - 1)}"
             self.logger.info(f"爬取搜索页面 {page}: {search_url}")
             
-            # Fetch rendered page with Selenium
-            response_text = self.fetch_rendered_page(search_url, render_timeout)
+            with self.metrics.stage("discover", source="search"):
+                response_text, search_results, source = self.fetch_search_page(search_url, render_timeout, try_static)
             if not response_text:
-                self.logger.warning(f"无法渲染页面 {search_url}，停止此页")
+                self.logger.warning(f"无法获取页面 {search_url}，停止此页")
                 break
-                
-            soup = BeautifulSoup(response_text, "html.parser")
-            
-            # Try primary selector
-            search_results = soup.select("ul.ListBlock#SiteSearchResult li a")
-            if not search_results:
-                # Fallback selector within div#Contents
-                search_results = soup.select("div#Contents ul.ListBlock#SiteSearchResult li a")
-                self.logger.warning(f"主选择器未找到结果，尝试备用选择器: div#Contents ul.ListBlock#SiteSearchResult li a")
+            self.search_page_sources.append({"keyword": keyword, "page": page, "url": search_url, "source": source, "results": len(search_results)})
+            if source == "rendered" and search_results:
+                # Static HTML missed results that rendering found; skip the static attempt for this keyword's remaining pages
+                try_static = False
             
-            self.logger.info(f"搜索页面 {page} 找到 {len(search_results)} 个链接")
+            self.logger.info(f"搜索页面 {page} 找到 {len(search_results)} 个链接（来源: {source}）")
             if search_results:
                 self.logger.debug(f"页面内容片段: {response_text[:500]}")
             else:
@@ -634,20 +1041,61 @@ class AsahiCrawler:
             
             page_news, visited_urls = self.process_links(search_results, search_url, [], visited_urls, min(max_search_news - len(news_list), max_news_count - self.news_count), request_delay)
             news_list.extend(page_news)
+            if self.checkpoint is not None:
+                self.save_checkpoint(search_pages=dict(self.checkpoint.progress.get("search_pages", {}), **{keyword: page}))
             
             page += 1
-            time.sleep(random.randint(2,4))
         
         self.logger.info(f"搜索爬取完成（关键词: {keyword}），共找到 {len(news_list)} 条新闻")
         return news_list, visited_urls
+    
+    def fetch_search_page(self, search_url, render_timeout=15, try_static=True):
+        """Fetch one search results page: plain HTTP first, Selenium only if the static HTML has no results
+        
+        Returns (response_text, search_result_links, source) where source is "static" or "rendered".
+        """
+        if try_static:
+            response_text = self.fetch_url(search_url, self.config["max_retries"])
+            if response_text:
+                search_results = self.select_search_results(self.parse_search_page(response_text))
+                if search_results:
+                    return response_text, search_results, "static"
+            self.logger.info(f"静态页面无搜索结果，改用浏览器渲染: {search_url}")
+        
+        # Fetch rendered page with Selenium
+        response_text = self.fetch_rendered_page(search_url, render_timeout)
+        if not response_text:
+            return None, [], "rendered"
+        return response_text, self.select_search_results(self.parse_search_page(response_text)), "rendered"
+    
+    def parse_search_page(self, response_text):
+        """Parse a search page, building only its anchors and the result list"""
+        return make_link_soup(response_text, self.config["html_parser"], ["ul#SiteSearchResult"])
+    
+    def select_search_results(self, soup):
+        """Select result links from a search page"""
+        # Try primary selector
+        search_results = soup.select("ul.ListBlock#SiteSearchResult li a")
+        if not search_results:
+            # Fallback selector within div#Contents
+            search_results = soup.select("div#Contents ul.ListBlock#SiteSearchResult li a")
+            self.logger.debug(f"主选择器未找到结果，尝试备用选择器: div#Contents ul.ListBlock#SiteSearchResult li a")
+        return search_results
 
 if __name__ == "__main__":
     import sys
     if sys.platform.startswith('win'):
         import io
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    import argparse
+    parser = argparse.ArgumentParser(description="Asahi news crawler")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint of an interrupted crawl")
+    parser.add_argument("--profile", nargs="+", metavar="STAGE", help="cProfile these stages (discover, fetch, parse, extract, images, save or all); results go to ./logs")
+    parser.add_argument("--profile-every", type=int, default=1, help="profile every Nth call of each stage")
+    args = parser.parse_args()
     
     crawler = AsahiCrawler()
+    crawler.config.update(profile_stages=args.profile, profile_every=args.profile_every)
     target_url = "https://www.asahi.com/"
     search_keywords = ["花束みたいな恋をした","ラブレター","言葉の庭","君の名は。","打ち上げ花火","小森",]
     
@@ -668,7 +1116,8 @@ if __name__ == "__main__":
         max_search_news=config["max_search_news"],
         search_keyword=search_keywords,
         request_delay=config["request_delay"],
-        render_timeout=config["render_timeout"]
+        render_timeout=config["render_timeout"],
+        resume=args.resume
     )
 
     if result and result["news"]:
@@ -680,6 +1129,7 @@ if __name__ == "__main__":
                 "total_news": len(result["news"]),
                 "free_news": len(free_news),
                 "navigation_count": len(result["navigation"]),
+                "search_page_sources": crawler.search_page_sources,
             }
         }
         
@@ -689,6 +1139,8 @@ if __name__ == "__main__":
             print(f"发现 {len(result['navigation'])} 个导航分类")
             print(f"数据已保存到: {', '.join([f for f in saved_files if f])}")
             print(f"图片已保存到: {crawler.config['image_save_path']}")
+            if crawler.checkpoint is not None:
+                crawler.checkpoint.clear()  # Results are saved; the next run starts fresh
         else:
             print("未爬取到任何免费新闻数据")
     else:
@@ -702,4 +1154,11 @@ if __name__ == "__main__":
     crawler.logger.info(f"- 开始时间: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     crawler.logger.info(f"- 结束时间: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
     crawler.logger.info(f"- 总耗时: {elapsed_time.total_seconds():.2f} 秒 ({elapsed_time})")
+    crawler.http.log_stats()
+    crawler.image_downloader.log_stats()
+    crawler.export_metrics()
+    crawler.image_downloader.close()
+    for image_store in crawler.image_stores.values():
+        image_store.close()
+    crawler.http.close()
     
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""End-to-end crawl throughput against the local stand-in news server.
+
+Usage:
+    python benchmarks/bench_crawl.py --articles 50
+    python benchmarks/bench_crawl.py --site yahoo --fetch-mode async --concurrency 8 --rate 20 --json crawl.json
+    python benchmarks/bench_crawl.py --latency 0.1 --error-rate 0.02 --throttle-rate 0.02 --image-workers 8
+    python benchmarks/bench_crawl.py --site yahoo --profile parse extract --workdir ./bench_run
+
+Starts ``standin_server.StandinNewsServer`` and runs ``AsahiCrawler.crawl``
+and ``YahooJapanNewsScraper.scrape_news`` against it. The crawlers keep
+their real URLs; their HTTP client routes those hosts to the local server.
+Everything else is the crawlers' own code path: rate limiter, retries,
+HTTP cache, detail fetching, image download and streamed output (jsonl),
+all inside a scratch working directory.
+
+Reported per crawler: articles/sec, requests per article (as counted by the
+server, including redirects, retries and images), responses by status, and
+p50/p95 latency of each stage: single requests by page kind
+(``request:<kind>``), whole article (fetch, parse, extract), article page
+fetches, pickup resolution, link discovery and image download.
+
+Yahoo's category and keyword-search sources are driven by Selenium and are
+not exercised; its links come from the topic pages. Asahi's search runs on
+the static path (the stand-in always has results, so the Selenium fallback
+is not reached unless ``--search-news`` exceeds the available results).
+Use ``--rate`` (requests/sec per host the rate limiter may reach) together
+with ``--fetch-mode``, ``--concurrency`` and ``--image-workers`` to size
+concurrency settings. ``--profile`` turns on the crawlers' stage profiling;
+the profiles and hotspot summaries are written to ``<workdir>/logs``.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "asahi"))
+sys.path.append(os.path.join(ROOT, "yahoo"))
+from corpus import page_kind
+from standin_server import StandinNewsServer, YAHOO_TOPICS
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+
+def request_kind(url):
+    kind = page_kind(url)[1]
+    if kind:
+        return kind
+    return "image" if url.split("?")[0].lower().endswith(IMAGE_EXTENSIONS) else "other"
+
+
+class StageTimer:
+    """Wall time of every call to wrapped functions, grouped by stage"""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, stage, func):
+        """``func`` timed under ``stage`` (a name, or a function of the call's args giving the name)"""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                name = stage(*args, **kwargs) if callable(stage) else stage
+                with self._lock:
+                    self.samples.setdefault(name, []).append(time.perf_counter() - start)
+        return timed
+
+    def summary(self):
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self.samples.items()}
+        return {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(values[len(values) // 2] * 1000, 1),
+                "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 1),
+                "total_s": round(sum(values), 2),
+            }
+            for stage, values in sorted(samples.items())
+        }
+
+
+def prepare(crawler, server, args):
+    if not args.verbose:
+        crawler.logger.setLevel(logging.ERROR)
+    crawler.http.routes.update(server.routes())
+    limiter = crawler.http.rate_limiter
+    limiter.max_rate = max(limiter.max_rate, args.rate)
+    limiter.set_initial_rate(args.rate)
+    crawler.image_downloader.max_workers = max(1, args.image_workers)
+
+
+def run_asahi(server, args, timer):
+    from asahi import AsahiCrawler
+
+    crawler = AsahiCrawler()
+    crawler.config.update(
+        fetch_mode=args.fetch_mode,
+        per_host_concurrency=args.concurrency,
+        stream_formats=["jsonl"],  # Streaming downloads each article's images as it is accepted
+        profile_stages=args.profile,
+    )
+    prepare(crawler, server, args)
+    crawler.http.get = timer.wrap(lambda url, *a, **kw: f"request:{request_kind(url)}", crawler.http.get)
+    crawler.fetch_news_item = timer.wrap("article", crawler.fetch_news_item)  # Used by both fetch modes
+    crawler.download_images = timer.wrap("images", crawler.download_images)
+    crawler.crawl_search_results = timer.wrap("search_keyword", crawler.crawl_search_results)
+    search_news = min(args.search_news, args.articles)
+    try:
+        result = crawler.crawl(
+            "https://www.asahi.com/",
+            max_news_count=args.articles,
+            max_nav_news=args.articles - search_news,
+            max_search_news=search_news,
+            search_keyword=["東京", "経済"] if search_news else None,
+            request_delay=1 / args.rate,
+        )
+        if args.profile:
+            crawler.metrics.profiler.write("./logs")
+        return len(result["news"]), crawler.http.get_stats(), crawler.image_downloader.get_stats()
+    finally:
+        crawler.image_downloader.close()
+        for image_store in crawler.image_stores.values():
+            image_store.close()
+        crawler.http.close()
+
+
+def run_yahoo(server, args, timer):
+    from yahoo_news_scraper import YahooJapanNewsScraper
+
+    crawler = YahooJapanNewsScraper(download_images=True, stream_formats=["jsonl"], image_workers=args.image_workers,
+                                    profile_stages=args.profile)
+    # Category and keyword pages are rendered with Selenium, which cannot be routed to the stand-in
+    crawler.categories = {}
+    crawler.keywords = []
+    crawler.topics = {topic: topic for topic in YAHOO_TOPICS[:args.topics]}
+    prepare(crawler, server, args)
+    crawler.http.get = timer.wrap(lambda url, *a, **kw: f"request:{request_kind(url)}", crawler.http.get)
+    crawler.get_links_from_topics = timer.wrap("discover_topics", crawler.get_links_from_topics)
+    crawler.extract_articles_from_pickup = timer.wrap("pickup", crawler.extract_articles_from_pickup)
+    crawler.scrape_article = timer.wrap("article", crawler.scrape_article)
+    crawler._fetch_article_page = timer.wrap("article_page", crawler._fetch_article_page)
+    crawler.image_downloader.download_many = timer.wrap("images", crawler.image_downloader.download_many)
+    try:
+        articles = crawler.scrape_news(
+            max_articles=args.articles,
+            fetch_mode=args.fetch_mode,
+            per_host_concurrency=args.concurrency,
+        )
+        if args.profile:
+            crawler.metrics.profiler.write("./logs")
+        return len(articles), crawler.http.get_stats(), crawler.image_downloader.get_stats()
+    finally:
+        crawler.image_downloader.close()
+        if crawler.image_store is not None:
+            crawler.image_store.close()
+        crawler.http.close()
+
+
+def run_site(site, server, args):
+    server.reset_stats()
+    timer = StageTimer()
+    start = time.perf_counter()
+    articles, http_stats, image_stats = (run_asahi if site == "asahi" else run_yahoo)(server, args, timer)
+    seconds = time.perf_counter() - start
+    served = server.get_stats().get(site, {})
+    requests_served = sum(sum(statuses.values()) for statuses in served.values())
+    statuses = {}
+    for kind_statuses in served.values():
+        for status, count in kind_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        "site": site,
+        "articles": articles,
+        "seconds": round(seconds, 2),
+        "articles_per_sec": round(articles / seconds, 2) if seconds else 0.0,
+        "requests": requests_served,
+        "requests_per_article": round(requests_served / articles, 2) if articles else None,
+        "statuses": statuses,
+        "served": served,
+        "client": {key: http_stats[key] for key in ("requests", "errors", "bytes", "new_connections", "reuse_ratio")},
+        "images": image_stats,
+        "stages": timer.summary(),
+    }
+
+
+def print_result(r):
+    print(f"\n[{r['site']}] {r['articles']} articles in {r['seconds']}s = {r['articles_per_sec']} articles/s, "
+          f"{r['requests']} requests ({r['requests_per_article']} per article), statuses {r['statuses']}, "
+          f"connection reuse {r['client']['reuse_ratio']:.0%}")
+    header = f"{'stage':<20} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'total s':>9}"
+    print(header)
+    print("-" * len(header))
+    for stage, s in r["stages"].items():
+        print(f"{stage:<20} {s['count']:>7} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['total_s']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--site", choices=["asahi", "yahoo", "both"], default="both")
+    parser.add_argument("--articles", type=int, default=40, help="articles each crawler should collect")
+    parser.add_argument("--search-news", type=int, default=10, help="of those, Asahi articles taken from keyword search")
+    parser.add_argument("--topics", type=int, default=3, help="Yahoo topic pages to discover links from")
+    parser.add_argument("--fetch-mode", choices=["sequential", "async"], default="sequential")
+    parser.add_argument("--concurrency", type=int, default=4, help="per-host concurrency in async mode")
+    parser.add_argument("--image-workers", type=int, default=4, help="concurrent image downloads")
+    parser.add_argument("--rate", type=float, default=50.0, help="requests/sec per host the rate limiter starts at and may reach")
+    parser.add_argument("--latency", type=float, default=0.02, help="server response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency varies by +/- this fraction")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of 429 responses (Retry-After: 1)")
+    parser.add_argument("--paid-rate", type=float, default=0.1, help="share of Asahi articles marked as paid")
+    parser.add_argument("--redirect-rate", type=float, default=0.2, help="share of Yahoo pickups redirecting to an expert article")
+    parser.add_argument("--workdir", help="working directory for logs/saves (default: a new temp directory)")
+    parser.add_argument("--profile", nargs="+", metavar="STAGE", help="profile these crawler stages (e.g. parse extract, or all)")
+    parser.add_argument("--verbose", action="store_true", help="keep the crawlers' INFO logging on the console")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_crawl_")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)  # The crawlers write logs/, saves/ and caches relative to the working directory
+
+    server = StandinNewsServer(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        paid_rate=args.paid_rate, redirect_rate=args.redirect_rate,
+        search_results=max(60, 2 * args.search_news),
+    ).start()
+    print(f"stand-in server at {server.origin}, working directory {workdir}")
+    results = []
+    try:
+        for site in (["asahi", "yahoo"] if args.site == "both" else [args.site]):
+            results.append(run_site(site, server, args))
+            print_result(results[-1])
+    finally:
+        server.stop()
+
+    if json_path:
+        settings = {key: value for key, value in vars(args).items() if key not in ("json", "verbose")}
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "results": results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
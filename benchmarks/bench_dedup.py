@@ -0,0 +1,90 @@
+"""Memory and lookup cost of the URL dedup filters at large URL counts.
+
+Usage:
+    python benchmarks/bench_dedup.py --sizes 1000000 10000000 --error-rate 0.001
+
+For each size, both filters are filled with synthetic article URLs. The
+report shows the memory each filter retains (URL strings included for the
+exact set), the build time, the per-lookup cost for URLs that were added and
+for URLs that were not, and the measured false-positive rate.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.dedup import ExactUrlSet, BloomUrlFilter
+
+
+def article_url(i):
+    return f"https://www.asahi.com/articles/AST{i:010d}.html"
+
+
+def exact_set_bytes(url_set):
+    return sys.getsizeof(url_set) + sum(sys.getsizeof(url) for url in url_set)
+
+
+def bench(kind, size, error_rate, probes):
+    start = time.perf_counter()
+    if kind == "exact":
+        url_filter = ExactUrlSet(article_url(i) for i in range(size))
+    else:
+        url_filter = BloomUrlFilter(capacity=size, error_rate=error_rate)
+        for i in range(size):
+            url_filter.add(article_url(i))
+    build_seconds = time.perf_counter() - start
+    memory = exact_set_bytes(url_filter) if kind == "exact" else sys.getsizeof(url_filter._bits)
+
+    step = max(1, size // probes)
+    present = [article_url(i) for i in range(0, size, step)][:probes]
+    absent = [article_url(size + i) for i in range(probes)]
+
+    start = time.perf_counter()
+    hits = sum(1 for url in present if url in url_filter)
+    hit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    false_positives = sum(1 for url in absent if url in url_filter)
+    miss_seconds = time.perf_counter() - start
+    assert hits == len(present), "filter lost an added URL"
+
+    return {
+        "filter": kind,
+        "urls": size,
+        "memory_mb": round(memory / 1024 / 1024, 2),
+        "bytes_per_url": round(memory / size, 2),
+        "build_seconds": round(build_seconds, 2),
+        "lookup_hit_us": round(hit_seconds / len(present) * 1e6, 3),
+        "lookup_miss_us": round(miss_seconds / len(absent) * 1e6, 3),
+        "false_positive_rate": round(false_positives / len(absent), 6),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--error-rate", type=float, default=0.001)
+    parser.add_argument("--probes", type=int, default=200_000, help="lookups per hit/miss measurement")
+    parser.add_argument("--filters", nargs="+", default=["exact", "bloom"], choices=["exact", "bloom"])
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    header = f"{'filter':<6} {'urls':>10} {'MB':>9} {'B/url':>7} {'build s':>8} {'hit us':>7} {'miss us':>8} {'FP rate':>9}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        for kind in args.filters:
+            r = bench(kind, size, args.error_rate, args.probes)
+            results.append(r)
+            print(f"{r['filter']:<6} {r['urls']:>10} {r['memory_mb']:>9} {r['bytes_per_url']:>7} {r['build_seconds']:>8} "
+                  f"{r['lookup_hit_us']:>7} {r['lookup_miss_us']:>8} {r['false_positive_rate']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"error_rate": args.error_rate, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Per-function extraction timings over a recorded corpus of Asahi/Yahoo pages.
+
+Usage:
+    python benchmarks/bench_extraction.py --json results/HEAD.json
+    python benchmarks/bench_extraction.py --corpus ./corpus --site yahoo --repeat 10
+    python benchmarks/bench_extraction.py --json results/new.json --compare results/base.json --threshold 0.15
+
+Pages come from a corpus recorded with ``benchmarks/corpus.py``. Each page
+is parsed the way the crawler parses that kind of page (full parse for
+articles, strained ``make_link_soup`` for listings), and every extraction
+function that runs on such a page is timed on its own against the same
+soup, ``--repeat`` times per page (the per-page figure is the median).
+Parsing is reported as its own ``parse`` row. Across pages the report gives
+mean, median and p95 per call in microseconds.
+
+``--json`` writes the results with the commit, Python/bs4/lxml versions and
+parser backend. ``--compare`` loads an earlier JSON file, prints the change
+of each function's median and exits with status 1 when any function got
+slower than ``--threshold`` (a fraction, default 0.10), so two commits can
+be compared on the same corpus by running the benchmark once on each.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "asahi"))
+sys.path.append(os.path.join(ROOT, "yahoo"))
+import bs4
+from common.html_parser import LXML_AVAILABLE, make_soup, make_link_soup, resolve_parser
+from corpus import DEFAULT_CORPUS, load_corpus
+
+
+def harvest_links(crawler, soup, base_url):
+    """Classify every anchor of a listing page, as the crawlers do for harvested links"""
+    return [crawler.url_classifier.classify(a["href"], base_url) for a in soup.find_all("a", href=True)]
+
+
+def pickup_article_url(yahoo, soup):
+    try:
+        return yahoo.extract_pickup_article_url(soup)
+    except ValueError:
+        return None
+
+
+def full_parse(crawler, html, parser):
+    return make_soup(html, parser)
+
+
+def link_parse(*containers):
+    return lambda crawler, html, parser: make_link_soup(html, parser, containers)
+
+
+# (site, kind) -> (parse(crawler, html, parser) as the crawler parses that page, [(function, call(crawler, page, soup))])
+CASES = {
+    ("asahi", "home"): (lambda c, html, parser: make_link_soup(html, parser, c.config["nav_selectors"]), [
+        ("extract_navigation", lambda c, page, soup: c.extract_navigation(soup, page["url"])),
+        ("harvest_links", lambda c, page, soup: harvest_links(c, soup, page["url"])),
+    ]),
+    ("asahi", "listing"): (link_parse(), [
+        ("harvest_links", lambda c, page, soup: harvest_links(c, soup, page["url"])),
+    ]),
+    ("asahi", "search"): (lambda c, html, parser: c.parse_search_page(html), [
+        ("select_search_results", lambda c, page, soup: c.select_search_results(soup)),
+    ]),
+    ("asahi", "article"): (full_parse, [
+        ("crawl_detail_page", lambda c, page, soup: c.crawl_detail_page(page["url"], page["html"], soup)),
+        ("extract_images", lambda c, page, soup: c.extract_images(page["url"], soup)),
+        ("is_paid_content", lambda c, page, soup: c.is_paid_content(page["url"], soup)),
+    ]),
+    ("yahoo", "topic"): (link_parse('div[class="newsFeed"]', 'a[data-ual-event-name="next_page"]'), [
+        ("extract_pickup_links", lambda c, page, soup: c.extract_pickup_links(soup, retries=1)),
+    ]),
+    ("yahoo", "pickup"): (link_parse('div[data-ual-view-type="digest"]'), [
+        ("extract_pickup_article_url", lambda c, page, soup: pickup_article_url(c, soup)),
+    ]),
+    ("yahoo", "article"): (full_parse, [
+        ("_extract_title", lambda c, page, soup: c._extract_title(soup)),
+        ("_extract_publish_time", lambda c, page, soup: c._extract_publish_time(soup)),
+        ("_extract_page_content", lambda c, page, soup: c._extract_page_content(soup)),
+        ("_extract_page_images", lambda c, page, soup: c._extract_page_images(soup)),
+        ("_extract_page_count", lambda c, page, soup: c._extract_page_count(soup, page["url"].split("?")[0])),
+    ]),
+    ("yahoo", "listing"): (link_parse(), [
+        ("harvest_links", lambda c, page, soup: harvest_links(c, soup, page["url"])),
+    ]),
+    ("yahoo", "search"): (link_parse(), [
+        ("harvest_links", lambda c, page, soup: harvest_links(c, soup, page["url"])),
+    ]),
+}
+
+
+def make_crawlers(parser):
+    from asahi import AsahiCrawler
+    from yahoo_news_scraper import YahooJapanNewsScraper
+
+    asahi = AsahiCrawler()
+    asahi.config["html_parser"] = parser
+    yahoo = YahooJapanNewsScraper(html_parser=parser)
+    for crawler in (asahi, yahoo):
+        crawler.logger.setLevel(logging.CRITICAL)
+    return {"asahi": asahi, "yahoo": yahoo}
+
+
+def time_call(func, repeat):
+    """Median wall time of ``repeat`` calls, in microseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def summarize(site, kind, function, samples):
+    ordered = sorted(samples)
+    return {
+        "site": site, "kind": kind, "function": function, "pages": len(ordered),
+        "mean_us": round(statistics.fmean(ordered), 1),
+        "median_us": round(statistics.median(ordered), 1),
+        "p95_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max_us": round(ordered[-1], 1),
+    }
+
+
+def run(pages, crawlers, parser, repeat):
+    samples = {}
+    for page in pages:
+        case = CASES.get((page["site"], page["kind"]))
+        if case is None:
+            continue
+        page_parser, functions = case
+        crawler = crawlers[page["site"]]
+        parse = lambda: page_parser(crawler, page["html"], parser)
+        samples.setdefault((page["site"], page["kind"], "parse"), []).append(time_call(parse, repeat))
+        soup = parse()
+        for name, call in functions:
+            samples.setdefault((page["site"], page["kind"], name), []).append(
+                time_call(lambda: call(crawler, page, soup), repeat)
+            )
+    return [summarize(site, kind, function, values) for (site, kind, function), values in samples.items()]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(parser, repeat, pages):
+    lxml_version = None
+    if LXML_AVAILABLE:
+        from lxml import etree
+        lxml_version = ".".join(map(str, etree.LXML_VERSION))
+    corpus = {}
+    for page in pages:
+        corpus[f"{page['site']}/{page['kind']}"] = corpus.get(f"{page['site']}/{page['kind']}", 0) + 1
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "bs4": bs4.__version__,
+        "lxml": lxml_version,
+        "parser": parser,
+        "repeat": repeat,
+        "corpus": corpus,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change of each function's median against a baseline; returns the regressed keys"""
+    base = {(r["site"], r["kind"], r["function"]): r for r in baseline["results"]}
+    regressions = []
+    header = f"{'function':<42} {'base us':>10} {'now us':>10} {'change':>8}"
+    print(f"\nagainst {baseline['meta'].get('commit') or 'baseline'} ({baseline['meta'].get('parser')})")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        key = (r["site"], r["kind"], r["function"])
+        if key not in base or not base[key]["median_us"]:
+            continue
+        change = r["median_us"] / base[key]["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{'/'.join(key):<42} {base[key]['median_us']:>10} {r['median_us']:>10} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="corpus directory recorded with corpus.py")
+    parser.add_argument("--site", choices=["asahi", "yahoo"], help="only benchmark pages of this site")
+    parser.add_argument("--parser", default="auto", help="parser backend: auto, lxml or html.parser")
+    parser.add_argument("--repeat", type=int, default=5, help="calls per function and page")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown (fraction of the median) reported as a regression")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, site=args.site)
+    if not pages:
+        raise SystemExit(f"empty corpus: {args.corpus} (record pages with benchmarks/corpus.py)")
+    backend = resolve_parser(args.parser)
+    crawlers = make_crawlers(backend)
+    # A topic page without pickup links makes extract_pickup_links back off; time the extraction, not the sleep
+    with mock.patch("time.sleep"):
+        results = run(pages, crawlers, backend, max(1, args.repeat))
+    results.sort(key=lambda r: (r["site"], r["kind"], r["function"] != "parse", r["function"]))
+
+    header = f"{'function':<42} {'pages':>6} {'mean us':>10} {'median us':>10} {'p95 us':>10}"
+    print(f"{len(pages)} pages, parser {backend}, repeat {args.repeat}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        name = f"{r['site']}/{r['kind']}/{r['function']}"
+        print(f"{name:<42} {r['pages']:>6} {r['mean_us']:>10} {r['median_us']:>10} {r['p95_us']:>10}")
+
+    output = {"meta": metadata(backend, args.repeat, pages), "results": results}
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Parse and extraction time of the HTML parser backends over saved pages.
+
+Usage:
+    python benchmarks/bench_parsers.py --pages ./saves/http_cache --repeat 3
+    python benchmarks/bench_parsers.py --pages ./pages --site yahoo --json parsers.json
+    python benchmarks/bench_parsers.py --pages ./saves/http_cache --listing
+
+The corpus is either an HTTP cache directory (``*.body`` files, whose site is
+taken from the URL stored next to them) or a directory of ``*.html`` files
+(the site is then given with ``--site``). Every page is parsed with each
+BeautifulSoup backend and run through the crawler's own detail-page
+extraction, so the timings match what a crawl spends per page. The extracted
+fields are compared with the html.parser output and pages that differ are
+listed. selectolax, when installed, is timed as a reference (parse plus
+collecting ``a[href]``); the crawlers do not use it because their extraction
+code is written against the BeautifulSoup API.
+
+With ``--listing`` the pages are treated as link listings instead: a full
+parse is compared with the strained parse the crawlers use for listing pages
+(``make_link_soup``), reporting parse time, peak traced memory and whether
+both return the same links.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "asahi"))
+sys.path.append(os.path.join(ROOT, "yahoo"))
+from common.html_parser import LXML_AVAILABLE, make_soup, make_link_soup
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+# Containers the crawlers keep when parsing listing pages
+LISTING_CONTAINERS = {
+    "asahi": ["div#GlobalNav", "ul.NavInner", "ul#SiteSearchResult"],
+    "yahoo": ['div[class="newsFeed"]', 'a[data-ual-event-name="next_page"]', 'div[data-ual-view-type="digest"]'],
+}
+
+
+def load_pages(pages_dir, site=None):
+    """[(site, url, html)] from an HTTP cache directory or a directory of .html files"""
+    pages = []
+    for body_path in sorted(glob.glob(os.path.join(pages_dir, "*.body"))):
+        try:
+            with open(body_path[:-len(".body")] + ".json", "r", encoding="utf-8") as f:
+                url = json.load(f).get("final_url") or ""
+        except (OSError, ValueError):
+            continue
+        page_site = "asahi" if "asahi.com" in url else "yahoo" if "yahoo.co.jp" in url else None
+        if page_site and (site is None or page_site == site):
+            with open(body_path, "rb") as f:
+                pages.append((page_site, url, f.read().decode("utf-8", errors="replace")))
+    for html_path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        if site is None:
+            raise SystemExit("--site is required for a directory of .html files")
+        with open(html_path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append((site, "file://" + os.path.abspath(html_path), f.read()))
+    return pages
+
+
+def make_extractors():
+    """Detail-page extraction of both crawlers, taking (url, html, soup)"""
+    from asahi import AsahiCrawler
+    from yahoo_news_scraper import YahooJapanNewsScraper
+
+    asahi = AsahiCrawler()
+    yahoo = YahooJapanNewsScraper()
+    for crawler in (asahi, yahoo):
+        crawler.logger.setLevel(logging.CRITICAL)
+
+    def extract_asahi(url, html, soup):
+        detail = asahi.crawl_detail_page(url, response_text=html, soup=soup)
+        return {
+            "paid": asahi.is_paid_content(url, soup=soup),
+            "title": detail["title"],
+            "publish_time": detail["publish_time"],
+            "topic": detail["topic"],
+            "content": detail["content"],
+            "images": sorted(asahi.extract_images(url, soup=soup)),
+        }
+
+    def extract_yahoo(url, html, soup):
+        return {
+            "title": yahoo._extract_title(soup),
+            "publish_time": yahoo._extract_publish_time(soup),
+            "content": yahoo._extract_page_content(soup),
+            "images": yahoo._extract_page_images(soup),
+        }
+
+    return {"asahi": extract_asahi, "yahoo": extract_yahoo}
+
+
+def bench_backend(backend, pages, extractors, repeat):
+    parse_seconds = extract_seconds = 0.0
+    outputs = []
+    for _ in range(repeat):
+        outputs = []
+        for site, url, html in pages:
+            start = time.perf_counter()
+            soup = make_soup(html, backend)
+            parsed = time.perf_counter()
+            outputs.append(extractors[site](url, html, soup))
+            parse_seconds += parsed - start
+            extract_seconds += time.perf_counter() - parsed
+    runs = len(pages) * repeat
+    return {
+        "backend": backend,
+        "pages": len(pages),
+        "parse_ms": round(parse_seconds / runs * 1000, 3),
+        "extract_ms": round(extract_seconds / runs * 1000, 3),
+        "total_ms": round((parse_seconds + extract_seconds) / runs * 1000, 3),
+    }, outputs
+
+
+def bench_selectolax(pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, _, html in pages:
+            tree = SelectolaxParser(html)
+            [node.attributes.get("href") for node in tree.css("a[href]")]
+    per_page = (time.perf_counter() - start) / (len(pages) * repeat) * 1000
+    return {"backend": "selectolax (reference)", "pages": len(pages), "parse_ms": round(per_page, 3),
+            "extract_ms": None, "total_ms": round(per_page, 3)}
+
+
+def bench_listing(backend, pages, repeat):
+    """Full vs strained parse of listing pages: time, peak traced memory and link equality"""
+    result = {"backend": backend, "pages": len(pages), "mismatches": []}
+    for mode in ("full", "strained"):
+        seconds, peak = 0.0, 0
+        for _ in range(repeat):
+            for site, url, html in pages:
+                start = time.perf_counter()
+                soup = make_soup(html, backend) if mode == "full" else make_link_soup(html, backend, LISTING_CONTAINERS[site])
+                soup.find_all("a", href=True)
+                seconds += time.perf_counter() - start
+        for site, url, html in pages:
+            tracemalloc.start()
+            soup = make_soup(html, backend) if mode == "full" else make_link_soup(html, backend, LISTING_CONTAINERS[site])
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            del soup
+        result[f"{mode}_ms"] = round(seconds / (len(pages) * repeat) * 1000, 3)
+        result[f"{mode}_peak_kb"] = round(peak / 1024, 1)
+    for site, url, html in pages:
+        full = [a["href"] for a in make_soup(html, backend).find_all("a", href=True)]
+        strained = [a["href"] for a in make_link_soup(html, backend, LISTING_CONTAINERS[site]).find_all("a", href=True)]
+        if full != strained:
+            result["mismatches"].append(url)
+    return result
+
+
+def listing_main(args, pages, backends):
+    results = [bench_listing(backend, pages, args.repeat) for backend in backends]
+    header = f"{'backend':<12} {'pages':>6} {'full ms':>8} {'strained ms':>12} {'full peak KB':>13} {'strained peak KB':>17} {'links':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['backend']:<12} {r['pages']:>6} {r['full_ms']:>8} {r['strained_ms']:>12} {r['full_peak_kb']:>13} "
+              f"{r['strained_peak_kb']:>17} {'same' if not r['mismatches'] else len(r['mismatches']):>6}")
+    for r in results:
+        for url in r["mismatches"]:
+            print(f"  [{r['backend']}] links differ from a full parse: {url}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "listing": results}, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", default="./saves/http_cache", help="HTTP cache directory or directory of .html files")
+    parser.add_argument("--site", choices=["asahi", "yahoo"], help="only use pages of this site (required for .html files)")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus per backend")
+    parser.add_argument("--listing", action="store_true", help="compare full and strained parses of listing pages")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.site)
+    if not pages:
+        raise SystemExit(f"no pages found in {args.pages}")
+    backends = ["html.parser"] + (["lxml"] if LXML_AVAILABLE else [])
+    if args.listing:
+        listing_main(args, pages, backends)
+        return
+    extractors = make_extractors()
+
+    results, outputs = [], {}
+    for backend in backends:
+        result, outputs[backend] = bench_backend(backend, pages, extractors, args.repeat)
+        results.append(result)
+    if SelectolaxParser is not None:
+        results.append(bench_selectolax(pages, args.repeat))
+
+    baseline = results[0]["total_ms"]
+    header = f"{'backend':<24} {'pages':>6} {'parse ms':>9} {'extract ms':>11} {'total ms':>9} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        extract_ms = "-" if r["extract_ms"] is None else r["extract_ms"]
+        r["speedup"] = round(baseline / r["total_ms"], 2) if r["total_ms"] else None
+        print(f"{r['backend']:<24} {r['pages']:>6} {r['parse_ms']:>9} {extract_ms:>11} {r['total_ms']:>9} {r['speedup']:>8}")
+
+    # Extraction must not depend on the backend: list pages whose fields differ from html.parser
+    mismatches = []
+    for backend in backends[1:]:
+        for (site, url, _), expected, actual in zip(pages, outputs["html.parser"], outputs[backend]):
+            fields = sorted(key for key in expected if expected[key] != actual.get(key))
+            if fields:
+                mismatches.append({"backend": backend, "site": site, "url": url, "fields": fields})
+    if mismatches:
+        print(f"\n{len(mismatches)} page(s) extract differently from html.parser:")
+        for m in mismatches:
+            print(f"  [{m['backend']}] {m['url']}: {', '.join(m['fields'])}")
+    else:
+        print("\nall backends extracted identical fields")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "results": results, "mismatches": mismatches}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Per-link cost of URL canonicalization/classification and the ad keyword check.
+
+Usage:
+    python benchmarks/bench_url_classifier.py --pages ./saves/http_cache
+    python benchmarks/bench_url_classifier.py --synthetic 200000 --json urls.json
+
+The corpus is every href found in saved pages (HTTP cache ``*.body`` files
+or ``*.html`` files), optionally topped up with synthetic Asahi/Yahoo
+hrefs. Each link goes through the crawlers' classifier and through the
+per-call implementation it replaced (kept below as the reference); the
+report shows the cost per link and checks that both give the same answer.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.url_classifier import UrlClassifier, KeywordMatcher, any_of
+
+ASAHI_BASE = "https://www.asahi.com/"
+ASAHI_EXCLUDE = ["/profile/", "/about/", "/contact/", "/privacy/", "/terms/", "/sitemap/",
+                 "/faq/", "/search/", "/subscribe/", "/login/", "/register/", "/logout/"]
+YAHOO_ARTICLE = re.compile(r'^https?://news\.yahoo\.co\.jp/articles/[a-z0-9]+$', re.IGNORECASE)
+YAHOO_RESOURCE = re.compile(r'/images/|/videos/|/photos/|/photo/|/gallery/|/pickup/', re.IGNORECASE)
+AD_KEYWORDS = ['advertisement', 'ad', 'promotion', 'sponsored', '広告', 'PR', 'スポンサー', 'プロモーション',
+               'adserver', 'doubleclick', 'amazon-adsystem']
+HREF = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+
+
+# Reference: the per-call implementations the classifier replaced
+def legacy_asahi(href):
+    url = href if href.startswith("http") else urljoin(ASAHI_BASE, href)
+    url = url.split('?')[0] if '?' in url else url
+    if not url or url.startswith(("#", "javascript:")) or "/video/" in url.lower():
+        return None, False
+    for pattern in [r"/profile/", r"/about/", r"/contact/", r"/privacy/", r"/terms/", r"/sitemap/",
+                    r"/faq/", r"/search/", r"/subscribe/", r"/login/", r"/register/", r"/logout/"]:
+        if re.search(pattern, url, re.IGNORECASE):
+            return url, False
+    return url, any(pattern in url.lower() for pattern in [r"https://www.asahi.com/articles/"])
+
+
+def legacy_yahoo_clean(url):
+    match = re.match(r'^(https://news\.yahoo\.co\.jp/(?:articles|expert/articles)/[^/?#]+)', url)
+    return match.group(1) if match else None
+
+
+def legacy_yahoo(href):
+    cleaned = legacy_yahoo_clean(href)
+    if not cleaned:
+        return None, False
+    # Callers cleaned first, then is_valid_news_url cleaned again
+    recleaned = legacy_yahoo_clean(cleaned)
+    valid = bool(recleaned) and bool(YAHOO_ARTICLE.match(recleaned)) and not YAHOO_RESOURCE.search(recleaned)
+    return cleaned, valid
+
+
+def legacy_is_ad(text):
+    lower_text = text.lower()
+    return any(keyword in lower_text for keyword in AD_KEYWORDS)
+
+
+def synthetic_hrefs(count, seed=0):
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"https://www.asahi.com/articles/AST{rng.randrange(10**9):09d}.html?iref=com_top_{rng.randrange(20)}",
+        lambda: f"/articles/ASR{rng.randrange(10**9):09d}.html",
+        lambda: f"https://www.asahi.com/{rng.choice(['national', 'politics', 'business', 'sports', 'video'])}/list/",
+        lambda: f"https://www.asahi.com/{rng.choice(ASAHI_EXCLUDE).strip('/')}/?ref=nav",
+        lambda: f"https://news.yahoo.co.jp/articles/{rng.getrandbits(160):040x}",
+        lambda: f"https://news.yahoo.co.jp/articles/{rng.getrandbits(160):040x}/images/{rng.randrange(9)}",
+        lambda: f"https://news.yahoo.co.jp/expert/articles/{rng.getrandbits(160):040x}?source=rss",
+        lambda: f"https://news.yahoo.co.jp/pickup/{rng.randrange(10**7)}",
+        lambda: rng.choice(["#top", "javascript:void(0)", "https://www.yahoo.co.jp/", "/topics/domestic"]),
+    ]
+    return [rng.choice(templates)() for _ in range(count)]
+
+
+def load_hrefs(pages_dir):
+    hrefs = []
+    for path in glob.glob(os.path.join(pages_dir, "*.body")) + glob.glob(os.path.join(pages_dir, "*.html")):
+        with open(path, "rb") as f:
+            hrefs.extend(HREF.findall(f.read().decode("utf-8", errors="replace")))
+    return hrefs
+
+
+def timed(func, items):
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    return results, (time.perf_counter() - start) / max(len(items), 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", help="HTTP cache directory or directory of .html files to harvest hrefs from")
+    parser.add_argument("--synthetic", type=int, default=100_000, help="synthetic hrefs added to the corpus")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    hrefs = (load_hrefs(args.pages) if args.pages else []) + synthetic_hrefs(args.synthetic)
+    if not hrefs:
+        raise SystemExit("empty corpus")
+
+    asahi = UrlClassifier(canonical=r"[^?]*", accept=any_of(["https://www.asahi.com/articles/"]),
+                          exclude=any_of(ASAHI_EXCLUDE), skip=r"^(?:#|javascript:)|(?i:/video/)")
+    yahoo = UrlClassifier(canonical=r'^https://news\.yahoo\.co\.jp/(?:articles|expert/articles)/[^/?#]+',
+                          accept=YAHOO_ARTICLE, exclude=YAHOO_RESOURCE)
+    ads = KeywordMatcher(AD_KEYWORDS)
+
+    cases = [
+        ("asahi links", legacy_asahi, lambda href: asahi.classify(href, ASAHI_BASE)),
+        ("yahoo links", legacy_yahoo, yahoo.classify),
+        ("ad keywords", legacy_is_ad, ads.matches),
+    ]
+    results = []
+    header = f"{'case':<12} {'items':>8} {'before us':>10} {'after us':>9} {'speedup':>8} {'diffs':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, before, after in cases:
+        expected, before_us = timed(before, hrefs)
+        actual, after_us = timed(after, hrefs)
+        diffs = [href for href, e, a in zip(hrefs, expected, actual) if e != a]
+        r = {"case": name, "items": len(hrefs), "before_us": round(before_us, 3), "after_us": round(after_us, 3),
+             "speedup": round(before_us / after_us, 2) if after_us else None, "diffs": len(diffs), "diff_samples": diffs[:5]}
+        results.append(r)
+        print(f"{name:<12} {r['items']:>8} {r['before_us']:>10} {r['after_us']:>9} {r['speedup']:>8} {r['diffs']:>6}")
+    for r in results:
+        for href in r["diff_samples"]:
+            print(f"  [{r['case']}] differs: {href}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"corpus": len(hrefs), "results": results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Recorded Asahi/Yahoo pages for the offline benchmarks.
+
+Usage:
+    python benchmarks/corpus.py --from-cache ./saves/http_cache
+    python benchmarks/corpus.py --urls https://www.asahi.com/ https://news.yahoo.co.jp/topics/domestic
+
+A corpus directory holds one HTML file per page under ``<site>/<kind>/`` and
+a ``manifest.json`` listing each page's site, kind, URL and file. Kinds are
+derived from the URL: ``home``, ``listing``, ``search`` and ``article`` on
+Asahi; ``listing``, ``topic``, ``pickup``, ``search`` and ``article`` on
+Yahoo. Pages come from the crawlers' HTTP cache (everything a crawl run with
+``http_cache_dir`` set has fetched) or are fetched directly. Recorded pages stay local (the default
+directory is git-ignored); record once and keep the corpus fixed while
+comparing commits.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+
+def page_kind(url):
+    """(site, kind) of a page URL, or (None, None) for pages the benchmarks do not use"""
+    parsed = urlparse(url)
+    host, path = parsed.netloc.lower(), parsed.path or "/"
+    if host == "sitesearch.asahi.com":
+        return "asahi", "search"
+    if host == "www.asahi.com":
+        if path == "/":
+            return "asahi", "home"
+        if path.startswith("/articles/"):
+            return "asahi", "article"
+        if path.endswith((".jpg", ".jpeg", ".png", ".webp", ".gif")):
+            return None, None
+        return "asahi", "listing"
+    if host == "news.yahoo.co.jp":
+        if path.startswith(("/articles/", "/expert/articles/")):
+            return "yahoo", "article"
+        if path.startswith("/topics/"):
+            return "yahoo", "topic"
+        if path.startswith("/pickup/"):
+            return "yahoo", "pickup"
+        if path.startswith("/search"):
+            return "yahoo", "search"
+        return "yahoo", "listing"
+    return None, None
+
+
+def load_manifest(corpus_dir):
+    try:
+        with open(os.path.join(corpus_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"pages": []}
+
+
+def load_corpus(corpus_dir=DEFAULT_CORPUS, site=None, kinds=None):
+    """Pages of a corpus as dicts with site, kind, url and html"""
+    pages = []
+    for entry in load_manifest(corpus_dir)["pages"]:
+        if (site and entry["site"] != site) or (kinds and entry["kind"] not in kinds):
+            continue
+        with open(os.path.join(corpus_dir, entry["file"]), "r", encoding="utf-8") as f:
+            pages.append(dict(entry, html=f.read()))
+    return pages
+
+
+def record(corpus_dir, pages, max_per_kind=None):
+    """Add (url, html) pages to a corpus; returns the number of new pages"""
+    manifest = load_manifest(corpus_dir)
+    known = {entry["url"] for entry in manifest["pages"]}
+    per_kind = {}
+    for entry in manifest["pages"]:
+        per_kind[(entry["site"], entry["kind"])] = per_kind.get((entry["site"], entry["kind"]), 0) + 1
+    added = 0
+    for url, html in pages:
+        site, kind = page_kind(url)
+        if site is None or url in known:
+            continue
+        if max_per_kind and per_kind.get((site, kind), 0) >= max_per_kind:
+            continue
+        file_name = os.path.join(site, kind, hashlib.sha1(url.encode("utf-8")).hexdigest()[:12] + ".html")
+        os.makedirs(os.path.join(corpus_dir, site, kind), exist_ok=True)
+        with open(os.path.join(corpus_dir, file_name), "w", encoding="utf-8") as f:
+            f.write(html)
+        manifest["pages"].append({"site": site, "kind": kind, "url": url, "file": file_name.replace(os.sep, "/")})
+        known.add(url)
+        per_kind[(site, kind)] = per_kind.get((site, kind), 0) + 1
+        added += 1
+    manifest["pages"].sort(key=lambda entry: (entry["site"], entry["kind"], entry["url"]))
+    with open(os.path.join(corpus_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return added
+
+
+def cached_pages(cache_dir):
+    """(url, html) of every entry in an HttpCache directory"""
+    for body_path in sorted(glob.glob(os.path.join(cache_dir, "*.body"))):
+        try:
+            with open(body_path[:-len(".body")] + ".json", "r", encoding="utf-8") as f:
+                url = json.load(f).get("final_url")
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            continue
+        if url:
+            yield url, body.decode("utf-8", errors="replace")
+
+
+def fetched_pages(urls):
+    from common.http_client import HttpClient
+    http = HttpClient()
+    try:
+        for url in urls:
+            response = http.get(url)
+            if response.status_code == 200:
+                yield response.url, response.text
+            else:
+                print(f"skipped {url}: HTTP {response.status_code}")
+    finally:
+        http.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="corpus directory")
+    parser.add_argument("--from-cache", help="record every page of this HTTP cache directory")
+    parser.add_argument("--urls", nargs="+", default=[], help="fetch and record these pages")
+    parser.add_argument("--max-per-kind", type=int, default=50, help="stop adding pages of a site/kind after this many")
+    args = parser.parse_args()
+
+    added = 0
+    if args.from_cache:
+        added += record(args.corpus, cached_pages(args.from_cache), args.max_per_kind)
+    if args.urls:
+        added += record(args.corpus, fetched_pages(args.urls), args.max_per_kind)
+    counts = {}
+    for entry in load_manifest(args.corpus)["pages"]:
+        counts[f"{entry['site']}/{entry['kind']}"] = counts.get(f"{entry['site']}/{entry['kind']}", 0) + 1
+    print(f"added {added} page(s); corpus: " + (", ".join(f"{key} {n}" for key, n in sorted(counts.items())) or "empty"))
+
+
+if __name__ == "__main__":
+    main()
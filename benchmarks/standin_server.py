@@ -0,0 +1,313 @@
+"""Local stand-in for the Asahi and Yahoo news sites, for load tests of the crawlers.
+
+Usage:
+    python benchmarks/standin_server.py --port 8765 --latency 0.05 --error-rate 0.02 --throttle-rate 0.01
+
+One HTTP server answers for every host the crawlers contact (the site is
+picked from the ``Host`` header, see ``HttpClient(routes=...)``) with
+synthetic pages that have the structure the crawlers' selectors expect:
+
+- www.asahi.com: home page with the global navigation, category listings,
+  articles (a share marked as paid) with images, ``/imgopt/`` image files
+- sitesearch.asahi.com: paginated search results
+- news.yahoo.co.jp: paginated topic pages of pickup links, pickup pages
+  (a share redirecting to ``/expert/articles/``), articles split over
+  several ``?page=N`` pages with images
+- news-pctr.c.yimg.jp: Yahoo image files
+
+Content is derived from the URL, so every run sees the same site. Each
+response is delayed by ``latency`` seconds (+/- ``jitter`` as a fraction)
+and fails with a 500 or a 429 (``Retry-After: 1``) at the configured rates.
+Requests are counted per site, page kind and status, see ``get_stats``.
+"""
+import argparse
+import hashlib
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+ASAHI_HOSTS = ("www.asahi.com", "sitesearch.asahi.com")
+YAHOO_HOSTS = ("news.yahoo.co.jp", "news-pctr.c.yimg.jp")
+ASAHI_CATEGORIES = ["national", "politics", "business", "international", "sports", "culture", "tech_science", "life"]
+YAHOO_TOPICS = ["domestic", "world", "business", "entertainment", "sports", "it", "science", "local"]
+WORDS = ["政府", "経済", "会見", "発表", "調査", "地域", "住民", "専門家", "影響", "対策", "今後", "方針",
+         "記者", "東京", "大阪", "市場", "企業", "選手", "試合", "研究"]
+
+
+def _seed(*parts):
+    return int(hashlib.sha1("/".join(map(str, parts)).encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _sentence(rng, words=12):
+    return "、".join("".join(rng.choice(WORDS) for _ in range(2)) for _ in range(words // 2)) + "。"
+
+
+def _page(title, body):
+    return f"<!DOCTYPE html><html lang=\"ja\"><head><meta charset=\"utf-8\"><title>{title}</title></head><body>{body}</body></html>"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Crawlers drop keep-alive connections when they finish or time out
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class StandinNewsServer:
+    """Threaded HTTP server producing synthetic Asahi/Yahoo pages with injected latency and failures"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.02, jitter=0.5, error_rate=0.0, throttle_rate=0.0,
+                 paid_rate=0.1, redirect_rate=0.2, categories=6, articles_per_listing=30, search_results=60,
+                 topic_pages=3, pickups_per_page=10, article_pages=3, images_per_article=2, image_size=30 * 1024,
+                 seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.paid_rate = paid_rate
+        self.redirect_rate = redirect_rate
+        self.categories = ASAHI_CATEGORIES[:categories]
+        self.articles_per_listing = articles_per_listing
+        self.search_results = search_results
+        self.topic_pages = topic_pages
+        self.pickups_per_page = pickups_per_page
+        self.article_pages = max(1, article_pages)
+        self.images_per_article = images_per_article
+        self.image_size = image_size
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._server = _Server((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def origin(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def routes(self):
+        """``HttpClient.routes`` entries sending every stand-in host to this server"""
+        return {host: self.origin for host in ASAHI_HOSTS + YAHOO_HOSTS}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get_stats(self):
+        """Request counts as {site: {kind: {status: count}}}"""
+        with self._lock:
+            stats = {}
+            for (site, kind, status), count in self._stats.items():
+                stats.setdefault(site, {}).setdefault(kind, {})[str(status)] = count
+            return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def _record(self, site, kind, status):
+        with self._lock:
+            self._stats[(site, kind, status)] = self._stats.get((site, kind, status), 0) + 1
+
+    def _draw(self):
+        with self._lock:
+            return self._rng.random(), self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, as the real sites
+
+            def do_GET(self):
+                host = (self.headers.get("Host") or "").split(":")[0]
+                site, kind, status, headers, body = server.respond(host, self.path)
+                failure, factor = server._draw()
+                time.sleep(server.latency * factor)
+                if failure < server.throttle_rate:
+                    status, headers, body = 429, {"Retry-After": "1"}, b"Too Many Requests"
+                elif failure < server.throttle_rate + server.error_rate:
+                    status, headers, body = 500, {}, b"Internal Server Error"
+                server._record(site, kind, status)
+                self.send_response(status)
+                headers.setdefault("Content-Type", "text/html; charset=utf-8")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, host, path):
+        """(site, kind, status, headers, body) for a request"""
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        if host in ASAHI_HOSTS:
+            site, kind, result = "asahi", *self._asahi(host, parts.path, query)
+        elif host in YAHOO_HOSTS:
+            site, kind, result = "yahoo", *self._yahoo(host, parts.path, query)
+        else:
+            site, kind, result = "unknown", "other", None
+        if result is None:
+            return site, kind, 404, {}, b"Not Found"
+        if isinstance(result, tuple):  # Redirect
+            return site, kind, 302, {"Location": result[0]}, b""
+        if isinstance(result, bytes):
+            return site, kind, 200, {"Content-Type": "image/jpeg"}, result
+        return site, kind, 200, {}, result.encode("utf-8")
+
+    def _image(self, path):
+        rng = random.Random(_seed(self.seed, path))
+        size = max(self.image_size - 4, 1)
+        return b"\xff\xd8\xff\xe0" + rng.getrandbits(8 * size).to_bytes(size, "little")
+
+    # ---- Asahi ----
+
+    def _asahi_article_id(self, category, index):
+        return f"AST{self.categories.index(category) if category in self.categories else 9}{index:08d}"
+
+    def _asahi(self, host, path, query):
+        if host == "sitesearch.asahi.com":
+            return "search", self._asahi_search(query)
+        if path == "/":
+            return "home", self._asahi_home()
+        if path.startswith("/imgopt/"):
+            return "image", self._image(path)
+        if path.startswith("/articles/"):
+            return "article", self._asahi_article(path.rsplit("/", 1)[-1].split(".")[0])
+        category = path.strip("/")
+        if category in self.categories:
+            return "listing", self._asahi_listing(category)
+        return "other", None
+
+    def _asahi_links(self, ids, iref):
+        return "".join(f'<li><a href="/articles/{article_id}.html?iref={iref}">{article_id} の記事</a></li>' for article_id in ids)
+
+    def _asahi_nav(self):
+        items = "".join(
+            f'<li class="NavItem"><a href="https://www.asahi.com/{category}/">{category}</a>'
+            f'<ul class="SubNav"><li class="NavItem"><a href="/{category}/list/">一覧</a></li></ul></li>'
+            for category in self.categories
+        )
+        return f'<div id="GlobalNav"><ul class="NavInner">{items}<li class="NavItem Line"></li></ul></div>'
+
+    def _asahi_home(self):
+        top = [self._asahi_article_id(category, index) for category in self.categories for index in range(3)]
+        body = (self._asahi_nav() + f'<main><ul class="TopNews">{self._asahi_links(top, "com_top")}</ul>'
+                '<a href="/about/">朝日新聞社について</a><a href="/video/">動画</a><a href="#top">top</a></main>')
+        return _page("朝日新聞デジタル", body)
+
+    def _asahi_listing(self, category):
+        ids = [self._asahi_article_id(category, index) for index in range(self.articles_per_listing)]
+        return _page(f"{category} - 朝日新聞", self._asahi_nav() + f'<main><ul class="List">{self._asahi_links(ids, "com_list")}</ul></main>')
+
+    def _asahi_search(self, query):
+        keyword = query.get("Keywords", [""])[0]
+        start = int(query.get("start", ["0"])[0] or 0)
+        ids = [f"ASR{_seed(keyword) % 1000:03d}{index:06d}" for index in range(start, min(start + 20, self.search_results))]
+        results = "".join(f'<li><a href="https://www.asahi.com/articles/{article_id}.html">{keyword} {article_id}</a></li>' for article_id in ids)
+        return _page("検索結果", f'<div id="Contents"><ul class="ListBlock" id="SiteSearchResult">{results}</ul></div>')
+
+    def _asahi_article(self, article_id):
+        rng = random.Random(_seed(self.seed, "asahi", article_id))
+        paid = rng.random() < self.paid_rate
+        paragraphs = "".join(f"<p>{_sentence(rng, 16)}</p>" for _ in range(3 if paid else rng.randint(6, 14)))
+        images = "".join(
+            f'<figure><img src="https://www.asahi.com/imgopt/img/{article_id}{index}/hw414/{article_id}{index}.jpg" alt=""></figure>'
+            for index in range(self.images_per_article)
+        )
+        marker = '<img src="https://www.asahi.com/images/icon_key_gold.png"><span class="hideFromApp">有料会員になると続きをお読みいただけます</span>' if paid else ""
+        body = (
+            self._asahi_nav() +
+            f'<main><div class="y_Qv3"><h1>{_sentence(rng, 6)}</h1></div><time>2025年1月{rng.randint(1, 28)}日 {rng.randint(0, 23)}時00分</time>'
+            f'<div class="w8Bsl">{images}{paragraphs}{marker}</div></main>'
+        )
+        head_meta = f'<meta name="cXenseParse:ash-category" content="{article_id[:4]}">'
+        return _page(article_id, body).replace("<title>", head_meta + "<title>", 1)
+
+    # ---- Yahoo ----
+
+    def _yahoo_article_id(self, *parts):
+        return f"{_seed(self.seed, *parts):012x}" * 3 + "0000"
+
+    def _yahoo(self, host, path, query):
+        if host == "news-pctr.c.yimg.jp":
+            return "image", self._image(path)
+        if path.startswith("/topics/"):
+            return "topic", self._yahoo_topic(path.split("/")[2], int(query.get("page", ["1"])[0] or 1))
+        if path.startswith("/pickup/"):
+            return "pickup", self._yahoo_pickup(path.split("/")[2])
+        if path.startswith(("/articles/", "/expert/articles/")):
+            return "article", self._yahoo_article(path.rstrip("/"), int(query.get("page", ["1"])[0] or 1))
+        return "other", None
+
+    def _yahoo_topic(self, topic, page):
+        if page > self.topic_pages:
+            return _page("Yahoo!ニュース", "Yahoo! JAPAN <div class=\"newsFeed\"><ul></ul></div>")
+        items = "".join(
+            f'<li><a href="https://news.yahoo.co.jp/pickup/{_seed(self.seed, topic, page, index) % 10**7}">見出し {index}</a></li>'
+            for index in range(self.pickups_per_page)
+        )
+        next_link = f'<a data-ual-event-name="next_page" href="?page={page + 1}">次へ</a>' if page < self.topic_pages else ""
+        return _page("トピックス - Yahoo!ニュース", f'<header>Yahoo! JAPAN</header><div class="newsFeed"><ul>{items}</ul></div>{next_link}')
+
+    def _yahoo_pickup(self, pickup_id):
+        rng = random.Random(_seed(self.seed, "pickup", pickup_id))
+        article_id = self._yahoo_article_id("pickup", pickup_id)
+        if rng.random() < self.redirect_rate:
+            return (f"https://news.yahoo.co.jp/expert/articles/{article_id}",)
+        return _page("Yahoo!ニュース", f'<div data-ual-view-type="digest"><a href="https://news.yahoo.co.jp/articles/{article_id}?source=pickup">続きを読む</a></div>')
+
+    def _yahoo_article(self, path, page):
+        article_id = path.rsplit("/", 1)[-1]
+        rng = random.Random(_seed(self.seed, "yahoo", article_id))
+        pages = rng.randint(1, self.article_pages)
+        if page > pages:
+            return None
+        rng = random.Random(_seed(self.seed, "yahoo", article_id, page))
+        paragraphs = "".join(f"<p>{_sentence(rng, 16)}</p>" for _ in range(rng.randint(4, 10)))
+        images = "".join(
+            f'<img src="https://news-pctr.c.yimg.jp/t/amd-img/{article_id}{page}{index}.jpg?exp=10800&w=640&h=420" alt="">'
+            for index in range(self.images_per_article if page == 1 else 0)
+        )
+        pager = "".join(f'<a href="{path}?page={number}">{number}</a>' for number in range(1, pages + 1)) if pages > 1 else ""
+        head = f'<meta name="pubdate" content="2025-01-{rng.randint(1, 28):02d}T09:00:00+09:00">'
+        body = (f'<article><h1 class="sc-uzx6gd-1">{_sentence(rng, 6)}</h1><div class="article_body">{images}{paragraphs}</div>'
+                f'<div class="pagination">{pager}</div></article>')
+        return _page(f"{article_id} - Yahoo!ニュース", body).replace("<title>", head + "<title>", 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of responses that are 500s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of responses that are 429s")
+    args = parser.parse_args()
+    server = StandinNewsServer(args.host, args.port, latency=args.latency, error_rate=args.error_rate,
+                               throttle_rate=args.throttle_rate)
+    print(f"serving {', '.join(ASAHI_HOSTS + YAHOO_HOSTS)} at {server.origin} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
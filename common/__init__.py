@@ -0,0 +1 @@
+"""Components shared by the Asahi and Yahoo Japan crawlers."""
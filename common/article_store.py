@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, time
+
+from .parquet_export import JST
+
+
+class ArticleStore:
+    """SQLite article store with an FTS5 full-text index over titles and bodies.
+
+    Articles are upserted by canonical URL, so re-crawling a page updates its
+    row instead of adding a duplicate. Records use the same layout as the
+    Parquet output (see ``common.parquet_export.article_schema``). ``write``
+    buffers records and commits every ``batch_size`` of them in one
+    transaction, which also lets the store act as a streaming sink.
+
+    The index uses the ``trigram`` tokenizer where SQLite supports it, because
+    Japanese text has no word separators; keywords shorter than three
+    characters fall back to a LIKE scan.
+    """
+
+    extension = "db"
+
+    def __init__(self, db_path="./saves/articles.db", batch_size=100, logger=None):
+        self.path = db_path
+        self.batch_size = max(1, batch_size)
+        self.logger = logger or logging.getLogger(__name__)
+        self.count = 0  # Records written through this instance
+        self._buffer = []
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                title TEXT,
+                content TEXT,
+                publish_time TEXT,
+                publish_time_raw TEXT,
+                category TEXT,
+                topic TEXT,
+                image_urls TEXT,
+                local_image_paths TEXT,
+                scraped_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_publish_time ON articles (publish_time);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, publish_time);
+        """)
+        has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        ).fetchone()
+        if not has_fts:
+            for tokenizer in ("trigram", "unicode61"):
+                try:
+                    self._conn.execute(
+                        "CREATE VIRTUAL TABLE articles_fts USING fts5("
+                        f"title, content, content='articles', content_rowid='rowid', tokenize='{tokenizer}')"
+                    )
+                    break
+                except sqlite3.OperationalError:
+                    continue
+        # External-content FTS table kept in sync by triggers
+        self._conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+                INSERT INTO articles_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+            END;
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _time_text(value):
+        """Store times as JST ISO strings so they sort and compare as text"""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            value = value.replace(tzinfo=JST) if value.tzinfo is None else value.astimezone(JST)
+            return value.isoformat(timespec="seconds")
+        if isinstance(value, date):
+            return datetime.combine(value, time(), tzinfo=JST).isoformat(timespec="seconds")
+        return str(value)
+
+    def _row(self, record):
+        return (
+            record["url"], record.get("source"), record.get("title"), record.get("content"),
+            self._time_text(record.get("publish_time")), record.get("publish_time_raw"),
+            record.get("category"), record.get("topic"),
+            json.dumps(list(record.get("image_urls") or []), ensure_ascii=False),
+            json.dumps(list(record.get("local_image_paths") or []), ensure_ascii=False),
+            self._time_text(record.get("scraped_at")),
+        )
+
+    def write(self, record):
+        """Queue one article for upsert; commits once batch_size articles are queued"""
+        with self._lock:
+            self._buffer.append(self._row(record))
+            self.count += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+            return self.count
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        with self._conn:
+            self._conn.executemany("""
+                INSERT INTO articles (url, source, title, content, publish_time, publish_time_raw,
+                                      category, topic, image_urls, local_image_paths, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    source = excluded.source,
+                    title = excluded.title,
+                    content = excluded.content,
+                    publish_time = excluded.publish_time,
+                    publish_time_raw = excluded.publish_time_raw,
+                    category = COALESCE(excluded.category, category),
+                    topic = COALESCE(excluded.topic, topic),
+                    image_urls = excluded.image_urls,
+                    local_image_paths = excluded.local_image_paths,
+                    scraped_at = excluded.scraped_at
+            """, self._buffer)
+        self._buffer = []
+
+    def _to_dict(self, row):
+        article = dict(row)
+        for key in ("image_urls", "local_image_paths"):
+            article[key] = json.loads(article[key]) if article.get(key) else []
+        return article
+
+    def _range_clause(self, since, until, source, prefix="a."):
+        clauses, params = [], []
+        if since is not None:
+            clauses.append(f"{prefix}publish_time >= ?")
+            params.append(self._time_text(since))
+        if until is not None:
+            clauses.append(f"{prefix}publish_time < ?")
+            params.append(self._time_text(until))
+        if source is not None:
+            clauses.append(f"{prefix}source = ?")
+            params.append(source)
+        return clauses, params
+
+    def search(self, keywords, since=None, until=None, source=None, limit=50):
+        """Articles whose title or body contains every keyword, best matches first
+
+        ``keywords`` is a string (split on whitespace) or a list; ``since``/``until``
+        (datetime or date, ``until`` exclusive) and ``source`` narrow the result.
+        """
+        self.flush()
+        if isinstance(keywords, str):
+            keywords = keywords.split()
+        keywords = [keyword for keyword in keywords if keyword]
+        clauses, params = self._range_clause(since, until, source)
+        fts_terms = [keyword for keyword in keywords if len(keyword) >= 3]
+        for keyword in keywords:
+            if len(keyword) < 3:
+                # Too short for trigram matching
+                clauses.append("(a.title LIKE ? OR a.content LIKE ?)")
+                params.extend([f"%{keyword}%"] * 2)
+        where = " AND ".join(clauses)
+        with self._lock:
+            if fts_terms:
+                match = " ".join('"' + term.replace('"', '""') + '"' for term in fts_terms)
+                rows = self._conn.execute(
+                    "SELECT a.* FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+                    f"WHERE articles_fts MATCH ? {'AND ' + where if where else ''} "
+                    "ORDER BY bm25(articles_fts) LIMIT ?",
+                    [match] + params + [limit]
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT a.* FROM articles a {'WHERE ' + where if where else ''} "
+                    "ORDER BY a.publish_time DESC LIMIT ?",
+                    params + [limit]
+                ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def between(self, since=None, until=None, source=None, limit=None):
+        """Articles published in [since, until), newest first"""
+        self.flush()
+        clauses, params = self._range_clause(since, until, source)
+        sql = f"SELECT a.* FROM articles a {'WHERE ' + ' AND '.join(clauses) if clauses else ''} ORDER BY a.publish_time DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def get(self, url):
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM articles WHERE url = ?", (url,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def total(self, source=None):
+        """Number of stored articles (optionally for one source)"""
+        self.flush()
+        with self._lock:
+            if source is None:
+                return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM articles WHERE source = ?", (source,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
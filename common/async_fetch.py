@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+_PENDING = object()
+_FAILED = object()
+
+
+class AsyncFetchEngine:
+    """Run per-URL detail work concurrently on asyncio with a per-host concurrency limit.
+
+    The worker is the crawler's blocking fetch+parse function; it runs on a thread
+    pool while an ``asyncio.Semaphore`` per host caps in-flight requests. Workers
+    should not have lasting side effects: ``consume(item, result)`` is called in input
+    order, on the calling side, for each finished item up to the cut-off, and is where
+    results are saved, streamed and recorded. What it returns is the item's accepted
+    result. Once ``max_results`` results are accepted, all outstanding work is
+    cancelled and results that finished past the cut-off are dropped unconsumed, so
+    they are fetched again later instead of being recorded but missing from the
+    output. ``run`` returns only after workers already running have finished.
+    """
+
+    def __init__(self, per_host_limit=4, max_workers=None, logger=None):
+        self.per_host_limit = max(1, per_host_limit)
+        self.max_workers = max_workers
+        self.logger = logger or logging.getLogger(__name__)
+
+    def run(self, items, worker, max_results=None, url_of=None, consume=None):
+        """Process items concurrently and return ``(item, result)`` pairs for accepted (truthy) results, in input order
+
+        Items whose worker raised are skipped without being consumed.
+        """
+        items = list(items)
+        if not items:
+            return []
+        return asyncio.run(self._run(items, worker, max_results, url_of or (lambda item: item), consume))
+
+    async def _run(self, items, worker, max_results, url_of, consume):
+        loop = asyncio.get_running_loop()
+        hosts = {urlparse(url_of(item)).netloc for item in items}
+        semaphores = {host: asyncio.Semaphore(self.per_host_limit) for host in hosts}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or self.per_host_limit * len(hosts))
+        results = [_PENDING] * len(items)
+
+        async def process(index, item):
+            async with semaphores[urlparse(url_of(item)).netloc]:
+                try:
+                    return index, await loop.run_in_executor(executor, worker, item)
+                except Exception as e:
+                    self.logger.error(f"并发任务失败: {url_of(item)} - {e}")
+                    return index, _FAILED
+
+        tasks = [asyncio.ensure_future(process(index, item)) for index, item in enumerate(items)]
+        pairs = []
+        done_prefix = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, result = await finished
+                results[index] = result
+                # Consume results only once every earlier item has finished, so the cut-off matches sequential order
+                while done_prefix < len(items) and results[done_prefix] is not _PENDING:
+                    item, result = items[done_prefix], results[done_prefix]
+                    done_prefix += 1
+                    if result is _FAILED:
+                        continue
+                    if consume is not None:
+                        try:
+                            result = consume(item, result)
+                        except Exception as e:
+                            self.logger.error(f"并发任务结果处理失败: {url_of(item)} - {e}")
+                            continue
+                    if result:
+                        pairs.append((item, result))
+                    if max_results and len(pairs) >= max_results:
+                        break
+                if max_results and len(pairs) >= max_results:
+                    self.logger.info(f"达到最大数量 {max_results}，取消剩余 {sum(1 for t in tasks if not t.done())} 个任务")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Cancelling a task does not stop a worker already running in its thread; wait for those.
+            # Nothing is queued behind them: the semaphores keep submissions within the pool size.
+            executor.shutdown(wait=True)
+        return pairs
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import threading
+import time
+
+
+class CrawlCheckpoint:
+    """Periodic on-disk snapshot of a running crawl.
+
+    Holds the crawl's frontier (work not started yet), progress counters, the
+    URLs whose detail pages are done, the results gathered so far and the
+    number of accepted results (also those not kept in memory). Updates
+    are written at most every ``interval`` seconds, or immediately through
+    ``save``, so an interrupted run can ``load`` the last snapshot and skip the
+    pages it already fetched.
+    """
+
+    def __init__(self, path, interval=30, logger=None):
+        self.path = path
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._frontier = None
+        self._progress = {}
+        self._completed = set()
+        self._results = []
+        self._accepted = 0
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def load(self):
+        """Restore the last snapshot; returns False if there is none (or it cannot be read)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"读取断点文件失败，将从头开始: {self.path} - {e}")
+            return False
+        with self._lock:
+            self._frontier = state.get("frontier")
+            self._progress = state.get("progress", {})
+            self._completed = set(state.get("completed", []))
+            self._results = state.get("results", [])
+            self._accepted = state.get("accepted", len(self._results))
+            self._dirty = False
+        self.logger.info(
+            f"从断点恢复: {self.path}（保存于 {state.get('saved_at', '未知时间')}），"
+            f"已完成 {len(self._completed)} 个页面，已有结果 {len(self._results)} 条"
+        )
+        return True
+
+    @property
+    def frontier(self):
+        return self._frontier
+
+    @property
+    def progress(self):
+        return self._progress
+
+    @property
+    def completed(self):
+        with self._lock:
+            return set(self._completed)
+
+    @property
+    def results(self):
+        with self._lock:
+            return list(self._results)
+
+    @property
+    def accepted(self):
+        """Number of detail pages that produced a result, whether or not the result was kept"""
+        with self._lock:
+            return self._accepted
+
+    def set_frontier(self, frontier):
+        """Replace the pending work list"""
+        with self._lock:
+            self._frontier = frontier
+            self._dirty = True
+        self.maybe_save()
+
+    def set_progress(self, **values):
+        """Update progress counters"""
+        with self._lock:
+            self._progress.update(values)
+            self._dirty = True
+        self.maybe_save()
+
+    def mark_completed(self, url, result=None, accepted=False):
+        """Record a finished detail page and its result (if any)
+
+        ``accepted`` counts a page whose result is not kept here (e.g. only streamed to a file).
+        """
+        with self._lock:
+            self._completed.add(url)
+            if result is not None:
+                self._results.append(result)
+            if result is not None or accepted:
+                self._accepted += 1
+            self._dirty = True
+        self.maybe_save()
+
+    def maybe_save(self):
+        """Write the snapshot if there are changes and ``interval`` seconds have passed"""
+        if self._dirty and time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        """Write the snapshot now (atomically, so a crash never leaves a half-written file)"""
+        with self._lock:
+            state = {
+                "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "frontier": self._frontier,
+                "progress": self._progress,
+                "completed": sorted(self._completed),
+                "results": self._results,
+                "accepted": self._accepted,
+            }
+            data = json.dumps(state, ensure_ascii=False)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"写入断点文件失败: {self.path} - {e}")
+
+    def clear(self):
+        """Delete the snapshot once its results are safely saved elsewhere"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"删除断点文件失败: {self.path} - {e}")
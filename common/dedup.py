@@ -0,0 +1,147 @@
+import hashlib
+import json
+import math
+import os
+import threading
+
+# First line of every saved filter, followed by a JSON header line
+_MAGIC = b"NEWS-SCRAPER-URL-FILTER\n"
+
+
+class ExactUrlSet(set):
+    """Exact URL set with the same save/load interface as ``BloomUrlFilter``"""
+
+    kind = "exact"
+
+    def save(self, path):
+        """Write the set to disk, one URL per line"""
+        header = json.dumps({"kind": self.kind, "count": len(self)}).encode("utf-8") + b"\n"
+        body = "\n".join(sorted(self)).encode("utf-8")
+        _atomic_write(path, _MAGIC + header + body)
+
+    @classmethod
+    def _from_saved(cls, header, body):
+        text = body.decode("utf-8")
+        return cls(text.split("\n") if text else [])
+
+
+class BloomUrlFilter:
+    """Fixed-size Bloom filter for URL membership.
+
+    Sized from ``capacity`` and ``error_rate`` so memory stays at roughly
+    ``-capacity * ln(error_rate) / ln(2)^2`` bits no matter how long the URLs
+    are. Lookups never miss a URL that was added; a URL that was never added is
+    reported as seen with probability ``error_rate`` while the filter holds at
+    most ``capacity`` URLs, and more often beyond that.
+    """
+
+    kind = "bloom"
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.capacity = int(capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._hash_range = range(self.num_hashes)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, url):
+        # Double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        num_bits = self.num_bits
+        h1 = int.from_bytes(digest[:8], "little") % num_bits
+        h2 = (int.from_bytes(digest[8:], "little") | 1) % num_bits
+        return [(h1 + i * h2) % num_bits for i in self._hash_range]
+
+    def add(self, url):
+        positions = self._positions(url)
+        bits = self._bits
+        with self._lock:
+            new = False
+            for pos in positions:
+                mask = 1 << (pos & 7)
+                if not bits[pos >> 3] & mask:
+                    bits[pos >> 3] |= mask
+                    new = True
+            if new:
+                self._count += 1
+
+    def update(self, urls):
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url):
+        bits = self._bits
+        for pos in self._positions(url):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        """Approximate number of distinct URLs added"""
+        return self._count
+
+    @property
+    def size_bytes(self):
+        return len(self._bits)
+
+    def save(self, path):
+        """Write the bit array and its parameters to disk"""
+        header = {
+            "kind": self.kind,
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "count": self._count,
+        }
+        with self._lock:
+            body = bytes(self._bits)
+        _atomic_write(path, _MAGIC + json.dumps(header).encode("utf-8") + b"\n" + body)
+
+    @classmethod
+    def _from_saved(cls, header, body):
+        url_filter = cls(header["capacity"], header["error_rate"])
+        if url_filter.num_bits != header["num_bits"] or url_filter.num_hashes != header["num_hashes"] \
+                or len(body) != len(url_filter._bits):
+            raise ValueError("saved Bloom filter does not match its header")
+        url_filter._bits[:] = body
+        url_filter._count = header["count"]
+        return url_filter
+
+
+_FILTER_CLASSES = {cls.kind: cls for cls in (ExactUrlSet, BloomUrlFilter)}
+
+
+def make_url_filter(kind="exact", capacity=1_000_000, error_rate=0.001):
+    """Create an empty URL filter: "exact" (a set) or "bloom" (fixed memory, false positives at error_rate)"""
+    if kind == "exact":
+        return ExactUrlSet()
+    if kind == "bloom":
+        return BloomUrlFilter(capacity, error_rate)
+    raise ValueError(f"unknown URL filter kind: {kind}")
+
+
+def load_url_filter(path):
+    """Load a filter written by ``save``; the filter kind is read from the file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(_MAGIC):
+        raise ValueError(f"not a saved URL filter: {path}")
+    header_end = data.index(b"\n", len(_MAGIC))
+    header = json.loads(data[len(_MAGIC):header_end].decode("utf-8"))
+    if header.get("kind") not in _FILTER_CLASSES:
+        raise ValueError(f"unknown URL filter kind in {path}: {header.get('kind')}")
+    return _FILTER_CLASSES[header["kind"]]._from_saved(header, data[header_end + 1:])
+
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
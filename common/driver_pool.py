@@ -0,0 +1,146 @@
+import logging
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+
+class WebDriverPool:
+    """Reusable, health-checked pool of Chrome WebDrivers.
+
+    Drivers are launched lazily, handed out through ``driver()`` and kept alive
+    between pages. A driver is recycled after ``max_pages_per_driver`` pages or
+    when it fails the health check on checkout, and every launch is timed so the
+    startup cost shows up in ``get_stats``.
+    """
+
+    def __init__(self, size=1, max_pages_per_driver=50, headless=False, stealth=False, user_agents=None, logger=None):
+        self.size = max(1, size)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.headless = headless
+        self.stealth = stealth
+        self.user_agents = list(user_agents or [])
+        self.logger = logger or logging.getLogger(__name__)
+        self._idle = queue.LifoQueue()
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._stats = {"launches": 0, "recycled": 0, "crashed": 0, "pages": 0, "startup_seconds": []}
+
+    def _build_options(self):
+        """Chrome options for a new driver"""
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.user_agents:
+            user_agent = random.choice(self.user_agents)
+            self.logger.debug(f"使用 User-Agent: {user_agent}")
+            options.add_argument(f"user-agent={user_agent}")
+        if self.stealth:
+            # Reduce bot detection
+            options.add_argument("--disable-blink-features=AutomationControlled")
+            options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            options.add_experimental_option("useAutomationExtension", False)
+        return options
+
+    def _launch(self):
+        """Start a new driver and record its startup time"""
+        start = time.perf_counter()
+        driver = webdriver.Chrome(options=self._build_options())
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats["launches"] += 1
+            self._stats["startup_seconds"].append(elapsed)
+            self._pages[id(driver)] = 0
+        self.logger.info(f"WebDriver 启动完成，耗时 {elapsed:.2f} 秒")
+        return driver
+
+    def _is_healthy(self, driver):
+        """Cheap round trip to check that the browser session is still alive"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            self.logger.warning(f"WebDriver 健康检查失败，将重新启动: {str(e)}")
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"关闭驱动时出错: {str(e)}")
+
+    def acquire(self):
+        """Check out a healthy driver, launching one if none is idle"""
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._launch()
+                if self._is_healthy(driver):
+                    return driver
+                with self._lock:
+                    self._stats["crashed"] += 1
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver):
+        """Return a driver to the pool, recycling it once it has served max_pages_per_driver pages"""
+        try:
+            with self._lock:
+                self._stats["pages"] += 1
+                pages = self._pages.get(id(driver), 0) + 1
+                self._pages[id(driver)] = pages
+            if self.max_pages_per_driver and pages >= self.max_pages_per_driver:
+                self.logger.info(f"WebDriver 已处理 {pages} 个页面，回收重启")
+                with self._lock:
+                    self._stats["recycled"] += 1
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """Context manager that checks out a driver for one page"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def get_stats(self):
+        """Return launch/recycle counters and driver startup timings"""
+        with self._lock:
+            stats = dict(self._stats)
+            startup = list(stats.pop("startup_seconds"))
+        stats["startup_seconds_total"] = round(sum(startup), 3)
+        stats["startup_seconds_avg"] = round(sum(startup) / len(startup), 3) if startup else 0.0
+        return stats
+
+    def close(self):
+        """Quit all idle drivers; the pool relaunches lazily if used again"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+        stats = self.get_stats()
+        if stats["launches"]:
+            self.logger.info(
+                f"WebDriver 池统计: 启动 {stats['launches']} 次, 共耗时 {stats['startup_seconds_total']:.2f} 秒 "
+                f"(平均 {stats['startup_seconds_avg']:.2f} 秒), 处理页面 {stats['pages']} 个, "
+                f"回收 {stats['recycled']} 次, 崩溃重启 {stats['crashed']} 次"
+            )
@@ -0,0 +1,174 @@
+import functools
+import logging
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html  # C tree builder for BeautifulSoup, several times faster than html.parser
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# BeautifulSoup tree builders the crawlers can use, fastest first
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+logger = logging.getLogger(__name__)
+_warned = set()
+
+# tag#id / tag.class / tag[attr] / tag[attr="value"] compound selectors (no combinators)
+_SIMPLE_SELECTOR = re.compile(r'^(?P<name>[\w-]+)?(?P<quals>(?:[#.][\w-]+|\[[\w-]+(?:=["\']?[^"\'\]]*["\']?)?\])*)$')
+_QUALIFIER = re.compile(r'([#.])([\w-]+)|\[([\w-]+)(=["\']?([^"\'\]]*)["\']?)?\]')
+
+
+def resolve_parser(name="auto"):
+    """Map a configured backend name to an installed BeautifulSoup tree builder
+
+    "auto" picks lxml when it is installed; an unavailable backend falls back
+    to the standard library's html.parser (with a one-time warning).
+    """
+    if name in (None, "auto"):
+        return "lxml" if LXML_AVAILABLE else "html.parser"
+    if name == "lxml" and not LXML_AVAILABLE:
+        if name not in _warned:
+            _warned.add(name)
+            logger.warning("lxml 未安装，HTML 解析回退到 html.parser（pip install lxml 可提速）")
+        return "html.parser"
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"unknown HTML parser backend: {name}")
+    return name
+
+
+def make_soup(markup, parser="auto", parse_only=None):
+    """Parse markup with the selected backend; the crawlers' selectors work unchanged on every backend"""
+    return BeautifulSoup(markup, resolve_parser(parser), parse_only=parse_only)
+
+
+def _parse_selector(selector):
+    """Split a simple compound selector into (tag name or None, [(kind, name, value)])"""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match:
+        raise ValueError(f"only simple selectors (tag#id, tag.class, tag[attr=value]) can be strained: {selector}")
+    qualifiers = []
+    for prefix, ident, attr, has_value, value in _QUALIFIER.findall(match.group("quals")):
+        if prefix:
+            qualifiers.append((prefix, ident, None))
+        else:
+            qualifiers.append(("[]", attr, value if has_value else None))
+    return match.group("name"), qualifiers
+
+
+def _attr_text(attrs, name):
+    value = attrs.get(name)
+    return " ".join(value) if isinstance(value, (list, tuple)) else value
+
+
+def _compile_selector(selector):
+    """(tag name or None, predicate over the raw attributes) for a simple selector"""
+    tag_name, qualifiers = _parse_selector(selector)
+    checks = []
+    for kind, name, value in qualifiers:
+        if kind == "#":
+            checks.append(lambda attrs, name=name: _attr_text(attrs, "id") == name)
+        elif kind == ".":
+            checks.append(lambda attrs, name=name: name in (_attr_text(attrs, "class") or "").split())
+        elif value is not None:
+            checks.append(lambda attrs, name=name, value=value: _attr_text(attrs, name) == value)
+        else:
+            checks.append(lambda attrs, name=name: attrs.get(name) is not None)
+    return tag_name, lambda attrs: all(check(attrs) for check in checks)
+
+
+def _selector_xpath(selector):
+    """XPath predicate (for use inside [...]) equivalent to a simple selector"""
+    tag_name, qualifiers = _parse_selector(selector)
+    conditions = [f"self::{tag_name}"] if tag_name else []
+    for kind, name, value in qualifiers:
+        if kind == "#":
+            conditions.append(f'@id="{name}"')
+        elif kind == ".":
+            conditions.append(f'contains(concat(" ", normalize-space(@class), " "), " {name} ")')
+        elif value is not None:
+            conditions.append(f'@{name}="{value}"')
+        else:
+            conditions.append(f"@{name}")
+    return " and ".join(conditions) or "true()"
+
+
+class _TagStrainer(SoupStrainer):
+    """SoupStrainer driven by a (name, attrs) predicate, so one parse can keep several unrelated element kinds
+
+    A kept element is built with its whole subtree; everything else is tokenized
+    but never turned into Tag objects.
+    """
+
+    def __init__(self, predicate):
+        super().__init__()
+        self.predicate = predicate
+
+    def search_tag(self, markup_name=None, markup_attrs=None):
+        # beautifulsoup4 < 4.13 asks this while parsing
+        if isinstance(markup_name, str):
+            return markup_name if self.predicate(markup_name, markup_attrs or {}) else None
+        return super().search_tag(markup_name, markup_attrs)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # beautifulsoup4 >= 4.13
+        return self.predicate(name, attrs or {})
+
+
+@functools.lru_cache(maxsize=32)
+def link_strainer(containers=()):
+    """Strainer keeping <a href> tags plus the elements matching the given simple selectors"""
+    # Checks grouped by tag name, so most tags cost one dict lookup
+    checks_by_name = {}
+    for selector in containers:
+        tag_name, check = _compile_selector(selector)
+        checks_by_name.setdefault(tag_name, []).append(check)
+    any_tag_checks = checks_by_name.pop(None, [])
+
+    def keep(name, attrs):
+        if name == "a" and "href" in attrs:
+            return True
+        checks = checks_by_name.get(name)
+        if checks and any(check(attrs) for check in checks):
+            return True
+        return any(check(attrs) for check in any_tag_checks) if any_tag_checks else False
+
+    return _TagStrainer(keep)
+
+
+@functools.lru_cache(maxsize=32)
+def _link_xpath(containers=()):
+    """Top-level kept elements (containers and <a href> outside them), in document order"""
+    if not containers:
+        return etree.XPath("//a[@href]")
+    kept = " or ".join(f"({_selector_xpath(selector)})" for selector in containers)
+    return etree.XPath(f"//*[({kept}) or (self::a and @href)][not(ancestor::*[{kept}])]")
+
+
+def _lxml_link_fragment(markup, containers):
+    """Cut the page down to its kept elements in C, before BeautifulSoup sees it"""
+    root = lxml.html.document_fromstring(markup)
+    return "".join(lxml.html.tostring(element, encoding="unicode", with_tail=False)
+                   for element in _link_xpath(containers)(root))
+
+
+def make_link_soup(markup, parser="auto", containers=()):
+    """Fast path for link-listing pages: build only the anchors and the given containers
+
+    ``find_all("a", href=True)`` on the result returns the same links, in the
+    same order, as on a full parse, and selectors scoped to one of the
+    ``containers`` (simple selectors such as "div#GlobalNav", kept with their
+    whole subtree) keep working. With lxml the page is first reduced to those
+    elements by libxml2, so BeautifulSoup only builds objects for what is read;
+    with html.parser a strainer skips building everything else.
+    """
+    containers = tuple(containers)
+    if resolve_parser(parser) == "lxml" and isinstance(markup, str):
+        try:
+            return make_soup(_lxml_link_fragment(markup, containers), "lxml")
+        except (ValueError, etree.LxmlError):
+            pass  # Empty page or a str with an XML encoding declaration: let BeautifulSoup handle it
+    return make_soup(markup, parser, parse_only=link_strainer(containers))
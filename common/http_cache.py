@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def freshness_lifetime(cache_control, ttl):
+    """Seconds an entry may be served without revalidation: ``ttl``, shortened by max-age and 0 for no-cache"""
+    lifetime = ttl
+    for directive in (cache_control or "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "no-cache":
+            return 0
+        if name == "max-age":
+            try:
+                lifetime = min(lifetime, max(0, int(value.strip('"'))))
+            except ValueError:
+                return 0  # An unreadable max-age makes the response stale (RFC 9111)
+    return lifetime
+
+
+class HttpCache:
+    """Persistent response cache with conditional revalidation.
+
+    Bodies and their validators (ETag / Last-Modified) are stored under
+    ``cache_dir``. Entries younger than ``ttl`` seconds (or the response's
+    ``Cache-Control: max-age`` if shorter) are served from disk without a
+    request; older ones and ``no-cache`` responses are revalidated with
+    If-None-Match / If-Modified-Since and a 304 is answered from disk;
+    ``no-store`` responses are not kept. When the cache grows beyond
+    ``max_size_bytes`` the least recently used entries are evicted, and
+    ``invalidate`` drops an entry that turned out to be unusable (e.g. a
+    block page).
+    """
+
+    def __init__(self, cache_dir="./saves/http_cache", ttl=600, max_size_bytes=500 * 1024 * 1024, logger=None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size_bytes = max_size_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0, "invalidated": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".body", base + ".json"
+
+    def lookup(self, url):
+        """Return the cached entry for a URL as (meta, body), or None; a lookup counts as use for LRU eviction"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            os.utime(body_path)
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def is_fresh(self, meta):
+        """Whether an entry can be served without contacting the server"""
+        lifetime = freshness_lifetime(meta.get("headers", {}).get("Cache-Control"), self.ttl)
+        return time.time() - meta.get("stored_at", 0) < lifetime
+
+    def conditional_headers(self, meta):
+        """If-None-Match / If-Modified-Since headers for revalidating an entry"""
+        headers = {}
+        validators = meta.get("headers", {})
+        if validators.get("ETag"):
+            headers["If-None-Match"] = validators["ETag"]
+        if validators.get("Last-Modified"):
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return headers
+
+    def build_response(self, url, meta, body):
+        """Rebuild a requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        response.url = meta.get("final_url", url)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def store(self, url, response):
+        """Store a 200 response body with its validators (skips no-store responses)"""
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "final_url": response.url,
+            "stored_at": time.time(),
+            "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+        }
+        old_size = self._entry_size(body_path, meta_path)
+        try:
+            # Write through temp files so concurrent readers never see a partial entry
+            for path, data, mode in ((body_path, response.content, "wb"), (meta_path, json.dumps(meta, ensure_ascii=False), "w")):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"写入HTTP缓存失败: {url} - {e}")
+            return
+        with self._lock:
+            self._stats["stored"] += 1
+            self._size += self._entry_size(body_path, meta_path) - old_size
+        self._evict_if_needed()
+
+    def invalidate(self, url):
+        """Drop the entry of a URL so the next request goes to the network"""
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            freed = self._entry_size(body_path, meta_path)
+            removed = False
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                    removed = True
+                except OSError:
+                    pass
+            if removed:
+                self._size -= freed
+                self._stats["invalidated"] += 1
+        return removed
+
+    def touch(self, url):
+        """Mark an entry as freshly validated (resets its TTL and LRU position)"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["stored_at"] = time.time()
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.utime(body_path)
+        except (OSError, ValueError):
+            pass
+
+    def record(self, outcome):
+        """Count a hit / miss / revalidated outcome"""
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def _entry_size(self, *paths):
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def _evict_if_needed(self):
+        """Drop least recently used entries until the cache fits max_size_bytes"""
+        with self._lock:
+            if not self.max_size_bytes or self._size <= self.max_size_bytes:
+                return
+            bodies = sorted(
+                (entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".body")),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in bodies:
+                if self._size <= self.max_size_bytes * 0.9:
+                    break
+                meta_path = entry.path[:-len(".body")] + ".json"
+                freed = self._entry_size(entry.path, meta_path)
+                for path in (entry.path, meta_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                self._size -= freed
+                self._stats["evicted"] += 1
+
+    def get_stats(self):
+        """Hit / miss / revalidate counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size_bytes"] = self._size
+        lookups = stats["hits"] + stats["misses"] + stats["revalidated"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["revalidated"]) / lookups, 3) if lookups else 0.0
+        return stats
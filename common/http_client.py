@@ -0,0 +1,249 @@
+import random
+import threading
+import logging
+from urllib.parse import urlparse, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .rate_limiter import AdaptiveRateLimiter
+
+try:
+    import brotli  # noqa: F401  # urllib3 decodes br bodies only when a brotli package is installed
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+DEFAULT_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:127.0) Gecko/20100101 Firefox/127.0",
+]
+
+
+class _ConnectionCounter:
+    """Thread-safe counter of real TCP/TLS connects"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+
+def _counting_pool_class(pool_cls, counter):
+    """Build a urllib3 pool class whose connections report every connect()"""
+    class CountingConnection(pool_cls.ConnectionCls):
+        def connect(self):
+            counter.increment()
+            return super().connect()
+
+    return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": CountingConnection})
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts handshakes, including silent reconnects of dropped keep-alive sockets
+
+    Requests for a host listed in ``routes`` are sent to the mapped origin instead
+    (with the original ``Host`` header) while the response keeps the original URL,
+    so redirects and link resolution behave as if the real host had answered.
+    """
+
+    def __init__(self, counter, routes=None, **kwargs):
+        self.counter = counter
+        self.routes = routes if routes is not None else {}
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        origin = self.routes.get(parts.netloc) if self.routes else None
+        if origin is None:
+            return super().send(request, **kwargs)
+        original_url = request.url
+        request.url = origin.rstrip("/") + urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        request.headers["Host"] = parts.netloc
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            # Redirects are built from this request object; they must see the real URL again
+            request.url = original_url
+            del request.headers["Host"]
+        response.url = original_url
+        return response
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.counter),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.counter),
+        }
+
+
+class HttpClient:
+    """Pooled HTTP client shared by the crawlers.
+
+    Keeps one keep-alive ``requests.Session`` per host so TCP/TLS handshakes are
+    reused across pages and images, rotates User-Agents per request and
+    negotiates compressed bodies. Every real connect is counted per host so the
+    saved handshakes can be reported, see ``get_stats``. All requests are paced by
+    an ``AdaptiveRateLimiter`` that reacts to 429/503 and ``Retry-After``. With an
+    ``HttpCache`` attached, fresh entries are served from disk and stale ones are
+    revalidated with conditional requests.
+
+    ``routes`` maps hosts to another origin (e.g. ``{"www.asahi.com": "http://127.0.0.1:8000"}``)
+    that serves them instead; it can also be updated on a running client.
+    """
+
+    def __init__(self, user_agents=None, pool_size=10, timeout=10, default_headers=None, rate_limiter=None,
+                 cache=None, routes=None, logger=None):
+        self.user_agents = list(user_agents or DEFAULT_USER_AGENTS)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.default_headers = dict(default_headers or {})
+        self.logger = logger or logging.getLogger(__name__)
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(logger=self.logger)
+        self.cache = cache
+        self.routes = dict(routes or {})  # Shared with every session's adapter
+        self._sessions = {}
+        self._counters = {}
+        self._host_requests = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "bytes": 0}
+
+    def _get_session(self, host):
+        """Return the keep-alive session for a host, creating it on first use"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                counter = self._counters.setdefault(host, _ConnectionCounter())
+                adapter = _CountingAdapter(counter, self.routes, pool_connections=1, pool_maxsize=self.pool_size, pool_block=False)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def build_headers(self, headers=None):
+        """Merge default headers with a rotated User-Agent and caller overrides"""
+        merged = {
+            "User-Agent": random.choice(self.user_agents),
+            "Accept-Encoding": ACCEPT_ENCODING,
+            **self.default_headers,
+        }
+        if headers:
+            merged.update(headers)
+        return merged
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """Send a GET request through the host's pooled session, paced by the rate limiter
+
+        Non-streaming requests go through the HTTP cache when one is attached.
+        """
+        if self.cache is None or kwargs.get("stream"):
+            return self._send(url, headers, timeout, **kwargs)
+
+        cached = self.cache.lookup(url)
+        if cached and self.cache.is_fresh(cached[0]):
+            self.cache.record("hits")
+            return self.cache.build_response(url, *cached)
+
+        conditional = self.cache.conditional_headers(cached[0]) if cached else {}
+        response = self._send(url, {**(headers or {}), **conditional}, timeout, **kwargs)
+        if response.status_code == 304 and cached:
+            self.cache.record("revalidated")
+            self.cache.touch(url)
+            return self.cache.build_response(url, *cached)
+        self.cache.record("misses")
+        self.cache.store(url, response)
+        return response
+
+    def _send(self, url, headers=None, timeout=None, **kwargs):
+        """Send a GET request over the network"""
+        host = urlparse(url).netloc
+        session = self._get_session(host)
+        request_headers = self.build_headers(headers)
+        self.logger.debug(f"使用 User-Agent: {request_headers['User-Agent']}")
+        self.rate_limiter.acquire(host)
+        try:
+            response = session.get(url, headers=request_headers, timeout=timeout or self.timeout, **kwargs)
+        except Exception:
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["errors"] += 1
+            raise
+        with self._lock:
+            self._stats["requests"] += 1
+            self._host_requests[host] = self._host_requests.get(host, 0) + 1
+            if not kwargs.get("stream"):
+                self._stats["bytes"] += len(response.content)
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self.rate_limiter.on_throttle(host, self.rate_limiter.parse_retry_after(response.headers.get("Retry-After")))
+        elif response.status_code < 400:
+            self.rate_limiter.on_success(host)
+        return response
+
+    def report_blocked(self, url):
+        """Tell the rate limiter a 200 response was actually a block/captcha page, and drop it from the cache"""
+        self.rate_limiter.on_throttle(urlparse(url).netloc)
+        if self.cache is not None:
+            self.cache.invalidate(url)
+
+    def get_stats(self):
+        """Return request counters and per-host connection reuse statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            host_requests = dict(self._host_requests)
+            counters = dict(self._counters)
+        hosts = {}
+        for host, requests_sent in host_requests.items():
+            counter = counters.get(host)
+            new_connections = counter.count if counter else 0
+            hosts[host] = {
+                "requests": requests_sent,
+                "new_connections": new_connections,
+                "reused_connections": max(requests_sent - new_connections, 0),
+            }
+        total_requests = sum(h["requests"] for h in hosts.values())
+        total_reused = sum(h["reused_connections"] for h in hosts.values())
+        stats.update({
+            "new_connections": sum(h["new_connections"] for h in hosts.values()),
+            "reused_connections": total_reused,
+            "reuse_ratio": round(total_reused / total_requests, 3) if total_requests else 0.0,
+            "hosts": hosts,
+            "rate_limiter": self.rate_limiter.get_stats(),
+        })
+        if self.cache is not None:
+            stats["cache"] = self.cache.get_stats()
+        return stats
+
+    def log_stats(self):
+        """Log a one-line connection reuse summary"""
+        stats = self.get_stats()
+        self.logger.info(
+            f"HTTP统计: 请求 {stats['requests']} 次, 失败 {stats['errors']} 次, 新建连接 {stats['new_connections']} 个, "
+            f"复用连接 {stats['reused_connections']} 次 (复用率 {stats['reuse_ratio']:.1%}), 接收 {stats['bytes']} 字节"
+        )
+        if "cache" in stats:
+            cache_stats = stats["cache"]
+            self.logger.info(
+                f"HTTP缓存: 命中 {cache_stats['hits']} 次, 304重验证 {cache_stats['revalidated']} 次, "
+                f"未命中 {cache_stats['misses']} 次, 淘汰 {cache_stats['evicted']} 条, 失效 {cache_stats['invalidated']} 条, 占用 {cache_stats['size_bytes']} 字节"
+            )
+        return stats
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+def image_extension(url, default=""):
+    """Lower-cased file extension of an image URL's path (query string ignored)"""
+    return os.path.splitext(urlparse(url).path)[1].lower() or default
+
+
+class ImageDownloader:
+    """Bounded-concurrency image downloads, streamed to disk.
+
+    Every image is checked before its body is read: the URL's extension
+    against ``valid_extensions`` (None accepts any) and the ``Content-Length``
+    header against ``min_size``/``max_size``. Bodies are streamed in
+    ``chunk_size`` pieces to a temp file that is renamed into place when
+    complete, so a crash never leaves a truncated image under the final name
+    and memory use does not grow with image size. At most ``max_workers``
+    downloads run at once across all callers.
+
+    With an ``ImageStore`` passed to ``download``/``download_many``, images the
+    store already holds are returned without a request and new ones are
+    hashed while streaming and saved under their content hash.
+    """
+
+    def __init__(self, http, max_workers=4, valid_extensions=None, min_size=0, max_size=None,
+                 chunk_size=64 * 1024, logger=None):
+        self.http = http
+        self.max_workers = max(1, max_workers)
+        self.valid_extensions = set(valid_extensions) if valid_extensions is not None else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.logger = logger or logging.getLogger(__name__)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {"downloaded": 0, "reused": 0, "skipped": 0, "failed": 0, "bytes": 0}
+        self._active = 0
+        self._active_since = None
+        self._active_seconds = 0.0  # Wall time with at least one download running
+
+    def _begin(self):
+        with self._lock:
+            if self._active == 0:
+                self._active_since = time.monotonic()
+            self._active += 1
+
+    def _end(self, outcome, size=0):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._active_seconds += time.monotonic() - self._active_since
+            self._stats[outcome] += 1
+            self._stats["bytes"] += size
+
+    def check_url(self, url):
+        """Reason to skip an image before any request is made, or None"""
+        if self.valid_extensions is not None and image_extension(url) not in self.valid_extensions:
+            return "扩展名无效"
+        return None
+
+    def check_size(self, size):
+        """Reason to skip an image of ``size`` bytes, or None"""
+        if size < self.min_size:
+            return f"图片过小（{size} 字节）"
+        if self.max_size is not None and size > self.max_size:
+            return f"图片过大（{size} 字节）"
+        return None
+
+    def download(self, url, path=None, store=None):
+        """Download one image to ``path`` (or into ``store``); returns the local path, or None if skipped or failed"""
+        reason = self.check_url(url)
+        if reason:
+            self.logger.warning(f"跳过图片（{reason}）: {url}")
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+        if store is not None:
+            stored = store.lookup(url)
+            if stored:
+                self.logger.debug(f"图片已在本地存储中，跳过下载: {url}")
+                with self._lock:
+                    self._stats["reused"] += 1
+                return stored
+        self._begin()
+        tmp_path = store.temp_path() if store is not None else f"{path}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256() if store is not None else None
+        size = 0
+        try:
+            with self.http.get(url, stream=True) as response:
+                if response.status_code != 200:
+                    self.logger.error(f"下载图片失败: {url}, 状态码: {response.status_code}")
+                    self._end("failed")
+                    return None
+                content_length = response.headers.get("Content-Length")
+                reason = self.check_size(int(content_length)) if content_length and content_length.isdigit() else None
+                if reason:
+                    self.logger.warning(f"跳过图片（{reason}）: {url}")
+                    self._end("skipped")
+                    return None
+                os.makedirs(os.path.dirname(os.path.abspath(tmp_path)), exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        size += len(chunk)
+                        if self.max_size is not None and size > self.max_size:
+                            break
+                        f.write(chunk)
+                        if digest is not None:
+                            digest.update(chunk)
+            # Servers without Content-Length: apply the size limits to the streamed body
+            reason = self.check_size(size)
+            if reason:
+                os.remove(tmp_path)
+                self.logger.warning(f"跳过图片（{reason}）: {url}")
+                self._end("skipped")
+                return None
+            if store is not None:
+                path = store.add(url, tmp_path, digest.hexdigest(), size)
+            else:
+                os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.logger.error(f"下载图片失败: {url}, 错误: {str(e)}")
+            self._end("failed", size)
+            return None
+        self.logger.info(f"成功下载图片: {url} 到 {path}")
+        self._end("downloaded", size)
+        return path
+
+    def download_many(self, jobs, store=None):
+        """Download (url, path) pairs concurrently; returns the local paths (None for failures) in job order"""
+        jobs = list(jobs)
+        if len(jobs) <= 1 or self.max_workers == 1:
+            return [self.download(url, path, store) for url, path in jobs]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="image")
+            executor = self._executor
+        futures = [executor.submit(self.download, url, path, store) for url, path in jobs]
+        return [future.result() for future in futures]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            seconds = self._active_seconds + (time.monotonic() - self._active_since if self._active else 0.0)
+        stats["seconds"] = round(seconds, 3)
+        stats["bytes_per_sec"] = round(stats["bytes"] / seconds) if seconds else 0
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        self.logger.info(
+            f"图片下载: 成功 {stats['downloaded']} 张, 复用已存储 {stats['reused']} 张, 跳过 {stats['skipped']} 张, 失败 {stats['failed']} 张, "
+            f"{stats['bytes']} 字节, 用时 {stats['seconds']} 秒 ({stats['bytes_per_sec'] / 1024:.1f} KB/s)"
+        )
+        return stats
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
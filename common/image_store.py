@@ -0,0 +1,134 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .image_downloader import image_extension
+
+
+def normalize_image_url(url):
+    """Canonical form of an image URL: lower-case scheme/host, no default port, sorted query, no fragment"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+class ImageStore:
+    """Content-addressed image store shared by articles and across runs.
+
+    Each distinct image body is kept once, as ``blobs/<sha256[:2]>/<sha256><ext>``
+    under ``root``. A SQLite index (``root/index.db``) maps normalized image
+    URLs to blobs and each article to its images in page order, so an image
+    that is already stored is reused without any network request, and the
+    same photo embedded in several articles, or fetched again on a later run,
+    costs no extra bandwidth or disk.
+    """
+
+    def __init__(self, root="./saves/pic/store", logger=None):
+        self.root = root
+        self.logger = logger or logging.getLogger(__name__)
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER,
+                stored_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS images (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                fetched_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS article_images (
+                article_url TEXT,
+                position INTEGER,
+                url TEXT,
+                sha256 TEXT,
+                PRIMARY KEY (article_url, position)
+            );
+        """)
+        self._conn.commit()
+
+    def temp_path(self):
+        """Where a download is streamed before its hash is known"""
+        return os.path.join(self.root, "blobs", f"_{threading.get_ident()}_{time.monotonic_ns()}.tmp")
+
+    def lookup(self, url):
+        """Local path of an already stored image URL, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.path FROM images i JOIN blobs b ON b.sha256 = i.sha256 WHERE i.url = ?",
+                (normalize_image_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        path = os.path.join(self.root, row[0])
+        return path if os.path.exists(path) else None  # Blob deleted by hand: download again
+
+    def add(self, url, tmp_path, sha256, size):
+        """Move a finished download into the store (or drop it if the blob exists); returns the blob path"""
+        rel_path = os.path.join("blobs", sha256[:2], sha256 + image_extension(url, ".jpg"))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+            if row and os.path.exists(os.path.join(self.root, row[0])):
+                rel_path = row[0]
+                os.remove(tmp_path)
+                self.logger.debug(f"图片内容已存在，复用: {url} -> {rel_path}")
+            else:
+                os.makedirs(os.path.join(self.root, os.path.dirname(rel_path)), exist_ok=True)
+                os.replace(tmp_path, os.path.join(self.root, rel_path))
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blobs (sha256, path, size, stored_at) VALUES (?, ?, ?, ?)",
+                    (sha256, rel_path, size, now)
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO images (url, sha256, fetched_at) VALUES (?, ?, ?)",
+                    (normalize_image_url(url), sha256, now)
+                )
+        return os.path.join(self.root, rel_path)
+
+    def link_article(self, article_url, image_urls):
+        """Record an article's images (in page order); images that are not stored are left out"""
+        with self._lock, self._conn:
+            rows = []
+            for position, url in enumerate(image_urls):
+                url = normalize_image_url(url)
+                row = self._conn.execute("SELECT sha256 FROM images WHERE url = ?", (url,)).fetchone()
+                if row:
+                    rows.append((article_url, position, url, row[0]))
+            self._conn.execute("DELETE FROM article_images WHERE article_url = ?", (article_url,))
+            self._conn.executemany(
+                "INSERT INTO article_images (article_url, position, url, sha256) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def article_images(self, article_url):
+        """Blob paths of an article's images, in page order"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT b.path FROM article_images a JOIN blobs b ON b.sha256 = a.sha256
+                WHERE a.article_url = ? ORDER BY a.position
+            """, (article_url,)).fetchall()
+        return [os.path.join(self.root, row[0]) for row in rows]
+
+    def get_stats(self):
+        with self._lock:
+            urls = self._conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+            blobs, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            articles = self._conn.execute("SELECT COUNT(DISTINCT article_url) FROM article_images").fetchone()[0]
+        return {"urls": urls, "blobs": blobs, "bytes": size, "articles": articles}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
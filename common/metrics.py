@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def _label_text(labels):
+    return ",".join(f"{k}={v}" for k, v in labels)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class RunMetrics:
+    """Per-stage timings and event counters of one crawl run.
+
+    ``stage`` times a block under a stage name plus optional labels (e.g.
+    ``stage("discover", source="topic")``) and ``incr`` counts events such as
+    retries or skips by reason. Other components' ``get_stats`` can be added
+    as sources (``add_source("http", http.get_stats)``); their numbers are
+    included when the run summary is built. The summary can be logged,
+    written as JSON, or written in the Prometheus text format for a
+    node_exporter textfile collector on scheduled runs. A ``StageProfiler``
+    set as ``profiler`` additionally profiles the stages it selects.
+    """
+
+    def __init__(self, name, logger=None):
+        self.name = name
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._sources = {}
+        self.profiler = None
+        self.reset()
+
+    def reset(self):
+        """Start a new run: clear all timings and counters"""
+        with self._lock:
+            self._durations = {}
+            self._counters = {}
+            self.started_at = time.time()
+            self._started = time.monotonic()
+
+    def add_source(self, name, get_stats):
+        self._sources[name] = get_stats
+
+    def observe(self, stage, seconds, **labels):
+        with self._lock:
+            self._durations.setdefault(_key(stage, labels), []).append(seconds)
+
+    @contextmanager
+    def stage(self, stage, **labels):
+        """Time the enclosed block (also when it raises), profiling it if the profiler selects it"""
+        profiling = self.profiler is not None and self.profiler.wants(stage)
+        start = time.perf_counter()
+        try:
+            if profiling:
+                with self.profiler.profile(stage, labels):
+                    yield
+            else:
+                yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def incr(self, name, value=1, **labels):
+        with self._lock:
+            key = _key(name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def count(self, name, **labels):
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def summary(self):
+        """Run summary: stage timings, counters and the sources' stats"""
+        with self._lock:
+            durations = {key: sorted(values) for key, values in self._durations.items()}
+            counters = dict(self._counters)
+            elapsed = time.monotonic() - self._started
+        stages = []
+        for (name, labels), values in sorted(durations.items()):
+            stages.append({
+                "stage": name,
+                "labels": dict(labels),
+                "count": len(values),
+                "total_s": round(sum(values), 3),
+                "mean_ms": round(sum(values) / len(values) * 1000, 1),
+                "p50_ms": round(_percentile(values, 0.5) * 1000, 1),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+            })
+        summary = {
+            "crawler": self.name,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+            "elapsed_s": round(elapsed, 3),
+            "stages": stages,
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(counters.items())],
+        }
+        for source, get_stats in self._sources.items():
+            try:
+                summary[source] = get_stats()
+            except Exception as e:
+                self.logger.warning(f"获取统计信息失败: {source} - {e}")
+        return summary
+
+    def log_summary(self, summary=None):
+        summary = summary or self.summary()
+        self.logger.info(f"运行统计（{self.name}）: 总耗时 {summary['elapsed_s']:.2f} 秒")
+        for s in summary["stages"]:
+            labels = _label_text(s["labels"].items())
+            self.logger.info(
+                f"  阶段 {s['stage']}{f'[{labels}]' if labels else ''}: {s['count']} 次, 共 {s['total_s']:.2f} 秒, "
+                f"p50 {s['p50_ms']} ms, p95 {s['p95_ms']} ms"
+            )
+        for c in summary["counters"]:
+            labels = _label_text(c["labels"].items())
+            self.logger.info(f"  计数 {c['name']}{f'[{labels}]' if labels else ''}: {c['value']}")
+        return summary
+
+    def write_json(self, path, summary=None):
+        """Write the run summary as JSON; returns the summary"""
+        summary = summary or self.summary()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        self.logger.info(f"运行统计已保存: {path}")
+        return summary
+
+    def write_prometheus(self, path, summary=None, prefix="news_crawler"):
+        """Write the run summary in the Prometheus text exposition format (replaced atomically)"""
+        summary = summary or self.summary()
+        crawler = ("crawler", self.name)
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{str(v)}"' for k, v in (crawler,) + tuple(labels))
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        metric("run_start_timestamp_seconds", "gauge", "Start time of the last run.", [((), round(self.started_at, 3))])
+        metric("run_duration_seconds", "gauge", "Wall time of the last run.", [((), summary["elapsed_s"])])
+        stage_samples = [(tuple(s["labels"].items()) + (("stage", s["stage"]),), s) for s in summary["stages"]]
+        metric("stage_seconds_total", "counter", "Time spent per stage.",
+               [(labels, s["total_s"]) for labels, s in stage_samples])
+        metric("stage_calls_total", "counter", "Calls per stage.",
+               [(labels, s["count"]) for labels, s in stage_samples])
+        metric("stage_p95_seconds", "gauge", "95th percentile duration per stage.",
+               [(labels, round(s["p95_ms"] / 1000, 4)) for labels, s in stage_samples])
+        counters = {}
+        for c in summary["counters"]:
+            counters.setdefault(re.sub(r"[^a-zA-Z0-9_]", "_", c["name"]), []).append((tuple(c["labels"].items()), c["value"]))
+        for name, samples in sorted(counters.items()):
+            metric(f"{name}_total", "counter", f"Count of {name} events.", samples)
+        for source in self._sources:
+            stats = summary.get(source) or {}
+            for key, value in sorted(stats.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metric(f"{source}_{re.sub(r'[^a-zA-Z0-9_]', '_', key)}", "gauge", f"{source} {key} of the last run.", [((), value)])
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        self.logger.info(f"Prometheus指标已保存: {path}")
+        return summary
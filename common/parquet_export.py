@@ -0,0 +1,128 @@
+import glob
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+
+JST = timezone(timedelta(hours=9))
+
+_DATE_PATTERNS = (
+    re.compile(r"(?P<year>\d{4})年(?P<month>\d{1,2})月(?P<day>\d{1,2})日\s*(?:(?P<hour>\d{1,2})時(?:(?P<minute>\d{1,2})分)?)?"),
+    re.compile(r"(?P<year>\d{4})[/.-](?P<month>\d{1,2})[/.-](?P<day>\d{1,2})(?:[\sT]+(?P<hour>\d{1,2}):(?P<minute>\d{2}))?"),
+)
+
+
+def article_schema():
+    """Arrow schema shared by both crawlers' Parquet output"""
+    _require_pyarrow()
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("source", dictionary_string),
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("publish_time", pa.timestamp("s", tz="Asia/Tokyo")),
+        ("publish_time_raw", pa.string()),
+        ("content", pa.string()),
+        ("category", dictionary_string),
+        ("topic", dictionary_string),
+        ("image_urls", pa.list_(pa.string())),
+        ("local_image_paths", pa.list_(pa.string())),
+        ("scraped_at", pa.timestamp("s", tz="Asia/Tokyo")),
+    ])
+
+
+def parse_publish_time(text):
+    """Parse the publish time strings both sites produce (ISO 8601, 2024年5月1日 10時00分, 2024/05/01 10:00); None if unknown"""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=JST)
+    except ValueError:
+        pass
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            parts = {key: int(value) for key, value in match.groupdict().items() if value}
+            try:
+                return datetime(parts["year"], parts["month"], parts["day"],
+                                parts.get("hour", 0), parts.get("minute", 0), tzinfo=JST)
+            except ValueError:
+                return None
+    return None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+
+
+class ParquetSink:
+    """Batched Parquet writer for article records.
+
+    Records (dicts matching ``article_schema``) are buffered and every
+    ``batch_size`` of them is written as one row group in its own part file
+    under the ``path`` directory, so each part is a complete Parquet file even
+    if the crawl is killed; readers load the directory as one dataset
+    (``pyarrow.parquet.read_table(path, columns=[...])``). Reopening an existing
+    directory continues the part numbering, which is how a resumed crawl keeps
+    writing to the same dataset. Up to ``batch_size - 1`` buffered records are
+    lost on a hard kill; the JSONL sink is the durable per-record stream.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, path, batch_size=500, compression="zstd", logger=None):
+        _require_pyarrow()
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.compression = compression
+        self.logger = logger or logging.getLogger(__name__)
+        self.schema = article_schema()
+        self._buffer = []
+        os.makedirs(path, exist_ok=True)
+        parts = sorted(glob.glob(os.path.join(path, "part-*.parquet")))
+        self._next_part = len(parts)
+        self.count = sum(pq.ParquetFile(part).metadata.num_rows for part in parts)
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        """Buffer one record, writing a row group once batch_size records are buffered"""
+        with self._lock:
+            self._buffer.append(record)
+            self.count += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+            return self.count
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        table = pa.Table.from_pylist(self._buffer, schema=self.schema)
+        part_name = f"part-{self._next_part:05d}.parquet"
+        part_path = os.path.join(self.path, part_name)
+        tmp_path = os.path.join(self.path, f"_{part_name}.tmp")  # Underscore-prefixed files are skipped by dataset readers
+        pq.write_table(table, tmp_path, row_group_size=len(self._buffer), compression=self.compression,
+                       use_dictionary=["source", "category", "topic"])
+        os.replace(tmp_path, part_path)
+        self.logger.debug(f"写入Parquet分片: {part_path}（{len(self._buffer)} 行）")
+        self._next_part += 1
+        self._buffer = []
+
+    def close(self):
+        with self._lock:
+            self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+class _HostBucket:
+    """Token bucket state for a single host"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+
+class AdaptiveRateLimiter:
+    """Per-host token-bucket rate limiter with AIMD adjustment.
+
+    Each host gets its own bucket. Successful responses raise the host's rate
+    additively up to ``max_rate``; 429/503 responses or a detected block page cut
+    it multiplicatively down to ``min_rate``. A ``Retry-After`` value pauses the
+    host until it expires.
+    """
+
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=10.0, increase_step=0.1,
+                 decrease_factor=0.5, burst=2, max_retry_after=300, logger=None):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.burst = burst
+        self.max_retry_after = max_retry_after
+        self.logger = logger or logging.getLogger(__name__)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url_or_host):
+        return urlparse(url_or_host).netloc or url_or_host
+
+    def _bucket(self, url_or_host):
+        host = self._host(url_or_host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = _HostBucket(self.initial_rate, self.burst)
+            return bucket
+
+    def set_initial_rate(self, rate):
+        """Change the starting rate for hosts that have not been contacted yet"""
+        self.initial_rate = min(max(rate, self.min_rate), self.max_rate)
+
+    def acquire(self, url_or_host):
+        """Block until the host has a free token (and any Retry-After pause has expired)"""
+        bucket = self._bucket(url_or_host)
+        waited = 0.0
+        while True:
+            with bucket.lock:
+                now = time.monotonic()
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+                if now < bucket.blocked_until:
+                    delay = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    bucket.requests += 1
+                    bucket.waited += waited
+                    return waited
+                else:
+                    delay = (1 - bucket.tokens) / bucket.rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self, url_or_host):
+        """Additive increase after a healthy response"""
+        bucket = self._bucket(url_or_host)
+        with bucket.lock:
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase_step)
+
+    def on_throttle(self, url_or_host, retry_after=None):
+        """Multiplicative decrease after 429/503 or a block page, honoring Retry-After"""
+        bucket = self._bucket(url_or_host)
+        with bucket.lock:
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+            bucket.tokens = 0
+            bucket.throttled += 1
+            if retry_after:
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + min(retry_after, self.max_retry_after))
+            rate = bucket.rate
+        self.logger.warning(
+            f"{self._host(url_or_host)} 触发限流，速率降至 {rate:.2f} 次/秒"
+            + (f"，按 Retry-After 暂停 {retry_after:.0f} 秒" if retry_after else "")
+        )
+
+    def parse_retry_after(self, value):
+        """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def get_stats(self):
+        """Current rate and counters per host"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            host: {
+                "rate": round(bucket.rate, 3),
+                "requests": bucket.requests,
+                "throttled": bucket.throttled,
+                "waited_seconds": round(bucket.waited, 3),
+            }
+            for host, bucket in buckets.items()
+        }
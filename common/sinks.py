@@ -0,0 +1,165 @@
+import abc
+import csv
+import json
+import logging
+import os
+import threading
+import time
+
+
+class _StreamingSink(abc.ABC):
+    """Append-only record writer that flushes every record and fsyncs periodically.
+
+    Every ``write`` is flushed to the OS so other processes can tail the file
+    while the crawl runs; ``os.fsync`` is called after ``fsync_every`` records
+    or ``fsync_interval`` seconds, whichever comes first, and on ``close``.
+    Reopening an existing file appends to it, which is how a resumed crawl
+    keeps writing to the same output.
+    """
+
+    extension = None
+
+    def __init__(self, path, fsync_every=20, fsync_interval=5.0, logger=None):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        existed = os.path.exists(path) and os.path.getsize(path) > 0
+        self.count = self._count_existing() if existed else 0
+        self._file = self._open(existed)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self, existed):
+        return open(self.path, "a", encoding="utf-8", newline="")
+
+    @abc.abstractmethod
+    def _count_existing(self):
+        """Number of records already in the file being appended to"""
+
+    @abc.abstractmethod
+    def _write_record(self, record):
+        """Write one record to the open file"""
+
+    def write(self, record):
+        """Append one record; returns its 1-based position in the file"""
+        with self._lock:
+            self.count += 1
+            self._write_record(record)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+            return self.count
+
+    def _sync(self):
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            self.logger.warning(f"fsync失败: {self.path} - {e}")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            self._sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlSink(_StreamingSink):
+    """One JSON object per line"""
+
+    extension = "jsonl"
+
+    def _count_existing(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _write_record(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CsvSink(_StreamingSink):
+    """Incremental CSV writer; ``row_builder(record, index)`` maps a record to a row dict.
+
+    New files start with a UTF-8 BOM and the header row, matching the batch CSV
+    exports, so the output opens the same way in spreadsheet tools.
+    """
+
+    extension = "csv"
+
+    def __init__(self, path, fieldnames, row_builder=None, **kwargs):
+        self.fieldnames = list(fieldnames)
+        self.row_builder = row_builder or (lambda record, index: record)
+        super().__init__(path, **kwargs)
+
+    def _open(self, existed):
+        f = open(self.path, "a", encoding="utf-8" if existed else "utf-8-sig", newline="")
+        self._writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore")
+        if not existed:
+            self._writer.writeheader()
+        return f
+
+    def _count_existing(self):
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+    def _write_record(self, record):
+        self._writer.writerow(self.row_builder(record, self.count))
+
+
+class _MappedSink:
+    """Adapts a sink to a different record layout through ``record_builder(record)``"""
+
+    def __init__(self, sink, record_builder):
+        self.sink = sink
+        self.record_builder = record_builder
+
+    @property
+    def path(self):
+        return self.sink.path
+
+    @property
+    def count(self):
+        return self.sink.count
+
+    def write(self, record):
+        return self.sink.write(self.record_builder(record))
+
+    def close(self):
+        self.sink.close()
+
+
+def open_sinks(formats, paths, csv_fieldnames=None, csv_row_builder=None, fsync_every=20, logger=None,
+               article_record_builder=None, parquet_batch_size=500, sqlite_batch_size=100):
+    """Open one sink per requested format ("jsonl" / "csv" / "parquet" / "sqlite") at the given paths
+
+    Parquet and SQLite records are built with ``article_record_builder`` (see
+    ``common.parquet_export.article_schema``); Parquet needs pyarrow installed.
+    """
+    sinks = []
+    for fmt in formats:
+        if fmt == "jsonl":
+            sinks.append(JsonlSink(paths[fmt], fsync_every=fsync_every, logger=logger))
+        elif fmt == "csv":
+            sinks.append(CsvSink(paths[fmt], csv_fieldnames, csv_row_builder, fsync_every=fsync_every, logger=logger))
+        elif fmt == "parquet":
+            from .parquet_export import ParquetSink
+            sinks.append(_MappedSink(ParquetSink(paths[fmt], batch_size=parquet_batch_size, logger=logger), article_record_builder))
+        elif fmt == "sqlite":
+            from .article_store import ArticleStore
+            sinks.append(_MappedSink(ArticleStore(paths[fmt], batch_size=sqlite_batch_size, logger=logger), article_record_builder))
+        else:
+            raise ValueError(f"unknown stream format: {fmt}")
+    return sinks
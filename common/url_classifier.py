@@ -0,0 +1,67 @@
+import re
+from urllib.parse import urljoin
+
+
+def any_of(substrings, flags=re.IGNORECASE):
+    """One compiled alternation matching any of the literal substrings (None for an empty list)"""
+    escaped = [re.escape(s) for s in substrings if s]
+    return re.compile("|".join(escaped), flags) if escaped else None
+
+
+class UrlClassifier:
+    """Canonicalizes and classifies harvested links in one call with precompiled patterns.
+
+    A link is first resolved against ``base_url`` (when relative) and matched
+    against ``canonical``: its ``url`` group (or the whole match) is the
+    canonical URL, and no match means the link is not crawlable at all.
+    ``skip`` marks canonical URLs that are never worth recording (anchors,
+    ``javascript:``, video pages); the rest are news pages when they match
+    ``accept`` and do not contain ``exclude``.
+
+    Patterns may be strings or compiled regexes; ``any_of`` builds the
+    alternation for a list of literal substrings.
+    """
+
+    def __init__(self, canonical, accept, exclude=None, skip=None):
+        self.canonical = re.compile(canonical)
+        self.accept = re.compile(accept)
+        self.exclude = re.compile(exclude) if exclude is not None else None
+        self.skip = re.compile(skip) if skip is not None else None
+        self._has_url_group = "url" in self.canonical.groupindex
+
+    def canonicalize(self, href, base_url=None):
+        """Canonical URL of a link, or None if it cannot be crawled"""
+        if base_url and not href.startswith("http"):
+            href = urljoin(base_url, href)
+        match = self.canonical.match(href)
+        if not match:
+            return None
+        url = match.group("url") if self._has_url_group else match.group(0)
+        if not url or (self.skip is not None and self.skip.search(url)):
+            return None
+        return url
+
+    def is_news(self, url):
+        """Whether an already canonical URL is a news page"""
+        if self.exclude is not None and self.exclude.search(url):
+            return False
+        return self.accept.search(url) is not None
+
+    def classify(self, href, base_url=None):
+        """(canonical URL or None, is news page) for a raw link"""
+        url = self.canonicalize(href, base_url)
+        return url, url is not None and self.is_news(url)
+
+
+class KeywordMatcher:
+    """Substring test against a keyword list, compiled into a single regex scan"""
+
+    def __init__(self, keywords, lowercase_text=True):
+        self.keywords = list(keywords)
+        self.lowercase_text = lowercase_text
+        self._pattern = any_of(self.keywords, flags=0)
+
+    def matches(self, text):
+        if self._pattern is None or not text:
+            return False
+        return self._pattern.search(text.lower() if self.lowercase_text else text) is not None
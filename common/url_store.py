@@ -0,0 +1,74 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+class UrlStore:
+    """Persistent record of fetched article URLs shared across runs.
+
+    Every canonical article URL is stored with its last fetch time, outcome and
+    a hash of its extracted text. Crawlers consult it before scheduling detail
+    fetches so an incremental run only fetches unseen articles, or ones older
+    than a refresh age.
+    """
+
+    def __init__(self, db_path="./saves/url_store.db", logger=None):
+        self.db_path = db_path
+        self.logger = logger or logging.getLogger(__name__)
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fetched_urls (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                status TEXT,
+                content_hash TEXT,
+                first_fetched_at REAL,
+                fetched_at REAL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(text):
+        """Stable hash of an article's extracted text"""
+        return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+    def should_fetch(self, url, refresh_age=None):
+        """True if the URL was never fetched, or was fetched more than refresh_age seconds ago"""
+        with self._lock:
+            row = self._conn.execute("SELECT fetched_at FROM fetched_urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return True
+        return refresh_age is not None and time.time() - row[0] >= refresh_age
+
+    def mark_fetched(self, url, source=None, status="ok", content_hash=None):
+        """Record a fetch outcome for a canonical URL"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO fetched_urls (url, source, status, content_hash, first_fetched_at, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    source = COALESCE(excluded.source, source),
+                    status = excluded.status,
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    fetched_at = excluded.fetched_at
+            """, (url, source, status, content_hash, now, now))
+            self._conn.commit()
+
+    def count(self, source=None):
+        """Number of recorded URLs (optionally for one source)"""
+        with self._lock:
+            if source is None:
+                return self._conn.execute("SELECT COUNT(*) FROM fetched_urls").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM fetched_urls WHERE source = ?", (source,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
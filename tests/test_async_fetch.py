@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "asahi"))
+from common.async_fetch import AsyncFetchEngine
+from common.checkpoint import CrawlCheckpoint
+
+URLS = [f"https://www.asahi.com/articles/ASN{i:04d}.html" for i in range(4)]
+
+
+def slow_first(url):
+    # The first item finishes last, so the later ones are done before the cut-off is known
+    time.sleep(0.3 if url == URLS[0] else 0.01)
+    return url
+
+
+def test_engine_consumes_only_results_before_the_cut_off():
+    consumed = []
+
+    def consume(item, result):
+        consumed.append(item)
+        return result
+
+    results = AsyncFetchEngine(per_host_limit=4).run(URLS, slow_first, max_results=1, consume=consume)
+
+    assert results == [(URLS[0], URLS[0])]
+    assert consumed == [URLS[0]]
+
+
+def test_asahi_async_outputs_match_returned_items(tmp_path, monkeypatch):
+    from asahi import AsahiCrawler
+
+    monkeypatch.chdir(tmp_path)
+    crawler = AsahiCrawler(
+        fetch_mode="async",
+        per_host_concurrency=4,
+        stream_formats=["jsonl"],
+        stream_dir=str(tmp_path / "stream"),
+        url_store_path=str(tmp_path / "url_store.db"),
+        checkpoint_path=str(tmp_path / "checkpoint.json"),
+        keep_results=False,
+    )
+
+    def fetch_news_item(detail_url, progress=""):
+        slow_first(detail_url)
+        return {"标题": detail_url, "发布时间": "2024-01-01", "正文": "body", "主题": "", "图片数量": 0,
+                "图片链接": [], "原文链接": detail_url}, "ok"
+
+    monkeypatch.setattr(crawler, "fetch_news_item", fetch_news_item)
+    crawler.checkpoint = CrawlCheckpoint(crawler.config["checkpoint_path"])
+    crawler.open_stream_sinks()
+    try:
+        news_items, visited_urls = crawler.process_links_async(
+            [{"href": url} for url in URLS], "https://www.asahi.com/", set(), max_news=1
+        )
+        stream_path = crawler.sinks[0].path
+    finally:
+        crawler.close_stream_sinks()
+
+    returned = [item["原文链接"] for item in news_items]
+    assert returned == [URLS[0]]
+    with open(stream_path, "r", encoding="utf-8") as f:
+        assert [json.loads(line)["原文链接"] for line in f] == returned
+    assert crawler.checkpoint.completed == set(returned)
+    assert crawler.checkpoint.accepted == len(returned)
+    assert [url for url in URLS if not crawler.url_store.should_fetch(url)] == returned
+    assert set(returned) <= visited_urls and not set(URLS[1:]) & visited_urls
@@ -1,24 +1,50 @@
 import re
 from urllib.parse import urljoin
 import time
-import random
 from typing import List, Dict, Optional, Set
 import csv
 from datetime import datetime, timedelta
 import json
 import logging
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-import requests
+from selenium.common.exceptions import TimeoutException
 import os
+import sys
 from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.http_client import HttpClient
+from common.http_cache import HttpCache
+from common.url_store import UrlStore
+from common.dedup import make_url_filter, load_url_filter
+from common.checkpoint import CrawlCheckpoint
+from common.sinks import open_sinks
+from common.parquet_export import ParquetSink, parse_publish_time, JST
+from common.article_store import ArticleStore
+from common.html_parser import make_soup, make_link_soup
+from common.url_classifier import UrlClassifier, KeywordMatcher
+from common.image_downloader import ImageDownloader, image_extension
+from common.image_store import ImageStore
+from common.async_fetch import AsyncFetchEngine
+from common.driver_pool import WebDriverPool
+from common.metrics import RunMetrics
+from common.profiling import StageProfiler
 
 class YahooJapanNewsScraper:
-    def __init__(self, log_file=None, download_images=False, image_save_dir="./saves/pic"):
+    CSV_FIELDNAMES = ['序号', '标题', '发布时间', '正文', '分类', '图片数量', '图片链接', '本地图片路径', '原文链接', '来源']
+
+    def __init__(self, log_file=None, download_images=False, image_save_dir="./saves/pic", pool_size=10,
+                 driver_pool=None, driver_max_pages=50,
+                 http_cache_dir=None, http_cache_ttl=600, http_cache_max_mb=500,
+                 url_store_path="./saves/url_store.db",
+                 dedup_backend="exact", dedup_capacity=1_000_000, dedup_error_rate=0.001, dedup_path=None,
+                 checkpoint_path="./saves/checkpoints/yahoo_checkpoint.json", checkpoint_interval=30,
+                 stream_formats=None, stream_dir="./saves/stream", stream_fsync_every=20, keep_results=True,
+                 parquet_batch_size=500, sqlite_path="./saves/articles.db", sqlite_batch_size=100,
+                 html_parser="auto", image_workers=4, image_store=True, metrics_dir="./logs", prometheus_path=None,
+                 profile_stages=None, profile_every=1, profile_top=25):
         self.base_url = "https://news.yahoo.co.jp"
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -36,13 +62,23 @@ class YahooJapanNewsScraper:
             '広告', 'PR', 'スポンサー', 'プロモーション',
             'adserver', 'doubleclick', 'amazon-adsystem'
         ]
-        self.visited_urls = set()
+        self.ad_matcher = KeywordMatcher(self.ad_keywords)  # 广告关键词合并为一个预编译正则
+        self.html_parser = html_parser  # HTML解析后端："auto"（已安装lxml时使用lxml）、"lxml" 或 "html.parser"
+        self.max_page_workers = 4  # 文章分页并发获取的线程数
+        self.scroll_wait_timeout = 3  # 滚动/点击后等待新内容的最长时间（秒）
+        self.dom_quiet_ms = 500  # DOM连续无变化多少毫秒视为加载完成
         self.article_pattern = re.compile(
             r'^https?://news\.yahoo\.co\.jp/articles/[a-z0-9]+$', re.IGNORECASE
         )
         self.resource_pattern = re.compile(
             r'/images/|/videos/|/photos/|/photo/|/gallery/|/pickup/', re.IGNORECASE
         )
+        # 一次调用完成URL清洗与分类（预编译正则，调用方无需先清洗再验证）
+        self.url_classifier = UrlClassifier(
+            canonical=r'^https://news\.yahoo\.co\.jp/(?:articles|expert/articles)/[^/?#]+',
+            accept=self.article_pattern,
+            exclude=self.resource_pattern
+        )
         self.topics = {
             "business": "经济",
             "entertainment": "娱乐",
@@ -68,6 +104,61 @@ class YahooJapanNewsScraper:
 
         self.logger = self._setup_logger(log_file)
 
+        # 所有HTTP请求共用的连接池客户端（按主机保持长连接，轮换User-Agent）
+        self.http = HttpClient(
+            user_agents=self.user_agents + [headers['User-Agent'] for headers in self.headers_list],
+            pool_size=max(pool_size, self.max_page_workers),
+            timeout=10,
+            default_headers={
+                'Accept-Language': 'ja,en-US;q=0.9,en;q=0.8',
+                'Referer': self.base_url
+            },
+            # 磁盘响应缓存（默认关闭，设置http_cache_dir开启）：TTL内直接读取，过期后发送条件请求
+            cache=HttpCache(
+                http_cache_dir,
+                ttl=http_cache_ttl,
+                max_size_bytes=http_cache_max_mb * 1024 * 1024,
+                logger=self.logger
+            ) if http_cache_dir else None,
+            logger=self.logger
+        )
+        # 图片下载：请求前校验、流式写入临时文件后重命名，最多 image_workers 张并发
+        self.image_downloader = ImageDownloader(self.http, max_workers=image_workers, logger=self.logger)
+        # 图片按内容哈希只保存一份（image_save_dir/store），已存储的图片跨文章、跨运行复用，不再请求
+        self.image_store = ImageStore(os.path.join(image_save_dir, "store"), logger=self.logger) if download_images and image_store else None
+        # 已访问URL去重：exact为精确集合，bloom为固定内存的布隆过滤器（有极低误判率）
+        # dedup_path 保存的记录只在断点续爬（resume=True）时加载；跨运行跳过已爬取文章由URL库（incremental）负责
+        self.dedup_path = dedup_path
+        self.visited_urls = make_url_filter(dedup_backend, dedup_capacity, dedup_error_rate)
+        # 断点续爬：定期保存链接发现进度、已完成URL及已获取文章（checkpoint_path为None时关闭）
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint = None
+        # 流式输出：文章验证通过后立即追加写入 jsonl/csv/parquet/sqlite，keep_results=False 时不在内存中保留结果
+        self.stream_formats = list(stream_formats or [])
+        self.stream_dir = stream_dir
+        self.stream_fsync_every = stream_fsync_every
+        self.keep_results = keep_results
+        self.parquet_batch_size = parquet_batch_size
+        self.sqlite_path = sqlite_path  # SQLite文章库（按URL去重更新，带全文索引）
+        self.sqlite_batch_size = sqlite_batch_size
+        self.sinks = []
+        # 跨运行持久化的已爬取URL记录（url_store_path为None时关闭）
+        self.url_store = UrlStore(url_store_path, logger=self.logger) if url_store_path else None
+        # 本次运行各阶段耗时与计数（export_metrics 写出JSON运行摘要，设置 prometheus_path 时同时写出Prometheus文本格式）
+        self.metrics = RunMetrics("yahoo", logger=self.logger)
+        self.metrics.add_source("http", self.http.get_stats)
+        self.metrics.add_source("images", self.image_downloader.get_stats)
+        self.metrics_dir = metrics_dir
+        self.prometheus_path = prometheus_path
+        # 性能分析（默认关闭）：对选定阶段（如 ["parse", "extract"]，"all" 表示全部）每 profile_every 次调用做一次cProfile
+        self.profile_stages = profile_stages
+        self.profile_every = profile_every
+        self.profile_top = profile_top
+        # 分类页与搜索页共用的浏览器池（可与其他爬虫共享；外部传入的池由调用方关闭）
+        self._owns_driver_pool = driver_pool is None
+        self.driver_pool = driver_pool or WebDriverPool(max_pages_per_driver=driver_max_pages, logger=self.logger)
+
     def _setup_logger(self, log_file=None):
         logger = logging.getLogger('YahooNewsScraper')
         logger.setLevel(logging.INFO)
@@ -86,32 +177,23 @@ class YahooJapanNewsScraper:
         """Download an image and return its local path."""
         if not self.download_images:
             return None
-        try:
-            # Generate a unique filename using article ID and index
-            parsed_url = urlparse(img_url)
-            file_ext = os.path.splitext(parsed_url.path)[1] or '.jpg'
-            filename = f"{article_id}_{index}{file_ext}"
-            local_path = os.path.join(self.image_save_dir, filename)
-            
-            # Download the image
-            headers = self.get_random_headers()
-            response = requests.get(img_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # Save the image
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-            self.logger.info(f"Downloaded image: {img_url} to {local_path}")
-            return local_path
-        except Exception as e:
-            self.logger.error(f"Failed to download image {img_url}: {e}")
-            return None
+        if self.image_store is not None:
+            return self.image_downloader.download(img_url, store=self.image_store)
+        return self.image_downloader.download(img_url, self._image_path(img_url, article_id, index))
+
+    def _image_path(self, img_url: str, article_id: str, index: int) -> str:
+        """Unique local filename from article ID and index"""
+        return os.path.join(self.image_save_dir, f"{article_id}_{index}{image_extension(img_url, '.jpg')}")
 
     def scrape_article(self, url: str) -> Optional[Dict]:
         """Crawl a single article's details, optionally downloading images."""
         try:
             self.logger.debug(f"开始爬取文章: {url}")
             article_data = self.extract_article(url)
+            if article_data is None:
+                # 获取失败不是最终结果：返回None，不写入URL库，以便下次运行重试
+                self.logger.warning(f"文章获取失败，跳过: {url}")
+                return None
             
             # Generate a unique article ID (e.g., from URL)
             article_id = url.split('/')[-1]
@@ -119,10 +201,13 @@ class YahooJapanNewsScraper:
             # Download images if enabled
             local_image_paths = []
             if self.download_images:
-                for idx, img_url in enumerate(article_data['images']):
-                    local_path = self.download_image(img_url, article_id, idx)
-                    if local_path:
-                        local_image_paths.append(local_path)
+                # 同一文章的图片并发下载，结果保持原顺序
+                jobs = [(img_url, None if self.image_store else self._image_path(img_url, article_id, idx))
+                        for idx, img_url in enumerate(article_data['images'])]
+                with self.metrics.stage("images"):
+                    local_image_paths = [path for path in self.image_downloader.download_many(jobs, self.image_store) if path]
+                    if self.image_store is not None:
+                        self.image_store.link_article(url, article_data['images'])
             
             # Add article information
             article = {
@@ -155,148 +240,387 @@ class YahooJapanNewsScraper:
         try:
             self.logger.info(f"开始保存 {len(articles)} 篇文章到 {filename}")
             with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=[
-                    '序号', '标题', '发布时间', '正文', '分类', '图片数量', '图片链接', '本地图片路径', '原文链接', '来源'
-                ])
+                writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDNAMES)
                 writer.writeheader()
                 
                 for idx, article in enumerate(articles, 1):
-                    image_links = ','.join(article.get('images', []))
-                    local_image_paths = ','.join(article.get('local_images', []))  # New field
-                    writer.writerow({
-                        '序号': idx,
-                        '标题': article['title'],
-                        '发布时间': article['publish_time'],
-                        '正文': '\n'.join(article['content']),
-                        '分类': article.get('category', ''),
-                        '图片数量': len(article.get('images', [])),
-                        '图片链接': image_links,
-                        '本地图片路径': local_image_paths,  # New field
-                        '原文链接': article['url'],
-                        '来源': article.get('source', 'Yahoo Japan')
-                    })
+                    writer.writerow(self._csv_row(article, idx))
             
             self.logger.info(f"成功保存 {len(articles)} 篇文章到 {filename}")
         except Exception as e:
             self.logger.error(f"CSV保存失败: {e}")
 
     # Other methods (unchanged, omitted for brevity)
-    def get_random_headers(self):
-        return {
-            'User-Agent': random.choice(self.user_agents),
-            'Accept-Language': 'ja,en-US;q=0.9,en;q=0.8',
-            'Referer': self.base_url
-        }
-
     def is_valid_news_url(self, url):
-        cleaned_url = self.clean_article_url(url)
-        if not cleaned_url:
-            return False
-        if not self.article_pattern.match(cleaned_url):
-            return False
-        if self.resource_pattern.search(cleaned_url):
-            return False
-        return True
+        return self.url_classifier.classify(url)[1]
 
     def clean_article_url(self, url: str) -> Optional[str]:
-        pattern = r'^(https://news\.yahoo\.co\.jp/(?:articles|expert/articles)/[^/?#]+)'
-        match = re.match(pattern, url)
-        if match:
-            return match.group(1)
-        return None
+        return self.url_classifier.canonicalize(url)
     
     def scrape_news(self, 
                     max_articles=None,        
                     max_per_categories=None,           
                     max_per_topics=None,
-                    max_links_per_keyword=None):   
-        """整合多来源的爬取入口（含分类信息）"""
+                    max_links_per_keyword=None,
+                    fetch_mode="sequential",
+                    per_host_concurrency=4,
+                    incremental=False,
+                    refresh_age_hours=None,
+                    resume=False):   
+        """整合多来源的爬取入口（含分类信息）
+
+        :param fetch_mode: 详情页爬取方式，"sequential"（逐篇）或 "async"（asyncio并发）
+        :param per_host_concurrency: async模式下每个主机的最大并发请求数
+        :param incremental: 增量模式，只爬取以往运行中未爬取过的文章
+        :param refresh_age_hours: 增量模式下，超过该时长（小时）的文章重新爬取（None表示不重新爬取）
+        :param resume: 从上次中断的断点继续（跳过已完成的分类/话题/关键词及已爬取的文章）
+        """
+        refresh_age = refresh_age_hours * 3600 if refresh_age_hours is not None else None
+        self.metrics.reset()
+        self.metrics.profiler = None
+        if self.profile_stages:
+            self.metrics.profiler = StageProfiler(
+                "yahoo", self.profile_stages, every=self.profile_every, top=self.profile_top, logger=self.logger
+            )
         self.logger.info("开始爬取新闻...")
         all_articles = []
         all_links_with_category = []  # 存储带分类信息的链接字典
 
-        # 1. 主页分类爬取（带分类信息）
-        self.logger.info("正在从主页分类获取新闻...")
-        category_links = self.get_news_links_from_categories(max_links_per_category=max_per_categories)
-        all_links_with_category.extend(category_links)
-        self.logger.info(f"从主页分类获取到 {len(category_links)} 条链接")
+        self.checkpoint = None
+        resumed = False
+        if self.checkpoint_path:
+            self.checkpoint = CrawlCheckpoint(self.checkpoint_path, interval=self.checkpoint_interval, logger=self.logger)
+            resumed = resume and self.checkpoint.load()
+        if resume:
+            saved_visited_urls = self._load_saved_visited_urls()
+            if saved_visited_urls is not None:
+                self.visited_urls = saved_visited_urls
+        if resumed:
+            all_articles = self.checkpoint.results
+            self.visited_urls.update(self.checkpoint.completed)
+        self._open_stream_sinks(resumed)
+        try:
+            # 已接受的文章数，由断点记录（keep_results=False 时结果只存在于流式输出文件中）
+            accepted = self.checkpoint.accepted if resumed else len(all_articles)
 
-        # 2. 话题页面爬取（带二级分类信息）
-        self.logger.info("正在从话题页面获取新闻...")
-        topic_links = self.get_links_from_topics(max_per_topics=max_per_topics)
-        all_links_with_category.extend(topic_links)
-        self.logger.info(f"从话题页面获取到 {len(topic_links)} 条链接")
+            # 1. 主页分类爬取（带分类信息）
+            self.logger.info("正在从主页分类获取新闻...")
+            category_links = self.get_news_links_from_categories(max_links_per_category=max_per_categories)
+            all_links_with_category.extend(category_links)
+            self.logger.info(f"从主页分类获取到 {len(category_links)} 条链接")
 
+            # 2. 话题页面爬取（带二级分类信息）
+            self.logger.info("正在从话题页面获取新闻...")
+            topic_links = self.get_links_from_topics(max_per_topics=max_per_topics)
+            all_links_with_category.extend(topic_links)
+            self.logger.info(f"从话题页面获取到 {len(topic_links)} 条链接")
 
-        # 3. 关键词搜索爬取（带关键词信息）
-        self.logger.info("正在从关键词搜索获取新闻...")
-        search_links = self.get_news_links_from_search(max_links_per_keyword=max_links_per_keyword)
-        all_links_with_category.extend(search_links)
-        self.logger.info(f"从关键词搜索获取到 {len(search_links)} 条链接")
 
-        # 提取所有唯一URL，并保留分类信息
-        unique_urls = []
-        url_category_map = {}  # 存储URL对应的分类信息
+            # 3. 关键词搜索爬取（带关键词信息）
+            self.logger.info("正在从关键词搜索获取新闻...")
+            search_links = self.get_news_links_from_search(max_links_per_keyword=max_links_per_keyword)
+            all_links_with_category.extend(search_links)
+            self.logger.info(f"从关键词搜索获取到 {len(search_links)} 条链接")
+            if self._owns_driver_pool:
+                self.driver_pool.close()  # 链接发现阶段结束，释放浏览器
 
-        for link_info in all_links_with_category:
-            url = link_info["url"]
-            category_info = {k: v for k, v in link_info.items() if k != "url"}  # 提取分类字段
+            # 提取所有唯一URL，并保留分类信息
+            unique_urls = []
+            url_category_map = {}  # 存储URL对应的分类信息
+
+            for link_info in all_links_with_category:
+                url = link_info["url"]
+                category_info = {k: v for k, v in link_info.items() if k != "url"}  # 提取分类字段
             
-            if url not in url_category_map:
-                url_category_map[url] = category_info
-                unique_urls.append(url)
+                if url not in url_category_map:
+                    url_category_map[url] = category_info
+                    unique_urls.append(url)
+
+            self.logger.info(f"去重后得到 {len(unique_urls)} 个唯一URL，准备爬取详情...")
+            if self.checkpoint is not None:
+                self.checkpoint.set_frontier([
+                    dict(url_category_map[url], url=url) for url in unique_urls
+                    if self.clean_article_url(url) not in self.visited_urls
+                ])
+                self.checkpoint.save()
+
+            if fetch_mode == "async":
+                remaining = max_articles - accepted if max_articles else None
+                if remaining is None or remaining > 0:
+                    new_articles = self._scrape_articles_async(unique_urls, url_category_map, remaining, per_host_concurrency,
+                                                               incremental, refresh_age)
+                    accepted += len(new_articles)
+                    if self.keep_results:
+                        all_articles += new_articles
+                self.logger.info(f"爬取完成，共获取 {accepted} 篇带分类的文章")
+                self.save_visited_urls()
+                self._close_stream_sinks()
+                self._finish_checkpoint()
+                return all_articles
+
+            for idx, url in enumerate(unique_urls, 1):
+                if max_articles and accepted >= max_articles:
+                    self.logger.info(f"达到最大爬取数量 {max_articles}，停止爬取")
+                    break
+                cleaned_url, is_news = self.url_classifier.classify(url)
+                if not is_news:
+                    self.metrics.incr("skipped", reason="not_news")
+                    self.logger.debug(f"无效URL: {url}")
+                    continue
+
+                if cleaned_url in self.visited_urls:
+                    self.metrics.incr("skipped", reason="duplicate")
+                    self.logger.debug(f"已访问过的URL: {cleaned_url}")
+                    continue
+                if incremental and self.url_store and not self.url_store.should_fetch(cleaned_url, refresh_age):
+                    self.metrics.incr("skipped", reason="incremental")
+                    self.logger.debug(f"增量模式跳过已爬取URL: {cleaned_url}")
+                    continue
+                self.visited_urls.add(cleaned_url)
+
+                # 爬取文章详情并注入分类信息
+                article = self.scrape_article_with_category(cleaned_url, url_category_map.get(url, {}))
+                self._record_fetch(cleaned_url, article)
+                self._count_article(article)
+                if article and self.is_valid_news(article):
+                    self._stream_article(article)
+                self._checkpoint_article(cleaned_url, article)
+                if article and self.is_valid_news(article):
+                    accepted += 1
+                    if self.keep_results:
+                        all_articles.append(article)
+                    self.logger.info(f"进度: {idx}/{len(unique_urls)} - {article['title'][:30]}... \n {article['url']}")
+                
+                    if max_articles and accepted >= max_articles:
+                        self.logger.info(f"达到最大爬取数量 {max_articles}，停止爬取")
+                        break
+            
+                # -------------------- 关联文章挖掘（修改部分） --------------------
+                # related_links = self.find_related_links(cleaned_url)
+                # for rel_url in related_links:
+                #     cleaned_rel_url = self.clean_article_url(rel_url)
+                #     if not cleaned_rel_url or not self.is_valid_news_url(cleaned_rel_url):
+                #         self.logger.debug(f"无效关联URL: {rel_url}")
+                #         continue
+                
+                #     if cleaned_rel_url in self.visited_urls:
+                #         continue
+                #     self.visited_urls.add(cleaned_rel_url)
+                
+                #     # 爬取关联文章时不注入分类信息（直接使用原scrape_article）
+                #     rel_article = self.scrape_article(cleaned_rel_url)
+                #     if rel_article and self.is_valid_news(rel_article):
+                #         # 不更新rel_article的分类字段，保持原始爬取结果
+                #         all_articles.append(rel_article)
+                #         self.logger.info(f"从关联文章获取: {rel_article['title'][:30]}... \n {rel_article['url']}")
+                    
+                #         if max_articles and len(all_articles)>=max_articles:
+                #             break  # 达到数量限制时停止关联挖掘
+                # time.sleep(random.uniform(0.5, 2.5))  # 保留请求间隔
+
+            self.logger.info(f"爬取完成，共获取 {accepted} 篇带分类的文章")
+            self.save_visited_urls()
+            self._close_stream_sinks()
+            self._finish_checkpoint()
+            return all_articles
+        finally:
+            # 提前返回或异常时也要关闭流式输出（写出Parquet缓冲、提交SQLite批次）并释放浏览器
+            self._close_stream_sinks()
+            if self._owns_driver_pool:
+                self.driver_pool.close()
+
+    def _csv_row(self, article, idx):
+        """单篇文章的CSV行（save_to_csv 与流式CSV输出共用）"""
+        return {
+            '序号': idx,
+            '标题': article['title'],
+            '发布时间': article['publish_time'],
+            '正文': '\n'.join(article['content']),
+            '分类': article.get('category', ''),
+            '图片数量': len(article.get('images', [])),
+            '图片链接': ','.join(article.get('images', [])),
+            '本地图片路径': ','.join(article.get('local_images', [])),
+            '原文链接': article['url'],
+            '来源': article.get('source', 'Yahoo Japan')
+        }
+
+    def _article_record(self, article):
+        """单篇文章的类型化记录，供Parquet与SQLite输出使用（见 common.parquet_export.article_schema）"""
+        return {
+            'source': 'yahoo',
+            'url': article['url'],
+            'title': article['title'],
+            'publish_time': parse_publish_time(article['publish_time']),
+            'publish_time_raw': article['publish_time'],
+            'content': '\n'.join(article['content']),
+            'category': article.get('category') or None,
+            'topic': None,
+            'image_urls': list(article.get('images', [])),
+            'local_image_paths': list(article.get('local_images', [])),
+            'scraped_at': datetime.now(JST),
+        }
 
-        self.logger.info(f"去重后得到 {len(unique_urls)} 个唯一URL，准备爬取详情...")
+    def _open_stream_sinks(self, resumed=False):
+        """打开本次爬取的流式输出（断点恢复时继续追加到原文件）"""
+        self.sinks = []
+        if not self.stream_formats:
+            return
+        paths = dict(self.checkpoint.progress.get("stream_files", {})) if resumed and self.checkpoint else {}
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for fmt in self.stream_formats:
+            # SQLite库跨运行累积，其余格式每次运行一个文件
+            paths.setdefault(fmt, self.sqlite_path if fmt == "sqlite" else f"{self.stream_dir}/yahoo_news_{timestamp}.{fmt}")
+        self.sinks = open_sinks(self.stream_formats, paths, self.CSV_FIELDNAMES, self._csv_row,
+                                fsync_every=self.stream_fsync_every, logger=self.logger,
+                                article_record_builder=self._article_record, parquet_batch_size=self.parquet_batch_size,
+                                sqlite_batch_size=self.sqlite_batch_size)
+        self.logger.info(f"流式输出已开启: {', '.join(sink.path for sink in self.sinks)}")
+        if self.checkpoint is not None:
+            self.checkpoint.set_progress(stream_files=paths)
+
+    def _stream_article(self, article):
+        """将验证通过的文章追加写入所有流式输出"""
+        if not self.sinks:
+            return
+        with self.metrics.stage("save", output="stream"):
+            for sink in self.sinks:
+                try:
+                    sink.write(article)
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"写入流式输出失败: {sink.path} - {e}")
+
+    def _count_article(self, article):
+        """按结果计数：有效文章，或按原因（获取失败/内容无效）计入跳过"""
+        if article is None:
+            self.metrics.incr("skipped", reason="fetch_failed")
+        elif self.is_valid_news(article):
+            self.metrics.incr("articles")
+        else:
+            self.metrics.incr("skipped", reason="invalid")
+
+    def export_metrics(self):
+        """输出运行摘要：写入日志，并保存为JSON（metrics_dir）及Prometheus文本格式（prometheus_path）；开启性能分析时同时保存各阶段profile及热点摘要"""
+        summary = self.metrics.log_summary()
+        if self.metrics_dir:
+            path = os.path.join(self.metrics_dir, f"yahoo_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            self.metrics.write_json(path, summary)
+        if self.prometheus_path:
+            self.metrics.write_prometheus(self.prometheus_path, summary)
+        if self.metrics.profiler is not None:
+            self.metrics.profiler.write(self.metrics_dir or "./logs")
+        return summary
+
+    def _close_stream_sinks(self):
+        for sink in self.sinks:
+            sink.close()
+            self.logger.info(f"流式输出完成: {sink.path}，共 {sink.count} 篇")
+        self.sinks = []
+
+    def _checkpointed_links(self, source, name):
+        """断点中已完成的分类/话题/关键词的链接（未完成或未启用断点时返回None）"""
+        if self.checkpoint is None:
+            return None
+        return self.checkpoint.progress.get("links", {}).get(source, {}).get(name)
+
+    def _checkpoint_links(self, source, name, links):
+        """记录一个分类/话题/关键词的链接发现结果，并立即写入断点"""
+        if self.checkpoint is None:
+            return
+        discovered = self.checkpoint.progress.get("links", {})
+        discovered.setdefault(source, {})[name] = links
+        self.checkpoint.set_progress(links=discovered)
+        self.checkpoint.save()
 
+    def _checkpoint_article(self, url, article):
+        """在断点中标记文章已完成（有效文章同时保存结果）"""
+        if self.checkpoint is not None:
+            valid = bool(article) and self.is_valid_news(article)
+            self.checkpoint.mark_completed(url, article if valid and self.keep_results else None, accepted=valid)
 
+    def _finish_checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint.set_progress(finished=True)
+            self.checkpoint.save()
 
+    def _load_saved_visited_urls(self):
+        """从dedup_path加载已保存的已访问URL过滤器（续爬时使用），不存在或读取失败时返回None"""
+        if self.dedup_path and os.path.exists(self.dedup_path):
+            try:
+                visited_urls = load_url_filter(self.dedup_path)
+                self.logger.info(f"已加载URL去重记录: {self.dedup_path}，共 {len(visited_urls)} 条")
+                return visited_urls
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"加载URL去重记录失败，将重新开始: {self.dedup_path} - {e}")
+        return None
+
+    def save_visited_urls(self):
+        """将已访问URL过滤器保存到dedup_path（未设置时跳过）"""
+        if not self.dedup_path:
+            return
+        try:
+            self.visited_urls.save(self.dedup_path)
+            self.logger.info(f"URL去重记录已保存: {self.dedup_path}")
+        except OSError as e:
+            self.logger.error(f"保存URL去重记录失败: {self.dedup_path} - {e}")
+
+    def _record_fetch(self, url, article):
+        """在URL库中记录文章爬取结果（成功的文章附带正文哈希）"""
+        if self.url_store is None or article is None:
+            return
+        try:
+            if self.is_valid_news(article):
+                content_hash = self.url_store.content_hash('\n'.join(article['content']))
+                self.url_store.mark_fetched(url, source='yahoo', status='ok', content_hash=content_hash)
+            else:
+                self.url_store.mark_fetched(url, source='yahoo', status='invalid')
+        except Exception as e:
+            self.logger.warning(f"记录URL失败: {url} - {e}")
 
-        for idx, url in enumerate(unique_urls, 1):
-            cleaned_url = self.clean_article_url(url)
-            if not cleaned_url or not self.is_valid_news_url(cleaned_url):
+    def _scrape_articles_async(self, unique_urls, url_category_map, max_articles, per_host_concurrency,
+                               incremental=False, refresh_age=None):
+        """async模式：按主机限流并发爬取去重后的URL，结果保持原顺序"""
+        jobs = []
+        scheduled = set()
+        for url in unique_urls:
+            cleaned_url, is_news = self.url_classifier.classify(url)
+            if not is_news:
+                self.metrics.incr("skipped", reason="not_news")
                 self.logger.debug(f"无效URL: {url}")
                 continue
-
-            if cleaned_url in self.visited_urls:
+            if cleaned_url in self.visited_urls or cleaned_url in scheduled:
+                self.metrics.incr("skipped", reason="duplicate")
                 self.logger.debug(f"已访问过的URL: {cleaned_url}")
                 continue
-            self.visited_urls.add(cleaned_url)
+            if incremental and self.url_store and not self.url_store.should_fetch(cleaned_url, refresh_age):
+                self.metrics.incr("skipped", reason="incremental")
+                self.logger.debug(f"增量模式跳过已爬取URL: {cleaned_url}")
+                continue
+            scheduled.add(cleaned_url)
+            jobs.append((cleaned_url, url_category_map.get(url, {})))
 
-            # 爬取文章详情并注入分类信息
-            article = self.scrape_article_with_category(cleaned_url, url_category_map.get(url, {}))
+        def worker(job):
+            cleaned_url, category_info = job
+            return self.scrape_article_with_category(cleaned_url, category_info)
+
+        def consume(job, article):
+            # 按链接顺序、且只对截止点之前的结果记录/输出，保证记录的文章都在返回结果中
+            cleaned_url = job[0]
+            self.visited_urls.add(cleaned_url)
+            self._record_fetch(cleaned_url, article)
+            self._count_article(article)
             if article and self.is_valid_news(article):
-                all_articles.append(article)
-                self.logger.info(f"进度: {idx}/{len(unique_urls)} - {article['title'][:30]}... \n {article['url']}")
-                
-                if max_articles and len(all_articles) >= max_articles:
-                    self.logger.info(f"达到最大爬取数量 {max_articles}，停止爬取")
-                    break
-            
-            # -------------------- 关联文章挖掘（修改部分） --------------------
-            # related_links = self.find_related_links(cleaned_url)
-            # for rel_url in related_links:
-            #     cleaned_rel_url = self.clean_article_url(rel_url)
-            #     if not cleaned_rel_url or not self.is_valid_news_url(cleaned_rel_url):
-            #         self.logger.debug(f"无效关联URL: {rel_url}")
-            #         continue
-                
-            #     if cleaned_rel_url in self.visited_urls:
-            #         continue
-            #     self.visited_urls.add(cleaned_rel_url)
-                
-            #     # 爬取关联文章时不注入分类信息（直接使用原scrape_article）
-            #     rel_article = self.scrape_article(cleaned_rel_url)
-            #     if rel_article and self.is_valid_news(rel_article):
-            #         # 不更新rel_article的分类字段，保持原始爬取结果
-            #         all_articles.append(rel_article)
-            #         self.logger.info(f"从关联文章获取: {rel_article['title'][:30]}... \n {rel_article['url']}")
-                    
-            #         if max_articles and len(all_articles)>=max_articles:
-            #             break  # 达到数量限制时停止关联挖掘
-            # time.sleep(random.uniform(0.5, 2.5))  # 保留请求间隔
+                self._stream_article(article)
+            self._checkpoint_article(cleaned_url, article)
+            if article and self.is_valid_news(article):
+                self.logger.info(f"完成: {article['title'][:30]}... \n {article['url']}")
+                return article
+            return None
 
-        self.logger.info(f"爬取完成，共获取 {len(all_articles)} 篇带分类的文章")
-        return all_articles
+        engine = AsyncFetchEngine(per_host_limit=per_host_concurrency, logger=self.logger)
+        results = engine.run(jobs, worker, max_results=max_articles, url_of=lambda job: job[0], consume=consume)
+        if max_articles and len(results) >= max_articles:
+            self.logger.info(f"达到最大爬取数量 {max_articles}，停止爬取")
+        return [article for _, article in results]
 
     def get_news_links_from_search(self, max_links_per_keyword=None):
         """
@@ -309,32 +633,36 @@ class YahooJapanNewsScraper:
             return []
 
         all_links_with_keyword = []  # 存储带关键词信息的链接
-        options = Options()
-        # ...（保留原有options配置）
 
-        with webdriver.Chrome(options=options) as driver:
-            for keyword in self.keywords:
-                search_url = f"{self.base_url}/search?p={keyword}&ei=utf-8"
-                self.logger.info(f"\n开始搜索关键词：{keyword} ({search_url})")
+        for keyword in self.keywords:
+            cached_links = self._checkpointed_links("keywords", keyword)
+            if cached_links is not None:
+                all_links_with_keyword.extend(cached_links)
+                self.logger.info(f"断点恢复：关键词 {keyword} 已完成，复用 {len(cached_links)} 条链接")
+                continue
+            search_url = f"{self.base_url}/search?p={keyword}&ei=utf-8"
+            self.logger.info(f"\n开始搜索关键词：{keyword} ({search_url})")
 
-                try:
+            try:
+                with self.metrics.stage("discover", source="search"), self.driver_pool.driver() as driver:
+                    self.http.rate_limiter.acquire(search_url)
                     driver.get(search_url)
                     WebDriverWait(driver, 10).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href*="/articles/"]'))
                     )
-                    time.sleep(random.uniform(2, 3))
 
                     # 提取链接并附加关键词信息
                     search_links = self.extract_links_with_scroll(driver, max_links=max_links_per_keyword)
-                    for link in search_links:
-                        all_links_with_keyword.append({
-                            "url": link,
-                            "category": ""  # 附加关键词信息
-                        })
+                keyword_links = [{
+                    "url": link,
+                    "category": ""  # 附加关键词信息
+                } for link in search_links]
+                all_links_with_keyword.extend(keyword_links)
+                self._checkpoint_links("keywords", keyword, keyword_links)
 
-                    self.logger.info(f"  关键词 {keyword} 获取 {len(search_links)} 条链接，累计总数：{len(all_links_with_keyword)}")
-                except Exception as e:
-                    self.logger.error(f"关键词 {keyword} 搜索页面加载失败: {e}")
+                self.logger.info(f"  关键词 {keyword} 获取 {len(search_links)} 条链接，累计总数：{len(all_links_with_keyword)}")
+            except Exception as e:
+                self.logger.error(f"关键词 {keyword} 搜索页面加载失败: {e}")
 
         self.logger.info(f"共获取 {len(all_links_with_keyword)} 条带关键词的链接")
         return all_links_with_keyword
@@ -361,35 +689,39 @@ class YahooJapanNewsScraper:
         
         self.logger.info(f"开始从分类页面获取链接，共 {len(self.categories)} 个分类")
         all_links_with_category = []  # 存储带分类信息的链接
-        options = Options()
-        # ...（保留原有options配置）
         
-        with webdriver.Chrome(options=options) as driver:
-            for cat_slug, cat_name in self.categories.items():
-                if max_categories is not None and len(all_links_with_category) >= max_categories:
-                    break  # 达到分类总数限制时停止
-                
-                category_url = f"{self.base_url}/categories/{cat_slug}" if cat_slug else self.base_url
-                self.logger.info(f"\n开始爬取分类：{cat_name} ({category_url})")
-                
-                try:
+        for cat_slug, cat_name in self.categories.items():
+            if max_categories is not None and len(all_links_with_category) >= max_categories:
+                break  # 达到分类总数限制时停止
+            
+            cached_links = self._checkpointed_links("categories", cat_slug)
+            if cached_links is not None:
+                all_links_with_category.extend(cached_links)
+                self.logger.info(f"断点恢复：分类 {cat_name} 已完成，复用 {len(cached_links)} 条链接")
+                continue
+            category_url = f"{self.base_url}/categories/{cat_slug}" if cat_slug else self.base_url
+            self.logger.info(f"\n开始爬取分类：{cat_name} ({category_url})")
+            
+            try:
+                with self.metrics.stage("discover", source="category"), self.driver_pool.driver() as driver:
+                    self.http.rate_limiter.acquire(category_url)
                     driver.get(category_url)
                     WebDriverWait(driver, 10).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href*="/articles/"]'))
                     )
-                    time.sleep(random.uniform(2, 3))
                     
                     # 提取链接并附加分类信息
                     category_links = self.extract_links_with_scroll(driver, max_links=max_links_per_category)
-                    for link in category_links:
-                        all_links_with_category.append({
-                            "url": link,
-                            "category": cat_name  # 附加分类导航信息
-                        })
-                    
-                    self.logger.info(f"  该分类获取 {len(category_links)} 条链接，累计总数：{len(all_links_with_category)}")
-                except Exception as e:
-                    self.logger.error(f"分类 {cat_name} 页面加载失败: {e}")
+                category_link_infos = [{
+                    "url": link,
+                    "category": cat_name  # 附加分类导航信息
+                } for link in category_links]
+                all_links_with_category.extend(category_link_infos)
+                self._checkpoint_links("categories", cat_slug, category_link_infos)
+                
+                self.logger.info(f"  该分类获取 {len(category_links)} 条链接，累计总数：{len(all_links_with_category)}")
+            except Exception as e:
+                self.logger.error(f"分类 {cat_name} 页面加载失败: {e}")
         
         self.logger.info(f"共获取 {len(all_links_with_category)} 条带分类的链接")
         return all_links_with_category
@@ -403,7 +735,13 @@ class YahooJapanNewsScraper:
         all_links = []  # 存储带一级分类的链接
         
         for cat_id, main_category in self.topics.items():
+            cached_links = self._checkpointed_links("topics", cat_id)
+            if cached_links is not None:
+                all_links.extend(cached_links)
+                self.logger.info(f"断点恢复：话题 {main_category} 已完成，复用 {len(cached_links)} 条链接")
+                continue
             self.logger.info(f"\n开始爬取分类: {main_category} ({cat_id})... {self.base_url}/topics/{cat_id}")
+            topic_start = len(all_links)
             page = 1
             has_more = True
             
@@ -411,51 +749,48 @@ class YahooJapanNewsScraper:
                 page_url = f"{self.base_url}/topics/{cat_id}?page={page}" if page > 1 else f"{self.base_url}/topics/{cat_id}"
                 
                 try:
-                    # 每次请求使用新的session，降低被封禁风险
-                    with requests.Session() as session:
-                        # 添加随机延迟，模拟人类浏览行为
-                        time.sleep(random.uniform(1, 3))
-
-                        response = session.get(
-                            page_url, 
-                            headers=random.choice(self.headers_list),
-                            timeout=15,
-                        )
+                    with self.metrics.stage("discover", source="topic"):
+                        # 请求节奏由共享HTTP客户端的自适应限流器控制
+                        response = self.http.get(page_url, timeout=15)
                         response.raise_for_status()
                         
                         # 检查响应内容是否正常
                         if 'Yahoo! JAPAN' not in response.text:
+                            self.http.report_blocked(page_url)
                             raise ValueError("页面内容异常，可能被反爬拦截")
                         
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        # 话题页只构建链接和newsFeed列表，跳过页面其余部分
+                        soup = make_link_soup(response.text, self.html_parser, ['div[class="newsFeed"]', 'a[data-ual-event-name="next_page"]'])
                         
                         # 提取pickup链接
                         pickup_links = self.extract_pickup_links(soup)
-                        if not pickup_links:
-                            self.logger.info(f"  第 {page} 页无pickup链接，停止爬取")
-                            break
-                        
-                        count = 0 
+                    if not pickup_links:
+                        self.logger.info(f"  第 {page} 页无pickup链接，停止爬取")
+                        break
+                    
+                    count = 0 
 
-                        # 遍历pickup链接，提取文章
-                        for pickup_url in pickup_links:
+                    # 遍历pickup链接，提取文章
+                    for pickup_url in pickup_links:
+                        with self.metrics.stage("discover", source="pickup"):
                             article_links = self.extract_articles_from_pickup(pickup_url, main_category)
-                            all_links.extend(article_links)
-                            count += len(article_links)
+                        all_links.extend(article_links)
+                        count += len(article_links)
 
-                            # 达到单分类数量限制时停止
-                            if max_per_topics is not None and count >= max_per_topics:
-                                has_more = False
-                                break
-                        
-                        # 判断是否有下一页
-                        next_page = soup.select_one('a[data-ual-event-name="next_page"]')
-                        has_more = next_page is not None
-                        page += 1
+                        # 达到单分类数量限制时停止
+                        if max_per_topics is not None and count >= max_per_topics:
+                            has_more = False
+                            break
+                    
+                    # 判断是否有下一页
+                    next_page = soup.select_one('a[data-ual-event-name="next_page"]')
+                    has_more = next_page is not None
+                    page += 1
                     
                 except Exception as e:
                     self.logger.error(f"  话题页 {page_url} 爬取失败: {str(e)}")
                     has_more = False
+            self._checkpoint_links("topics", cat_id, all_links[topic_start:])
         
         self.logger.info(f"共获取 {len(all_links)} 条带分类的链接")
         return all_links
@@ -490,6 +825,8 @@ class YahooJapanNewsScraper:
             
             except Exception as e:
                 wait_time = 1 * (attempt + 1)  # 等待时间递增（1s, 2s, 3s...）
+                if attempt < retries - 1:
+                    self.metrics.incr("retries", reason="pickup_links")
                 self.logger.warning(f"尝试 {attempt+1}/{retries} 失败: {str(e)}，{wait_time}秒后重试")
                 time.sleep(wait_time)  # 等待后重试
         
@@ -503,9 +840,8 @@ class YahooJapanNewsScraper:
         for attempt in range(retries):
             try:
                 # 发送请求（允许重定向，获取最终URL）
-                response = requests.get(
+                response = self.http.get(
                     pickup_url, 
-                    headers=self.get_random_headers(), 
                     timeout=15,
                     allow_redirects=True  # 关键：允许自动跳转
                 )
@@ -524,116 +860,167 @@ class YahooJapanNewsScraper:
                     }]
                 
                 # 常规Pickup页面处理逻辑
-                pickup_soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 验证页面是否存在目标元素
-                target_elem = pickup_soup.select_one('div[data-ual-view-type="digest"] > a')
-                if not target_elem:
-                    raise ValueError("未找到文章链接元素")
-                
-                href = target_elem.get('href')
-                if href and '/articles/' in href:
-                    cleaned_url = self.clean_article_url(href)
-                    article_links = [{
-                        "url": cleaned_url,
-                        "category": main_category
-                    }]
-                    self.logger.info(f"从 {pickup_url} 提取到 {len(article_links)} 篇文章")
-                    return article_links
-                
-                # 若未找到符合条件的链接
-                raise ValueError("提取的链接不符合文章页格式")
+                pickup_soup = make_link_soup(response.text, self.html_parser, ['div[data-ual-view-type="digest"]'])
+                article_links = [{
+                    "url": self.extract_pickup_article_url(pickup_soup),
+                    "category": main_category
+                }]
+                self.logger.info(f"从 {pickup_url} 提取到 {len(article_links)} 篇文章")
+                return article_links
             
             except Exception as e:
                 wait_time = (attempt + 1) * 1  # 等待时间递增：1s, 2s, 3s
+                if attempt < retries - 1:
+                    self.metrics.incr("retries", reason="pickup")
                 self.logger.warning(f"尝试 {attempt+1}/{retries} 失败: {str(e)}，等待{wait_time}秒")
                 time.sleep(wait_time)
         
         self.logger.error(f"从 {pickup_url} 提取文章链接失败，达到最大重试次数")
         return []
+
+    def extract_pickup_article_url(self, pickup_soup):
+        """从pickup页面的摘要区域提取文章链接（找不到或格式不符时抛出ValueError）"""
+        # 验证页面是否存在目标元素
+        target_elem = pickup_soup.select_one('div[data-ual-view-type="digest"] > a')
+        if not target_elem:
+            raise ValueError("未找到文章链接元素")
+        
+        href = target_elem.get('href')
+        if href and '/articles/' in href:
+            return self.clean_article_url(href)
+        
+        # 若未找到符合条件的链接
+        raise ValueError("提取的链接不符合文章页格式")
     
     def extract_links_with_scroll(self, driver, max_links=None):
-        """滚动到底部加载所有内容后，一次性提取链接（优化逻辑）"""
+        """滚动加载内容并提取链接：以文章链接数增长或DOM停止变化为条件等待，而非固定延时"""
         self.logger.info("开始滚动页面加载所有内容...")
         links = set()
         scroll_count = 0
-        max_retries = 3  # 最大重试次数
-        retry_count = 0
-        last_height = driver.execute_script("return document.body.scrollHeight")  # 记录上次页面高度
+        max_idle_rounds = 2  # 连续多少轮无新内容视为加载完成
+        idle_rounds = 0
         
-        # 增加初始等待时间，确保页面基本加载
-        time.sleep(random.uniform(3, 5))
+        # 等待首屏内容稳定（DOM停止变化或达到上限即继续）
+        self._install_mutation_observer(driver)
+        anchor_count = self._wait_for_page_update(driver, previous_count=None)
         
         while True:
-            links = self.extract_article_links(driver)
+            links |= self.extract_article_links(driver)  # 只处理上次之后新增的链接
             if max_links and len(links) >= max_links:
                 self.logger.info(f"达到最大链接数 {max_links}，停止加载")
                 break
-            # 滚动到页面底部
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(2, 3))  # 等待内容加载
+            # 滚动到页面底部；同时重置静默计时，静默时间从本次操作起算（否则操作前已静默的页面会立即判定为加载完成）
+            driver.execute_script("window.__crawlerLastMutation = performance.now(); window.scrollTo(0, document.body.scrollHeight);")
             
-            # 检查是否出现"もっと見る"按钮
+            # 检查是否出现"もっと見る"按钮（不阻塞等待）
             more_button = self.find_more_button(driver)
             if more_button:
                 try:
-                    WebDriverWait(driver, 5).until(EC.element_to_be_clickable(more_button))
-                    driver.execute_script("arguments[0].click();", more_button)
+                    WebDriverWait(driver, self.scroll_wait_timeout).until(EC.element_to_be_clickable(more_button))
+                    driver.execute_script("window.__crawlerLastMutation = performance.now(); arguments[0].click();", more_button)
                     self.logger.info("点击'もっと見る'按钮，加载更多内容")
-                    time.sleep(random.uniform(3, 4))  # 点击后等待新内容加载
-                    retry_count = 0  # 重置重试次数
                 except Exception as e:
                     self.logger.warning(f"按钮点击失败，继续滚动: {e}")
+            
+            # 等待新的文章链接出现，或DOM静默（无新内容）
+            new_count = self._wait_for_page_update(driver, previous_count=anchor_count)
+            if new_count > anchor_count:
+                anchor_count = new_count
+                idle_rounds = 0
             else:
-                # 无更多按钮时，检查页面高度是否不再变化（判断是否加载完毕）
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        self.logger.info(f"连续 {max_retries} 次页面高度无变化，视为加载完成")
-                        break
-                else:
-                    last_height = new_height
-                    retry_count = 0  # 重置重试次数
+                idle_rounds += 1
+                if idle_rounds >= max_idle_rounds:
+                    self.logger.info(f"连续 {max_idle_rounds} 轮无新内容，视为加载完成")
+                    break
             
             scroll_count += 1
-            self.logger.info(f"滚动 {scroll_count} 次，当前页面高度: {last_height}")
+            self.logger.info(f"滚动 {scroll_count} 次，当前文章链接数: {anchor_count}")
         
         self.logger.info(f"共提取 {len(links)} 条有效链接")
         
         # 应用最大链接数限制
         return list(links) if max_links is None else list(links)[:max_links]
 
-    def find_more_button(self, driver):
-        """查找加载更多按钮，支持匹配不同类名或标签结构的按钮"""
+    def _install_mutation_observer(self, driver):
+        """在页面中注册MutationObserver，记录最后一次DOM变化（或滚动/点击操作）的时间"""
+        driver.execute_script("""
+            if (!window.__crawlerObserver) {
+                window.__crawlerLastMutation = performance.now();
+                window.__crawlerObserver = new MutationObserver(function () {
+                    window.__crawlerLastMutation = performance.now();
+                });
+                window.__crawlerObserver.observe(document.body, {childList: true, subtree: true});
+            }
+        """)
+
+    def _wait_for_page_update(self, driver, previous_count=None):
+        """等待文章链接数超过previous_count，或自上次操作/DOM变化起静默dom_quiet_ms毫秒，最长scroll_wait_timeout秒；返回当前链接数"""
+        state_script = """
+            return [
+                document.querySelectorAll('a[href*="/articles/"]').length,
+                performance.now() - (window.__crawlerLastMutation || 0)
+            ];
+        """
+        state = {"count": 0}
+
+        def updated(d):
+            count, idle_ms = d.execute_script(state_script)
+            state["count"] = count
+            if previous_count is not None and count > previous_count:
+                return True
+            return idle_ms >= self.dom_quiet_ms
+
         try:
-            # 使用 XPath 组合条件：
-            # 1. 按钮文本包含“もっと見る”
-            # 2. 匹配 <button> 或 <span> 标签（可能存在嵌套结构）
-            # 3. 排除可能的广告按钮（可选，根据实际情况调整）
-            return WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((
-                    By.XPATH, 
-                    '//button[contains(text(), "もっと見る") or .//span[contains(text(), "もっと見る")]]'
-                ))
-            )
+            WebDriverWait(driver, self.scroll_wait_timeout, poll_frequency=0.2).until(updated)
+        except TimeoutException:
+            self.logger.debug(f"等待页面更新超时（{self.scroll_wait_timeout}秒）")
+        return state["count"]
+
+    def find_more_button(self, driver, timeout=0):
+        """查找加载更多按钮，支持匹配不同类名或标签结构的按钮（默认不阻塞等待）"""
+        # 使用 XPath 组合条件：
+        # 1. 按钮文本包含“もっと見る”
+        # 2. 匹配 <button> 或 <span> 标签（可能存在嵌套结构）
+        # 3. 排除可能的广告按钮（可选，根据实际情况调整）
+        xpath = '//button[contains(text(), "もっと見る") or .//span[contains(text(), "もっと見る")]]'
+        try:
+            if timeout:
+                return WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.XPATH, xpath))
+                )
+            buttons = driver.find_elements(By.XPATH, xpath)
+            return buttons[0] if buttons else None
         except Exception as e:
             self.logger.debug(f"未找到'もっと見る'按钮: {e}")
             return None
 
     def extract_article_links(self, driver):
-        """从当前页面提取有效新闻链接（清洗并过滤广告）"""
+        """从当前页面提取新出现的有效新闻链接（清洗并过滤广告）
+
+        通过一次脚本调用返回自上次提取以来新增的 /articles/ 链接（页面内用WeakSet记录已处理的<a>），
+        因此每次滚动只清洗新增部分，避免逐个元素调用 get_attribute 的往返开销。
+        """
         links = set()
-        article_elements = driver.find_elements(By.XPATH, '//a[contains(@href, "/articles/")]')
+        hrefs = driver.execute_script("""
+            var harvested = window.__crawlerHarvested || (window.__crawlerHarvested = new WeakSet());
+            var anchors = document.querySelectorAll('a[href*="/articles/"]');
+            var hrefs = [];
+            for (var i = 0; i < anchors.length; i++) {
+                if (!harvested.has(anchors[i])) {
+                    harvested.add(anchors[i]);
+                    hrefs.push(anchors[i].href);
+                }
+            }
+            return hrefs;
+        """) or []
         
-        for elem in article_elements:
-            href = elem.get_attribute("href")
+        for href in set(hrefs):
             if href:
-                cleaned_url = self.clean_article_url(href)
-                if cleaned_url and self.is_valid_news_url(cleaned_url):
+                cleaned_url, is_news = self.url_classifier.classify(href)
+                if is_news:
                     links.add(cleaned_url)
         
-        self.logger.debug(f"从当前页面提取 {len(links)} 条有效链接")
+        self.logger.debug(f"从当前页面新增 {len(hrefs)} 个链接元素，提取 {len(links)} 条有效链接")
         return links
     
     
@@ -641,8 +1028,8 @@ class YahooJapanNewsScraper:
         """整合策略1（标题定位）的相关链接提取"""
         try:
             self.logger.debug(f"查找文章 {article_url} 的相关链接")
-            response = requests.get(article_url, headers=self.get_random_headers())
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.http.get(article_url)
+            soup = make_soup(response.text, self.html_parser)
             
             related = set()
             
@@ -689,67 +1076,66 @@ class YahooJapanNewsScraper:
             # 处理相对路径（兼容不同域名的相关链接）
             full_url = urljoin(base_url, href) if not href.startswith(('http://', 'https://')) else href
             
-            # 清洗URL（保留参数，仅去除无效后缀）
-            cleaned_url = self.clean_article_url(full_url)
-            if not cleaned_url:
-                return
-            
-            # 验证有效性（非广告、非资源页）
-            if self.is_valid_news_url(cleaned_url) and cleaned_url not in self.visited_urls:
+            # 清洗URL并验证有效性（非广告、非资源页）
+            cleaned_url, is_news = self.url_classifier.classify(full_url)
+            if is_news and cleaned_url not in self.visited_urls:
                 related_set.add(cleaned_url)
                 self.logger.debug(f"添加有效链接: {cleaned_url}")
                     
     
     def extract_article(self, url):
-        """提取文章的完整信息（标题、发布时间、内容、图片）"""
+        """提取文章的完整信息（标题、发布时间、内容、图片）
+
+        第一页只请求一次，同时用于提取标题/时间和正文；总页数从分页导航中读取，
+        其余页面并发获取后按页码顺序拼接。第一页获取失败时返回None。
+        """
         base_url = url.split('?')[0]
         first_page_url = base_url if 'page' not in url else url
+        start_page = self._get_page_number(first_page_url)
         
-        try:
-            # 获取第一页内容（用于提取标题、时间）
-            response = requests.get(first_page_url, headers=self.get_random_headers(), timeout=10)
-            response.raise_for_status()
-            first_page_soup = BeautifulSoup(response.text, 'html.parser')
-        except Exception as e:
-            print(f"Error fetching first page: {e}")
-            return {
-                'title': "无标题",
-                'publish_time': "未知时间",
-                'content': [],
-                'images': []
-            }
-        
-        # 提取标题和发布时间（仅第一页）
-        title = self._extract_title(first_page_soup)
-        publish_time = self._extract_publish_time(first_page_soup)
+        # 获取第一页内容（用于提取标题、时间、正文）
+        first_page_soup = self._fetch_article_page(first_page_url)
+        if first_page_soup is None:
+            return None
         
-        # 提取内容和图片（支持分页）
-        content = []
-        images = []
-        page_num = 1
+        with self.metrics.stage("extract"):
+            # 提取标题和发布时间（仅第一页）
+            title = self._extract_title(first_page_soup)
+            publish_time = self._extract_publish_time(first_page_soup)
+            
+            # 提取内容和图片（支持分页）
+            content = self._extract_page_content(first_page_soup)
+            images = self._extract_page_images(first_page_soup)
         
+        last_page = start_page
+        last_soup = first_page_soup
         while True:
-            current_url = f"{base_url}?page={page_num}" if page_num > 1 else first_page_url
-            
-            try:
-                response = requests.get(current_url, headers=self.get_random_headers(), timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-            except Exception as e:
-                print(f"no page {page_num}: {e}")
+            # 分页导航可能只显示部分页码，因此每批结束后用最后一页的导航再确认一次
+            page_count = self._extract_page_count(last_soup, base_url)
+            if page_count <= last_page:
                 break
             
-            # 提取内容
-            page_content = self._extract_page_content(soup)
-            if not page_content:
-                break  # 内容为空时停止
-            content.extend(page_content)
+            page_urls = [f"{base_url}?page={page_num}" for page_num in range(last_page + 1, page_count + 1)]
+            with ThreadPoolExecutor(max_workers=min(self.max_page_workers, len(page_urls))) as executor:
+                page_soups = list(executor.map(self._fetch_article_page, page_urls))
             
-            # 提取图片
-            page_images = self._extract_page_images(soup)
-            images.extend(page_images)
+            fetched = 0
+            for soup in page_soups:
+                if soup is None:
+                    break  # 某页获取失败时，只保留其之前的连续页面
+                with self.metrics.stage("extract"):
+                    page_content = self._extract_page_content(soup)
+                    page_images = self._extract_page_images(soup) if page_content else []
+                if not page_content:
+                    break  # 内容为空时停止
+                content.extend(page_content)
+                images.extend(page_images)
+                last_soup = soup
+                fetched += 1
             
-            page_num += 1
+            last_page += fetched
+            if fetched < len(page_urls):
+                break
         
         return {
             'title': title,
@@ -758,6 +1144,33 @@ class YahooJapanNewsScraper:
             'images': images
         }
 
+    def _fetch_article_page(self, page_url):
+        """获取并解析单个文章分页，失败时返回None"""
+        try:
+            with self.metrics.stage("fetch"):
+                response = self.http.get(page_url)
+                response.raise_for_status()
+            with self.metrics.stage("parse"):
+                return make_soup(response.text, self.html_parser)
+        except Exception as e:
+            self.logger.warning(f"文章分页获取失败: {page_url} - {e}")
+            return None
+
+    def _get_page_number(self, url):
+        """从URL的page参数中读取页码（默认为1）"""
+        page = parse_qs(urlparse(url).query).get('page')
+        return int(page[0]) if page and page[0].isdigit() else 1
+
+    def _extract_page_count(self, soup, base_url):
+        """从文章的分页导航（页码/「次へ」链接）中读取可见的最大页码"""
+        page_count = 1
+        for a in soup.find_all('a', href=True):
+            page_url = urljoin(base_url, a['href'])
+            if page_url.split('?')[0].split('#')[0] != base_url:
+                continue
+            page_count = max(page_count, self._get_page_number(page_url))
+        return page_count
+
     def _extract_page_content(self, soup):
         """提取单页的正文内容"""
         for selector in ['div.article_body', 'div.highLightSearchTarget', 'article.sc-1tt2vmb-1', 'div.articleDetail']:
@@ -828,8 +1241,7 @@ class YahooJapanNewsScraper:
 
     def is_advertisement(self, text: str) -> bool:
         """判断广告内容"""
-        lower_text = text.lower()
-        return any(keyword in lower_text for keyword in self.ad_keywords)
+        return self.ad_matcher.matches(text)
 
     def save_to_json(self, articles: List[Dict], filename: str = None):
         """JSON格式存储"""
@@ -847,8 +1259,47 @@ class YahooJapanNewsScraper:
         except Exception as e:
             self.logger.error(f"JSON保存失败: {e}")
 
+    def save_to_parquet(self, articles: List[Dict], path: str = None):
+        """Parquet格式存储（数据集目录，每 parquet_batch_size 篇一个分片）"""
+        if not articles:
+            self.logger.warning("无有效文章可保存")
+            return
+        if not path:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = f"./saves/yahoo_news_{timestamp}.parquet"
+        
+        try:
+            self.logger.info(f"开始保存 {len(articles)} 篇文章到 {path}")
+            with ParquetSink(path, batch_size=self.parquet_batch_size, logger=self.logger) as sink:
+                for article in articles:
+                    sink.write(self._article_record(article))
+            self.logger.info(f"Parquet保存成功: {path}")
+        except Exception as e:
+            self.logger.error(f"Parquet保存失败: {e}")
+
+    def save_to_sqlite(self, articles: List[Dict], db_path: str = None):
+        """写入SQLite文章库（按URL更新已有文章，标题/正文建立FTS5全文索引）"""
+        if not articles:
+            self.logger.warning("无有效文章可保存")
+            return
+        db_path = db_path or self.sqlite_path
+        try:
+            with ArticleStore(db_path, batch_size=self.sqlite_batch_size, logger=self.logger) as store:
+                store.write_many(self._article_record(article) for article in articles)
+                total = store.total()
+            self.logger.info(f"SQLite写入成功: {db_path}（库中共 {total} 篇）")
+        except Exception as e:
+            self.logger.error(f"SQLite写入失败: {e}")
+
 # 使用示例
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Yahoo! JAPAN news scraper")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的断点继续爬取")
+    parser.add_argument("--profile", nargs="+", metavar="STAGE", help="对这些阶段做cProfile性能分析（discover、fetch、parse、extract、images、save 或 all），结果保存到 ./logs")
+    parser.add_argument("--profile-every", type=int, default=1, help="每个阶段每N次调用分析一次")
+    args = parser.parse_args()
+
     os.makedirs('./logs', exist_ok=True)
     log_file = f"./logs/yahoo_news_scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     
@@ -856,7 +1307,9 @@ if __name__ == "__main__":
     scraper = YahooJapanNewsScraper(
         log_file=log_file,
         download_images=True,  # Enable image downloading
-        image_save_dir="./saves/images"  # Custom directory
+        image_save_dir="./saves/images",  # Custom directory
+        profile_stages=args.profile,
+        profile_every=args.profile_every
     )
     
     start_time = datetime.now()
@@ -867,14 +1320,19 @@ if __name__ == "__main__":
         max_per_topics=5,
         max_per_categories=5,
         max_links_per_keyword=21,
+        resume=args.resume,
     )
     
     end_time = datetime.now()
     elapsed_time = end_time - start_time
     
     if articles:
-        scraper.save_to_csv(articles)
-        scraper.save_to_json(articles)
+        with scraper.metrics.stage("save", output="csv"):
+            scraper.save_to_csv(articles)
+        with scraper.metrics.stage("save", output="json"):
+            scraper.save_to_json(articles)
+        if scraper.checkpoint is not None:
+            scraper.checkpoint.clear()  # 结果已保存，下次运行从头开始
     else:
         scraper.logger.warning("未获取到任何文章，跳过保存")
     
@@ -882,6 +1340,13 @@ if __name__ == "__main__":
     scraper.logger.info(f"- 开始时间: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     scraper.logger.info(f"- 结束时间: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
     scraper.logger.info(f"- 总耗时: {elapsed_time.total_seconds():.2f} 秒 ({elapsed_time})")
+    scraper.http.log_stats()
+    scraper.image_downloader.log_stats()
+    scraper.export_metrics()
+    scraper.image_downloader.close()
+    if scraper.image_store is not None:
+        scraper.image_store.close()
+    scraper.http.close()
     
     scraper.logger.info("\n爬取结果统计:")
     if articles: